@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""端到端接入基准：串口字节 -> 存储的样本
+
+按递增的采样率和传感器数量驱动 SerialManager -> 解析 -> SensorDataManager 链路，
+报告持续吞吐量、端到端延迟（p50/p99）、CPU 占用和内存增长，结果保存为 JSON，
+便于在不同提交之间对比。
+
+数据源:
+    pty     通过 SensorSimulator 的伪终端，经过真实的串口读取线程
+    memory  在内存中生成数据并直接送入 SerialManager 的分帧/解码，不经过串口
+
+接入方式:
+    line      逐行信号 -> GUI 线程 parse_data（与 SerialPage.on_data_received 相同）
+    batch     批量信号 -> GUI 线程 parse_batch
+    pipeline  批量信号 -> SensorIngestPipeline 解析线程
+
+用法（在 GUI 目录下运行）:
+    python benchmarks/bench_ingest.py --modes line batch pipeline --sensors 1 4 --rates 100 500 2000
+    python benchmarks/bench_ingest.py --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import builtins
+import threading
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GUI_DIR)
+builtins.APP_ROOT_PATH = GUI_DIR
+
+from PyQt6.QtCore import QCoreApplication, QObject, Qt, pyqtSlot
+
+from core.serial_manager import SerialManager, READ_MODE_EVENT
+from core.sensor_data_manager import SensorDataManager
+from core.ingest_pipeline import SensorIngestPipeline
+from core.line_framer import LineFramer
+from core.sensor_protocol import BinaryFrameDecoder, WIRE_FORMAT_TEXT, WIRE_FORMAT_BINARY
+from core.sensor_simulator import SensorSimulator, PROFILE_SEQUENCE
+
+MODES = ('line', 'batch', 'pipeline')
+SOURCES = ('pty', 'memory')
+
+
+class GuiThreadSink(QObject):
+    """在 GUI 线程中解析数据，模拟 SerialPage 的槽函数"""
+
+    def __init__(self, sensor_data_manager):
+        super().__init__()
+        self.sensor_data_manager = sensor_data_manager
+
+    @pyqtSlot(bytes)
+    def on_line(self, data):
+        self.sensor_data_manager.parse_data(data.decode('utf-8', errors='replace').strip())
+
+    @pyqtSlot(list, object)
+    def on_batch(self, lines, capture_ns):
+        self.sensor_data_manager.parse_batch(lines, capture_ns)
+
+    @pyqtSlot(object)
+    def on_frames(self, frames):
+        self.sensor_data_manager.add_samples(*frames)
+
+
+class StoreRecorder:
+    """记录样本写入存储的时刻
+
+    模拟器使用 sequence 波形，x 轴为轮次序号。每次写入后（data_parsed_signal，
+    在执行写入的线程中直连调用）记录当前时刻和最后一个传感器已存储的最大序号，
+    据此得到每一轮被完整存储的时刻。
+    """
+
+    def __init__(self, sensor_data_manager, sensor_id):
+        self.sensor_data_manager = sensor_data_manager
+        self.sensor_id = sensor_id
+        self.times = []
+        self.sequences = []
+
+    def on_parsed(self, success):
+        if not success:
+            return
+        sensor = self.sensor_data_manager.get_sensor_data(self.sensor_id)
+        if sensor is None or sensor.get_data_count() == 0:
+            return
+        self.times.append(time.monotonic_ns())
+        self.sequences.append(sensor.data1[-1])
+
+    def latencies(self, send_times):
+        """计算每一轮从写出到被存储的延迟（秒），未被存储的轮次不计入"""
+        if not self.times or not send_times:
+            return np.empty(0)
+        store_times = np.asarray(self.times, dtype=np.int64)
+        stored_seq = np.maximum.accumulate(np.asarray(self.sequences, dtype=np.float64))
+        send_times = np.asarray(send_times, dtype=np.int64)
+
+        ticks = np.arange(len(send_times))
+        index = np.searchsorted(stored_seq, ticks, side='left')
+        stored = index < len(store_times)
+        return (store_times[index[stored]] - send_times[stored]) / 1e9
+
+
+class MemorySource:
+    """内存数据源：按采样率生成数据，直接送入 SerialManager 的分帧/解码"""
+
+    def __init__(self, simulator, serial_manager):
+        self.simulator = simulator
+        self.serial_manager = serial_manager
+        self.send_times = []
+        self.sent_samples = 0
+        self._running = False
+        self._thread = None
+
+        # 与 SerialManager.connect 相同的初始化，但不打开串口
+        serial_manager.framer = LineFramer(max_line_length=serial_manager.max_line_length)
+        serial_manager.frame_decoder = BinaryFrameDecoder()
+        serial_manager.active_wire_format = simulator.wire_format
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self.serial_manager._flush_batch()
+
+    def _run(self):
+        rate = self.simulator.rate
+        start = time.monotonic()
+        sent_ticks = 0
+        while self._running:
+            due = int((time.monotonic() - start) * rate) + 1 - sent_ticks
+            if due > 0:
+                data = self.simulator.generate(due)
+                now = time.monotonic_ns()
+                self.send_times.extend([now] * due)
+                self.serial_manager._handle_chunk(data, time.perf_counter(), now)
+                sent_ticks += due
+                self.sent_samples += due * self.simulator.sensor_count
+            time.sleep(0.001)
+
+
+def get_rss_kb():
+    """当前进程的常驻内存（KB）"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def pump_events(app, seconds, until=None):
+    """在 GUI 线程中处理事件，直到超时或 until() 为真"""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if until is not None and until():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def run_case(app, source, mode, sensors, rate, duration, wire_format, drain_timeout):
+    """运行一个测试用例并返回结果字典"""
+    simulator = SensorSimulator(sensor_count=sensors, rate=rate, wire_format=wire_format,
+                                profile=PROFILE_SEQUENCE, noise=0.0, seed=0, max_backlog=1 << 20)
+    simulator.record_send_times = True
+
+    serial_manager = SerialManager(read_mode=READ_MODE_EVENT, wire_format=wire_format)
+    data_manager = SensorDataManager()
+    recorder = StoreRecorder(data_manager, simulator.sensor_ids[-1])
+    data_manager.data_parsed_signal.connect(recorder.on_parsed, Qt.ConnectionType.DirectConnection)
+
+    sink = GuiThreadSink(data_manager)
+    pipeline = None
+    if mode == 'line':
+        serial_manager.received_data_signal.connect(sink.on_line)
+        serial_manager.received_frames_signal.connect(sink.on_frames)
+    elif mode == 'batch':
+        serial_manager.set_batching(True)
+        serial_manager.received_batch_signal.connect(sink.on_batch)
+        serial_manager.received_frames_signal.connect(sink.on_frames)
+    else:
+        pipeline = SensorIngestPipeline(data_manager)
+        pipeline.attach(serial_manager)
+        pipeline.start()
+
+    if source == 'pty':
+        port = simulator.open()
+        if not serial_manager.connect(port, 115200, read_mode=READ_MODE_EVENT):
+            simulator.stop()
+            raise RuntimeError(f"无法打开模拟串口 {port}")
+        feeder = simulator
+    else:
+        feeder = MemorySource(simulator, serial_manager)
+
+    rss_start = get_rss_kb()
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+
+    feeder.start()
+    pump_events(app, duration)
+    if source == 'pty':
+        # 停止写入但保留伪终端，等待积压的数据被读完
+        simulator.stop_output()
+        send_times = simulator.send_times
+        sent = simulator.sent_samples
+    else:
+        feeder.stop()
+        send_times = feeder.send_times
+        sent = feeder.sent_samples
+    send_end = time.monotonic()
+
+    def stored_count():
+        return sum(data_manager.sensors[sid].total_count
+                   for sid in simulator.sensor_ids if sid in data_manager.sensors)
+
+    pump_events(app, drain_timeout, until=lambda: stored_count() >= sent)
+    if pipeline is not None:
+        pipeline.stop()
+        pump_events(app, 0.05)
+
+    wall = time.monotonic() - wall_start
+    cpu = time.process_time() - cpu_start
+    # 吞吐量按最后一个样本被存储的时刻计算，不含等待超时的空转时间
+    active = recorder.times[-1] / 1e9 - wall_start if recorder.times else wall
+    rss_end = get_rss_kb()
+
+    stored = stored_count()
+    latencies = recorder.latencies(send_times)
+    if source == 'pty':
+        serial_manager.disconnect()
+        simulator.stop()
+
+    result = {
+        'source': source,
+        'mode': mode,
+        'wire_format': wire_format,
+        'sensors': sensors,
+        'rate_per_sensor': rate,
+        'offered_samples_per_sec': rate * sensors,
+        'duration_s': round(send_end - wall_start, 3),
+        'sent_samples': sent,
+        'stored_samples': stored,
+        'lost_samples': max(sent - stored, 0),
+        'throughput_samples_per_sec': round(stored / active, 1) if active > 0 else 0.0,
+        'latency_p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3) if len(latencies) else None,
+        'latency_p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 3) if len(latencies) else None,
+        'latency_max_ms': round(float(latencies.max()) * 1000, 3) if len(latencies) else None,
+        'cpu_percent': round(cpu / wall * 100, 1) if wall > 0 else 0.0,
+        'rss_growth_kb': rss_end - rss_start
+    }
+    if pipeline is not None:
+        result['pipeline'] = pipeline.get_stats()
+    return result
+
+
+def sustained(result, loss_tolerance):
+    """吞吐量是否跟得上：丢失比例不超过容差"""
+    if result['sent_samples'] == 0:
+        return False
+    return result['lost_samples'] / result['sent_samples'] <= loss_tolerance
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=GUI_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result, loss_tolerance):
+    p50 = result['latency_p50_ms']
+    p99 = result['latency_p99_ms']
+    print(f"{result['source']:6s} {result['mode']:8s} {result['sensors']:3d} x {result['rate_per_sensor']:7.0f} Hz  "
+          f"吞吐 {result['throughput_samples_per_sec']:10.1f}/s  "
+          f"丢失 {result['lost_samples']:6d}  "
+          f"p50 {p50 if p50 is not None else '-':>8} ms  p99 {p99 if p99 is not None else '-':>8} ms  "
+          f"CPU {result['cpu_percent']:5.1f}%  内存 {result['rss_growth_kb']:+6d} KB  "
+          f"{'OK' if sustained(result, loss_tolerance) else '跟不上'}")
+
+
+def compare(old_path, new_path):
+    """对比两次结果中相同用例的吞吐量和延迟"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def key(r):
+        return r['source'], r['mode'], r['wire_format'], r['sensors'], r['rate_per_sensor']
+
+    old_results = {key(r): r for r in old['results']}
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    for result in new['results']:
+        base = old_results.get(key(result))
+        if base is None:
+            continue
+        line = f"{result['source']:6s} {result['mode']:8s} {result['sensors']:3d} x {result['rate_per_sensor']:7.0f} Hz"
+        for field in ('throughput_samples_per_sec', 'latency_p50_ms', 'latency_p99_ms', 'cpu_percent'):
+            a, b = base.get(field), result.get(field)
+            if a is None or b is None:
+                continue
+            change = (b - a) / a * 100 if a else 0.0
+            line += f"  {field}: {a} -> {b} ({change:+.1f}%)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="端到端接入基准（串口字节 -> 存储的样本）")
+    parser.add_argument("--source", choices=SOURCES, nargs="+", default=['pty'], help="数据源")
+    parser.add_argument("--modes", choices=MODES, nargs="+", default=list(MODES), help="接入方式")
+    parser.add_argument("--format", choices=(WIRE_FORMAT_TEXT, WIRE_FORMAT_BINARY), default=WIRE_FORMAT_TEXT,
+                        help="线路格式")
+    parser.add_argument("--sensors", type=int, nargs="+", default=[1, 4], help="传感器数量")
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 500, 2000, 8000],
+                        help="每个传感器的采样率（Hz），按递增顺序")
+    parser.add_argument("--duration", type=float, default=2.0, help="每个用例的发送时长（秒）")
+    parser.add_argument("--drain", type=float, default=2.0, help="发送结束后等待积压处理完的最长时间（秒）")
+    parser.add_argument("--loss-tolerance", type=float, default=0.01, help="视为跟得上的最大丢失比例")
+    parser.add_argument("--keep-going", action="store_true", help="跟不上之后继续测试更高的采样率")
+    parser.add_argument("--output", help="结果 JSON 路径，默认写入 benchmarks/results/")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="对比两个结果文件")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    results = []
+    for source in args.source:
+        for mode in args.modes:
+            for sensors in args.sensors:
+                for rate in sorted(args.rates):
+                    result = run_case(app, source, mode, sensors, rate, args.duration, args.format, args.drain)
+                    results.append(result)
+                    print_result(result, args.loss_tolerance)
+                    if not sustained(result, args.loss_tolerance) and not args.keep_going:
+                        break
+
+    # 每种组合能持续跟上的最高输入速率
+    summary = {}
+    for result in results:
+        name = f"{result['source']}/{result['mode']}/{result['sensors']}"
+        if sustained(result, args.loss_tolerance):
+            summary[name] = max(summary.get(name, 0), result['offered_samples_per_sec'])
+        else:
+            summary.setdefault(name, 0)
+
+    report = {
+        'benchmark': 'ingest',
+        'commit': git_commit(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'settings': vars(args),
+        'max_sustained_samples_per_sec': summary,
+        'results': results
+    }
+
+    output = args.output
+    if not output:
+        results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+        os.makedirs(results_dir, exist_ok=True)
+        output = os.path.join(results_dir, f"ingest_{report['commit'] or 'local'}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print()
+    for name, rate in summary.items():
+        print(f"{name:24s} 最高持续输入: {rate:10.0f} 样本/秒")
+    print(f"结果已保存: {output}")
+
+
+if __name__ == "__main__":
+    main()
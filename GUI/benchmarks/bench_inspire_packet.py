@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Inspire 机械手命令编解码的 CPU 开销对比：原有逐字节实现与预编译模板 + struct
+
+原有实现（此处原样保留用于对比）为每条命令构建 Python 列表、逐值拆分字节、对切片求和
+计算校验和再复制为 bytearray；解码时逐个自由度合并高低字节。新实现见
+InspireController._build_packet / _read_request / _parse_multi_dof_response。
+
+除单条命令的编码/解码耗时外，还通过内存中的回环串口测量一次完整轮询（read_snapshot，
+含分帧与校验）的耗时，并换算为不同轮询频率下占用的单核 CPU 比例。
+
+用法（在 GUI 目录下运行）:
+    python benchmarks/bench_inspire_packet.py --iterations 20000 --rates 100 500 1000
+"""
+
+import os
+import sys
+import time
+import argparse
+import builtins
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GUI_DIR)
+builtins.APP_ROOT_PATH = GUI_DIR
+
+from core.inspire.controller.control import (
+    InspireController, REG_ANGLE_SET, REG_ANGLE_ACT, REG_FORCE_ACT
+)
+
+HAND_ID = 1
+DOF = InspireController.HAND_DOF
+
+
+def legacy_split_to_bytes(value):
+    """原有实现：拆分为低位、高位字节"""
+    if value == -1:
+        return 0xff, 0xff
+    return value & 0xff, (value >> 8) & 0xff
+
+
+def legacy_build_packet(data_len, cmd, addr, data=None):
+    """原有实现：构建数据包"""
+    packet = [0xEB, 0x90, HAND_ID, data_len, cmd]
+    packet.extend(legacy_split_to_bytes(addr))
+    if data:
+        for value in data:
+            packet.extend(legacy_split_to_bytes(value))
+    packet.append(sum(packet[2:len(packet)]) & 0xff)
+    return bytearray(packet)
+
+
+def legacy_parse_multi_dof(response, offset=7):
+    """原有实现：逐个自由度合并高低字节"""
+    result = []
+    for i in range(DOF):
+        low, high = response[offset + i * 2], response[offset + i * 2 + 1]
+        result.append(-1 if high == 0xff and low == 0xff else (high << 8) + low)
+    return result
+
+
+def legacy_parse_force(response):
+    """原有实现：get_force 的解码（先按无符号解析再转换符号）"""
+    return [f - 65536 if f > 32767 else f for f in legacy_parse_multi_dof(response)]
+
+
+def make_response(addr, data):
+    """构造一个读寄存器的响应帧"""
+    body = [HAND_ID, len(data) + 3, 0x11, addr & 0xff, addr >> 8] + list(data)
+    return bytes([0x90, 0xEB] + body + [sum(body) & 0xff])
+
+
+class LoopbackSerial:
+    """内存中的回环串口：按请求返回寄存器内容"""
+
+    is_open = True
+    timeout = 0.05
+
+    def __init__(self):
+        self.registers = bytearray(range(256)) * 8
+        self.buffer = bytearray()
+
+    @property
+    def in_waiting(self):
+        return len(self.buffer)
+
+    def write(self, packet):
+        addr = packet[5] | (packet[6] << 8)
+        count = packet[7]
+        self.buffer += make_response(addr, self.registers[addr % 1024:addr % 1024 + count])
+
+    def read(self, size):
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+def measure(func, iterations, repeat=7):
+    """返回单次调用的最短耗时（微秒），取 repeat 轮中最快的一轮"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspire 命令编解码 CPU 开销对比")
+    parser.add_argument("--iterations", type=int, default=20000, help="每项测量的调用次数")
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 500, 1000], help="轮询频率（Hz）")
+    args = parser.parse_args()
+
+    controller = InspireController('loopback', 115200)
+    angles = [1000, 800, 600, 400, -1, 0]
+    count = InspireController.SNAPSHOT_END - InspireController.SNAPSHOT_START
+    angle_response = make_response(REG_ANGLE_ACT, bytes([0x20, 0x03, 0xff, 0xff] + [0x10, 0x00] * (DOF - 2)))
+    force_response = make_response(REG_FORCE_ACT, bytes([0xfb, 0xff, 0x0a, 0x00] + [0xd4, 0xfe] * (DOF - 2)))
+
+    # (名称, 原有实现, 新实现)
+    cases = [
+        ("编码 set_angle", lambda: legacy_build_packet(0x0F, 0x12, REG_ANGLE_SET, angles),
+         lambda: controller._build_packet(0x0F, 0x12, REG_ANGLE_SET, angles)),
+        ("编码 get_angle 请求", lambda: legacy_build_packet(0x05, 0x11, REG_ANGLE_ACT, [0x0C]),
+         lambda: controller._read_request(REG_ANGLE_ACT, 0x0C)),
+        ("编码 快照请求", lambda: legacy_build_packet(0x05, 0x11, REG_ANGLE_ACT, [count]),
+         lambda: controller._read_request(REG_ANGLE_ACT, count)),
+        ("解码 角度", lambda: legacy_parse_multi_dof(angle_response),
+         lambda: controller._parse_multi_dof_response(angle_response)),
+        ("解码 受力", lambda: legacy_parse_force(force_response),
+         lambda: controller._parse_multi_dof_response(force_response, signed=True)),
+    ]
+
+    # 两种实现的结果必须一致
+    for name, legacy, current in cases:
+        assert list(legacy()) == list(current()), f"{name}: 新旧实现结果不一致"
+
+    print(f"{'项目':<16s}{'原有(us)':>10s}{'新(us)':>10s}{'加速':>8s}")
+    for name, legacy, current in cases:
+        before = measure(legacy, args.iterations)
+        after = measure(current, args.iterations)
+        print(f"{name:<16s}{before:10.2f}{after:10.2f}{before / after:7.1f}x")
+
+    # 每个轮询周期分别读取角度和受力（两条命令）的编解码开销
+    legacy_cycle = measure(lambda: (legacy_build_packet(0x05, 0x11, REG_ANGLE_ACT, [0x0C]),
+                                    legacy_parse_multi_dof(angle_response),
+                                    legacy_build_packet(0x05, 0x11, REG_FORCE_ACT, [0x0C]),
+                                    legacy_parse_force(force_response)), args.iterations)
+    current_cycle = measure(lambda: (controller._read_request(REG_ANGLE_ACT, 0x0C),
+                                     controller._parse_multi_dof_response(angle_response),
+                                     controller._read_request(REG_FORCE_ACT, 0x0C),
+                                     controller._parse_multi_dof_response(force_response, signed=True)),
+                            args.iterations)
+
+    # 完整的快照轮询（编码、回环收发、分帧校验、解码）
+    controller.ser = LoopbackSerial()
+    snapshot_cycle = measure(controller.read_snapshot, args.iterations // 4)
+
+    print()
+    print(f"{'轮询频率':<10s}{'原有 角度+受力':>16s}{'新 角度+受力':>16s}{'新 read_snapshot':>20s}")
+    for rate in args.rates:
+        print(f"{rate:<10.0f}{legacy_cycle * rate / 1e4:15.3f}%{current_cycle * rate / 1e4:15.3f}%"
+              f"{snapshot_cycle * rate / 1e4:19.3f}%")
+    print(f"（单周期耗时: 原有 {legacy_cycle:.2f} us, 新 {current_cycle:.2f} us, read_snapshot {snapshot_cycle:.2f} us；"
+          f"百分比为占用的单核 CPU）")
+
+
+if __name__ == "__main__":
+    main()
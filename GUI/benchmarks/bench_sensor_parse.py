@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""传感器数据解析吞吐量对比：逐行 parse_data 与批量 parse_batch
+
+用法（在 GUI 目录下运行）:
+    python benchmarks/bench_sensor_parse.py --lines 50000 --sensors 4 --batch 64
+"""
+
+import os
+import sys
+import time
+import argparse
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.sensor_data_manager import SensorDataManager
+
+
+def make_lines(count, sensors):
+    """生成测试用的文本行"""
+    rng = random.Random(0)
+    return [
+        f"sensor{i % sensors + 1}: {rng.uniform(-20, 20):.3f}, {rng.uniform(-20, 20):.3f}, {rng.uniform(-20, 20):.3f}\n"
+        .encode('utf-8')
+        for i in range(count)
+    ]
+
+
+def bench_per_line(lines):
+    """原有路径：逐行解码并调用 parse_data"""
+    manager = SensorDataManager()
+    start = time.perf_counter()
+    for line in lines:
+        manager.parse_data(line.decode('utf-8').strip())
+    return time.perf_counter() - start
+
+
+def bench_batch(lines, batch_size):
+    """批量路径：每 batch_size 行调用一次 parse_batch"""
+    manager = SensorDataManager()
+    start = time.perf_counter()
+    for i in range(0, len(lines), batch_size):
+        manager.parse_batch(lines[i:i + batch_size])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="传感器数据解析吞吐量对比")
+    parser.add_argument("--lines", type=int, default=50000, help="总行数")
+    parser.add_argument("--sensors", type=int, default=4, help="传感器数量")
+    parser.add_argument("--batch", type=int, nargs="+", default=[16, 64, 256], help="批量大小")
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines, args.sensors)
+
+    elapsed = bench_per_line(lines)
+    baseline = args.lines / elapsed
+    print(f"parse_data  逐行         : {baseline:12.0f} 行/秒")
+
+    for batch_size in args.batch:
+        elapsed = bench_batch(lines, batch_size)
+        rate = args.lines / elapsed
+        print(f"parse_batch 批量={batch_size:<6d}: {rate:12.0f} 行/秒  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -850,9 +850,7 @@ class ActionManager(QObject):
             non_critical_errors = [
                 "index out of range",
                 "list index out of range", 
-                "'int' object is not subscriptable",
-                "串口通信错误",
-                "响应数据长度不足"
+                "'int' object is not subscriptable"
             ]
             
             if any(err_pattern in error_msg for err_pattern in non_critical_errors):
@@ -11,6 +11,7 @@ import numpy as np
 from typing import List, Optional, Dict, Any
 import logging
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from core import sample_clock
 
 
 class AdaptiveGraspController(QObject):
@@ -94,7 +95,8 @@ class AdaptiveGraspController(QObject):
             "y": [],
             "z": []
         }
-        self.stable_start_time = None  # 稳定状态开始时间
+        self.stable_start_time = None  # 稳定状态开始时间（单调时钟秒数）
+        self.last_sample_time = None  # 上一次计入历史的样本捕获时间
 
         # 定时器
         self.timer = QTimer(self)
@@ -175,6 +177,7 @@ class AdaptiveGraspController(QObject):
         # 清空历史数据
         self.force_history = {"x": [], "y": [], "z": []}
         self.stable_start_time = None
+        self.last_sample_time = None
 
         # 获取当前手指角度
         try:
@@ -342,7 +345,7 @@ class AdaptiveGraspController(QObject):
             else:
                 self.logger.info(f"力值超过阈值，开始稳定性分析")
                 self.state = self.ANALYZING
-                self.stable_start_time = time.time()
+                self.stable_start_time = sample_clock.now()
             return
 
         # 执行手指闭合
@@ -360,10 +363,13 @@ class AdaptiveGraspController(QObject):
         if force_data is None:
             return
 
-        # 添加到历史数据
-        self.force_history["x"].append(force_data["x"])
-        self.force_history["y"].append(force_data["y"])
-        self.force_history["z"].append(force_data["z"])
+        # 添加到历史数据（同一个样本只计入一次，避免轮询快于采样时窗口被重复值填满）
+        sample_time = force_data.get("timestamp")
+        if sample_time is None or sample_time != self.last_sample_time:
+            self.last_sample_time = sample_time
+            self.force_history["x"].append(force_data["x"])
+            self.force_history["y"].append(force_data["y"])
+            self.force_history["z"].append(force_data["z"])
 
         # 保持窗口大小
         window_size = self.config["sample_window"]
@@ -372,7 +378,7 @@ class AdaptiveGraspController(QObject):
                 self.force_history[axis].pop(0)
 
         # 检查是否已经稳定足够时间
-        elapsed_time = time.time() - self.stable_start_time
+        elapsed_time = sample_clock.now() - self.stable_start_time
 
         # 每次都计算并显示标准差（如果有足够的数据）
         if len(self.force_history["x"]) >= 5:  # 至少5个数据点才计算标准差
@@ -411,6 +417,7 @@ class AdaptiveGraspController(QObject):
                 self.state = self.CLOSING
                 self.force_history = {"x": [], "y": [], "z": []}
                 self.stable_start_time = None
+                self.last_sample_time = None
 
     def _handle_releasing(self):
         """处理释放状态 - 动态平衡控制：力值>=阈值则释放，力值<阈值则闭合，直到达到最大迭代次数"""
@@ -481,13 +488,14 @@ class AdaptiveGraspController(QObject):
         获取当前力值（多传感器平均）
 
         Returns:
-            力值字典 {"x": float, "y": float, "z": float} 或 None
+            力值字典 {"x": float, "y": float, "z": float, "timestamp": float} 或 None
         """
         if not self.selected_sensors:
             return None
 
         total_x, total_y, total_z = 0.0, 0.0, 0.0
         valid_count = 0
+        latest_time = None
 
         for sensor_id in self.selected_sensors:
             sensor_data = self.sensor_data_manager.get_sensor_data(sensor_id)
@@ -498,13 +506,18 @@ class AdaptiveGraspController(QObject):
                 total_z += values[2]
                 valid_count += 1
 
+                sample_time = sensor_data.get_latest_timestamp()
+                if sample_time is not None and (latest_time is None or sample_time > latest_time):
+                    latest_time = sample_time
+
         if valid_count == 0:
             return None
 
         force_data = {
             "x": total_x / valid_count,
             "y": total_y / valid_count,
-            "z": total_z / valid_count
+            "z": total_z / valid_count,
+            "timestamp": latest_time  # 最新样本的捕获时间（单调时钟秒数）
         }
 
         # 发送力值更新信号
@@ -534,8 +547,8 @@ class AdaptiveGraspController(QObject):
 
         # 执行手指闭合
         try:
-            # 注意：set_hand_angles方法不接受speed参数
-            self.arm_controller.set_hand_angles(new_angles)
+            # 注意：set_hand_angles方法不接受speed参数；异步下发，不在控制回路中等待应答
+            self.arm_controller.set_hand_angles(new_angles, wait=False)
             self.current_hand_angles = new_angles
 
             fingers_str = ", ".join([f"F{i}:{new_angles[i]}" for i in finger_indices])
@@ -569,8 +582,8 @@ class AdaptiveGraspController(QObject):
 
         # 执行手指释放
         try:
-            # 注意：set_hand_angles方法不接受speed参数
-            self.arm_controller.set_hand_angles(new_angles)
+            # 注意：set_hand_angles方法不接受speed参数；异步下发，不在控制回路中等待应答
+            self.arm_controller.set_hand_angles(new_angles, wait=False)
             self.current_hand_angles = new_angles
 
             fingers_str = ", ".join([f"F{i}:{new_angles[i]}" for i in finger_indices])
@@ -5,6 +5,18 @@ import json
 import os
 from PyQt6.QtCore import QObject, pyqtSignal
 
+# 传感器数据存储的默认设置（设置文件缺少某项时，读取方也以此为准）
+SENSOR_DATA_DEFAULTS = {
+    "buffer_capacity": 65536,
+    "spill_to_disk": True,
+    "spill_block": 16384,
+    "record_max_file_mb": 64,  # 记录文件轮换阈值，仅作用于 csv 记录格式
+    "record_max_file_minutes": 60,  # 同上，npy 录制按块存储不轮换
+    "auto_record": False,
+    "record_format": "npy",
+    "ui_update_rate": 20
+}
+
 
 class Settings(QObject):
     """应用程序设置类，负责管理和保存应用设置"""
@@ -29,7 +41,21 @@ class Settings(QObject):
                 "flow_control": None,
                 "last_port": "",
                 "auto_connect": False,
-                "reconnect_attempts": 3
+                "reconnect_attempts": 3,
+                "read_mode": "poll",
+                "wire_format": "text",
+                "batch_delivery": False,
+                "batch_window_ms": 5,
+                "batch_max_lines": 64,
+                "parse_in_worker": True
+            },
+
+            # 传感器数据存储设置
+            "sensor_data": dict(SENSOR_DATA_DEFAULTS),
+
+            # 机械手设置
+            "hand": {
+                "poll_rate": 0
             },
 
             # 数据显示设置
@@ -148,7 +174,21 @@ class Settings(QObject):
                 "flow_control": None,
                 "last_port": "",
                 "auto_connect": False,
-                "reconnect_attempts": 3
+                "reconnect_attempts": 3,
+                "read_mode": "poll",
+                "wire_format": "text",
+                "batch_delivery": False,
+                "batch_window_ms": 5,
+                "batch_max_lines": 64,
+                "parse_in_worker": True
+            },
+
+            # 传感器数据存储设置
+            "sensor_data": dict(SENSOR_DATA_DEFAULTS),
+
+            # 机械手设置
+            "hand": {
+                "poll_rate": 0
             },
 
             # 数据显示设置
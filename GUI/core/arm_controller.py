@@ -34,13 +34,16 @@ try:
     import yaml
     import numpy as np
 
-    from core.inspire.controller import InspireController
+    from core.inspire.controller import InspireController, InspireError
     from core.inspire.utils import as_degree_angle, as_cylinder_angle, as_binary_angle
     INSPIRE_AVAILABLE = True
 except ImportError:
     INSPIRE_AVAILABLE = False
     InspireController = None
 
+    class InspireError(Exception):
+        """控制库不可用时的占位类型，使 except InspireError 子句仍然有效"""
+
 # 预设位置字典（位置单位：米，姿态单位：弧度）
 PRESET_POSITIONS = {
     "initial": {
@@ -76,7 +79,8 @@ class ArmController(QObject):
     arm_connected_signal = pyqtSignal(bool)  # 机械臂连接状态
     hand_connected_signal = pyqtSignal(bool)  # 机械手连接状态
 
-    def __init__(self, arm_ip: str = None, arm_port: int = 8080, hand_port: str = None, hand_baudrate: int = 115200):
+    def __init__(self, arm_ip: str = None, arm_port: int = 8080, hand_port: str = None, hand_baudrate: int = 115200,
+                 hand_poll_rate: float = 0):
         """
         初始化机械臂控制器。
 
@@ -85,6 +89,7 @@ class ArmController(QObject):
             arm_port: 瑞尔曼机械臂端口号
             hand_port: Inspire机械手串口端口
             hand_baudrate: Inspire机械手波特率
+            hand_poll_rate: 机械手遥测后台轮询频率（Hz），0 表示不轮询
         """
         super().__init__()
 
@@ -96,6 +101,7 @@ class ArmController(QObject):
         self.arm_port = arm_port
         self.hand_port = hand_port or "/dev/ttyUSB0"  # 默认串口
         self.hand_baudrate = hand_baudrate
+        self.hand_poll_rate = hand_poll_rate
 
         # 控制器实例
         self.arm = None
@@ -226,6 +232,8 @@ class ArmController(QObject):
                     self.status_data["hand_port"] = hand_port
 
                     self.logger.info(f"机械手连接成功: {hand_port}")
+                    if self.hand_poll_rate and self.hand_poll_rate > 0:
+                        self.hand.start_polling(self.hand_poll_rate)
                     self.hand_connected_signal.emit(True)
 
                     # 如果两个设备都连接成功，发射总连接信号
@@ -413,12 +421,13 @@ class ArmController(QObject):
             self.error_signal.emit(f"机械臂移动异常: {str(e)}")
             return False
 
-    def set_hand_angles(self, angles: List[int]) -> bool:
+    def set_hand_angles(self, angles: List[int], wait: bool = True) -> bool:
         """
         设置机械手各关节角度。
 
         Args:
             angles: 关节角度列表 [finger1, finger2, finger3, finger4, thumb, thumb_flip]
+            wait: False 时交给机械手的后台写入线程，不等待应答（连续下发时只写出最新值）
 
         Returns:
             是否成功
@@ -433,8 +442,9 @@ class ArmController(QObject):
                 raise ValueError("角度参数必须包含6个值")
 
             # 尝试设置角度
-            self.hand.set_angle(angles)
-            self.logger.info(f"机械手角度设置成功: {angles}")
+            self.hand.set_angle(angles, wait=wait)
+            if wait:
+                self.logger.info(f"机械手角度设置成功: {angles}")
 
             # 更新状态数据
             try:
@@ -445,6 +455,12 @@ class ArmController(QObject):
 
             return True
 
+        except InspireError as e:
+            # 通信失败（超时、校验错误、应答异常、串口错误）：设定值未必已生效，不能当作成功
+            self.logger.error(f"机械手角度设置失败: {e}")
+            self.error_signal.emit(f"机械手角度设置失败: {e}")
+            return False
+
         except Exception as e:
             error_msg = str(e)
 
@@ -452,9 +468,7 @@ class ArmController(QObject):
             non_critical_patterns = [
                 "index out of range",
                 "list index out of range",
-                "'int' object is not subscriptable",
-                "串口通信错误",
-                "响应数据长度不足"
+                "'int' object is not subscriptable"
             ]
 
             if any(pattern in error_msg for pattern in non_critical_patterns):
@@ -524,6 +538,37 @@ class ArmController(QObject):
             self.logger.error(f"获取机械手角度异常: {e}")
             return None
 
+    def get_hand_snapshot(self, max_age: float = None):
+        """一次读取机械手的角度、受力、电流、故障、状态和温度（见 InspireController.read_snapshot）。
+
+        后台轮询时，最新快照不超过 max_age（默认为 InspireController.max_age）秒则直接返回。
+        """
+        if not self.hand_connected or not self.hand:
+            return None
+
+        try:
+            snapshot = self.hand.latest_snapshot
+            if max_age is None:
+                max_age = self.hand.max_age
+            if snapshot is not None and max_age is not None and snapshot.age() <= max_age:
+                return snapshot
+            return self.hand.read_snapshot()
+        except Exception as e:
+            self.logger.error(f"获取机械手遥测快照异常: {e}")
+            return None
+
+    def get_hand_poll_stats(self) -> Optional[Dict[str, Any]]:
+        """获取机械手遥测轮询统计（见 InspireController.get_poll_stats），未连接时返回 None。"""
+        if not self.hand_connected or not self.hand:
+            return None
+        return self.hand.get_poll_stats()
+
+    def get_hand_command_stats(self) -> Optional[Dict[str, Any]]:
+        """获取机械手异步设定值写入统计（见 InspireController.get_command_stats），未连接时返回 None。"""
+        if not self.hand_connected or not self.hand:
+            return None
+        return self.hand.get_command_stats()
+
     def execute_preset_position(self, position_name: str) -> bool:
         """
         执行预设位置。
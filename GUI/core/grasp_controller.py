@@ -13,7 +13,12 @@ class GraspController(QObject):
     grasp_status_changed = pyqtSignal(bool)  # 抓取状态变化信号
     force_threshold_changed = pyqtSignal(float)  # 力阈值变化信号
 
-    def __init__(self, sensor_data_manager: SensorDataManager):
+    def __init__(self, sensor_data_manager: SensorDataManager, snapshot_bus=None):
+        """
+        Args:
+            sensor_data_manager: 传感器数据管理器
+            snapshot_bus: 传感器快照总线，提供时逐批接收全部样本，否则连接逐样本的更新信号
+        """
         super().__init__()
         
         self.sensor_data_manager = sensor_data_manager
@@ -33,8 +38,11 @@ class GraspController(QObject):
         self.force_buffer = []
         self.buffer_size = 10  # 缓冲区大小
         
-        # 连接信号
-        self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
+        # 连接信号（控制逻辑需要每个样本，按批接收而不限频）
+        if snapshot_bus is not None:
+            self.snapshot_subscription = snapshot_bus.subscribe(self.on_sensor_snapshot, rate=None)
+        else:
+            self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
 
     def set_force_threshold(self, threshold: float):
         """设置抓取力阈值"""
@@ -46,6 +54,14 @@ class GraspController(QObject):
         self.stable_time = time
         self.required_stable_samples = int(time * self.sample_rate)
 
+    def on_sensor_snapshot(self, snapshot: dict):
+        """处理快照总线投递的一批样本"""
+        if not self.is_grasping:
+            return
+        sensor_ids, values, _ = snapshot['samples']
+        for sensor_id, sample in zip(sensor_ids.tolist(), values.tolist()):
+            self.on_sensor_data_updated(sensor_id, sample)
+
     def on_sensor_data_updated(self, sensor_id: int, values: list):
         """处理传感器数据更新"""
         if not self.is_grasping:
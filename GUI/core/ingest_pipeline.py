@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+
+class SensorIngestPipeline(QObject):
+    """传感器数据接入流水线
+
+    串口读取线程 -> 有界队列 -> 解析线程 -> SensorDataManager
+
+    串口管理器的批量信号以直连方式接入，在读取线程中只做入队；
+    解析和存储在独立的工作线程中完成，GUI 线程只接收定期发出的快照。
+    队列已满时丢弃新到的批次并计数，而不是阻塞读取线程。
+
+    快照中还带有串口最近接收的 tail_lines 行原始数据（文本行或二进制帧），
+    供界面按快照频率刷新接收区，界面不再逐批接收原始数据。
+    """
+
+    # 定义信号
+    # 定期快照 {'latest': {传感器ID: [x, y, z]}, 'stats': {...},
+    #           'tail': [(捕获时间戳ns, 行bytes 或 (传感器ID, x, y, z)), ...], 'tail_seq': 累计接收条数}
+    snapshot_signal = pyqtSignal(dict)
+
+    def __init__(self, sensor_data_manager, max_queue_size=256, snapshot_interval=0.05, tail_lines=200):
+        super().__init__()
+
+        self.sensor_data_manager = sensor_data_manager
+        self.snapshot_interval = snapshot_interval  # 快照发射间隔（秒）
+        self.parsing_enabled = True
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._running = False
+        self._stop_event = threading.Event()
+        self._serial_manager = None
+
+        # 最近接收的原始数据（读取线程写入，解析线程在快照时复制）
+        self._tail = deque(maxlen=tail_lines)
+        self._tail_seq = 0
+        self._tail_lock = threading.Lock()
+
+        # 快照与统计
+        self._last_snapshot = 0.0
+        self._dirty = False  # 上次快照之后是否有新的数据或统计变化
+        self._stats_lock = threading.Lock()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.enqueued_batches = 0
+        self.enqueued_lines = 0
+        self.dropped_batches = 0
+        self.dropped_lines = 0
+        self.processed_lines = 0
+        self.parsed_samples = 0
+        self.max_queue_depth = 0
+
+    def attach(self, serial_manager):
+        """接入串口管理器（启用其批量投递）"""
+        self.detach()
+        self._serial_manager = serial_manager
+        if not serial_manager.batch_enabled:
+            serial_manager.set_batching(True)
+        # 直连：槽函数在串口读取线程中执行，只负责记录尾部和入队
+        serial_manager.received_batch_signal.connect(self._on_serial_lines, Qt.ConnectionType.DirectConnection)
+        serial_manager.received_frames_signal.connect(self._on_serial_frames, Qt.ConnectionType.DirectConnection)
+
+    def detach(self):
+        """断开与串口管理器的连接"""
+        if self._serial_manager is None:
+            return
+        try:
+            self._serial_manager.received_batch_signal.disconnect(self._on_serial_lines)
+            self._serial_manager.received_frames_signal.disconnect(self._on_serial_frames)
+        except TypeError:
+            pass
+        self._serial_manager = None
+
+    def start(self):
+        """启动解析线程"""
+        if self._running:
+            return
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止解析线程（已入队的数据会被处理完）
+
+        只设置停止事件而不向有界队列放入结束标记，队列满时也不会阻塞调用线程；
+        解析线程最迟在一个 snapshot_interval 内察觉。
+        """
+        if not self._running:
+            return
+        self._running = False
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def is_running(self):
+        return self._running
+
+    def set_parsing_enabled(self, enabled):
+        """启用或暂停解析（暂停时入队的数据被直接丢弃，不计入丢失）"""
+        self.parsing_enabled = bool(enabled)
+
+    def _on_serial_lines(self, lines, capture_ns=None):
+        """读取线程中：记录串口文本行的尾部并提交解析"""
+        tail = lines[-self._tail.maxlen:]
+        if capture_ns is None:
+            times = [time.monotonic_ns()] * len(tail)
+        else:
+            times = capture_ns[len(capture_ns) - len(tail):].tolist()
+        self._append_tail(zip(times, tail), len(lines))
+        self.submit_lines(lines, capture_ns)
+
+    def _on_serial_frames(self, frames):
+        """读取线程中：记录串口二进制帧的尾部并提交解析"""
+        sensor_ids, values, capture_ns = frames
+        n = self._tail.maxlen
+        entries = zip(capture_ns[-n:].tolist(),
+                      ((sensor_id, x, y, z) for sensor_id, (x, y, z) in zip(sensor_ids[-n:].tolist(), values[-n:].tolist())))
+        self._append_tail(entries, len(sensor_ids))
+        self.submit_frames(frames)
+
+    def _append_tail(self, entries, count):
+        with self._tail_lock:
+            self._tail.extend(entries)
+            self._tail_seq += count
+        self._dirty = True
+
+    def get_tail(self):
+        """获取最近接收的原始数据
+
+        Returns:
+            tuple: (条目列表 [(捕获时间戳ns, 行bytes 或 (传感器ID, x, y, z)), ...], 累计接收条数)
+        """
+        with self._tail_lock:
+            return list(self._tail), self._tail_seq
+
+    def submit_lines(self, lines, capture_ns=None):
+        """提交一批文本行及其捕获时间戳（可在任意线程调用）"""
+        self._submit(('lines', (lines, capture_ns)), len(lines))
+
+    def submit_frames(self, frames):
+        """提交一批已解码的二进制帧 (sensor_ids, values[, capture_ns])"""
+        self._submit(('frames', frames), len(frames[0]))
+
+    def _submit(self, item, line_count):
+        if not self._running or not self.parsing_enabled:
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped_batches += 1
+                self.dropped_lines += line_count
+            self._dirty = True
+            return
+        with self._stats_lock:
+            self.enqueued_batches += 1
+            self.enqueued_lines += line_count
+            depth = self._queue.qsize()
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+
+    def get_stats(self):
+        """获取背压统计"""
+        with self._stats_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'queue_capacity': self._queue.maxsize,
+                'enqueued_batches': self.enqueued_batches,
+                'enqueued_lines': self.enqueued_lines,
+                'dropped_batches': self.dropped_batches,
+                'dropped_lines': self.dropped_lines,
+                'processed_lines': self.processed_lines,
+                'parsed_samples': self.parsed_samples
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._reset_counters()
+
+    def _run(self):
+        """解析线程函数"""
+        manager = self.sensor_data_manager
+        try:
+            while not self._stop_event.is_set() or not self._queue.empty():
+                try:
+                    item = self._queue.get(timeout=self.snapshot_interval)
+                except queue.Empty:
+                    self._emit_snapshot_if_due()
+                    continue
+
+                kind, payload = item
+                try:
+                    if kind == 'lines':
+                        count = len(payload[0])
+                        samples = manager.parse_batch(*payload)
+                    else:
+                        count = len(payload[0])
+                        samples = manager.add_samples(*payload)
+                except Exception as e:
+                    print(f"传感器数据接入错误: {e}")
+                    continue
+
+                with self._stats_lock:
+                    self.processed_lines += count
+                    self.parsed_samples += samples
+                self._dirty = True
+                self._emit_snapshot_if_due()
+        finally:
+            self._emit_snapshot_if_due(force=True)
+
+    def _emit_snapshot_if_due(self, force=False):
+        now = time.monotonic()
+        if not force and (not self._dirty or now - self._last_snapshot < self.snapshot_interval):
+            return
+        self._last_snapshot = now
+        self._dirty = False
+        tail, tail_seq = self.get_tail()
+        self.snapshot_signal.emit({
+            'latest': self.sensor_data_manager.get_latest_snapshot(),
+            'stats': self.get_stats(),
+            'tail': tail,
+            'tail_seq': tail_seq
+        })
@@ -1 +1,4 @@
-from .controller.control import InspireController
\ No newline at end of file
+from .controller.control import (
+    InspireController, HandSnapshot,
+    InspireError, InspireNotConnectedError, InspireTimeoutError, InspireChecksumError, InspireResponseError
+)
@@ -1 +1,4 @@
-from .control import InspireController
\ No newline at end of file
+from .control import (
+    InspireController, HandSnapshot,
+    InspireError, InspireNotConnectedError, InspireTimeoutError, InspireChecksumError, InspireResponseError
+)
@@ -1,13 +1,79 @@
 import serial
 import time
-from typing import Union, List
+import struct
+from dataclasses import dataclass
+from typing import Union, List, Optional, Tuple
 import numpy as np
 import threading
+from collections import deque
 from core.inspire.config import inspire_cfg
 from core.inspire.utils.convert import as_binary_angle
 
+# 数据包头: 0xEB 0x90 | ID | 长度 | 命令 | 地址（小端）
+_PACKET_HEADER = struct.Struct('<BBBBBH')
+
+# 设定值寄存器地址（每个自由度 2 字节）
+REG_ANGLE_SET = 0x05CE
+REG_FORCE_LIMIT = 0x05DA
+REG_SPEED_SET = 0x05F2
+
+# 遥测寄存器地址（角度/力/电流每个自由度 2 字节，错误/状态/温度每个自由度 1 字节）
+REG_ANGLE_ACT = 0x060A
+REG_FORCE_ACT = 0x062E
+REG_CURRENT = 0x063A
+REG_ERROR = 0x0646
+REG_STATUS = 0x064C
+REG_TEMP = 0x0652
+
+
+class InspireError(Exception):
+    """机械手通信错误"""
+
+
+class InspireNotConnectedError(InspireError):
+    """串口未连接或已关闭"""
+
+
+class InspireTimeoutError(InspireError):
+    """超时时间内没有收到匹配的响应帧"""
+
+
+class InspireChecksumError(InspireError):
+    """响应帧校验和错误"""
+
+
+class InspireResponseError(InspireError):
+    """响应帧有效但内容与请求不符（如数据长度不足）"""
+
+
+@dataclass(frozen=True)
+class HandSnapshot:
+    """一次读取得到的机械手遥测快照（不可变，可在线程间共享），未包含在读取范围内的字段为 None"""
+    timestamp: float  # 收到响应时的单调时钟时间（秒）
+    angle: Optional[Tuple[int, ...]] = None  # 实际角度 0~1000
+    force: Optional[Tuple[int, ...]] = None  # 实际受力（有符号）
+    current: Optional[Tuple[int, ...]] = None  # 电流
+    error: Optional[Tuple[int, ...]] = None  # 故障码
+    status: Optional[Tuple[int, ...]] = None  # 状态
+    temperature: Optional[Tuple[int, ...]] = None  # 温度
+
+    def age(self) -> float:
+        """快照距今的时间（秒）"""
+        return time.monotonic() - self.timestamp
+
+
 class InspireController:
     HAND_DOF = inspire_cfg['hand_dof']
+    POLL_STATS_WINDOW = 256  # 轮询统计使用的最近周期数
+    _DOF_WORDS = struct.Struct(f'<{HAND_DOF}H')  # 每个自由度 2 字节（无符号）
+    _DOF_SIGNED_WORDS = struct.Struct(f'<{HAND_DOF}h')  # 每个自由度 2 字节（有符号）
+    RESPONSE_TIMEOUT = 1.0  # 等待响应帧的默认超时（秒）
+    SERIAL_READ_TIMEOUT = 0.05  # 串口单次读取的超时，即检查响应超时的粒度（秒）
+    FORCE_LIMIT_MAX_AGE = 5.0  # 轮询期间 get_force_limit 默认接受的缓存时长（秒）
+
+    # 快照默认读取的连续寄存器范围：实际角度 ~ 温度
+    SNAPSHOT_START = REG_ANGLE_ACT
+    SNAPSHOT_END = REG_TEMP + HAND_DOF
 
     def __init__(self, port: str, baudrate: int, connect: bool = False) -> None:
         self.hand_id = 1
@@ -17,6 +83,11 @@ class InspireController:
         self.port = port if port else inspire_cfg['port']
         self.baudrate = baudrate if baudrate else inspire_cfg['baudrate']
         self.ser = None  # 延迟创建串口对象
+        self._rx = bytearray()  # 接收缓冲，见 _send_and_receive
+        self._bad_frames = 0
+        self._stale_frames = 0
+        self._packet_templates = {}  # 命令包模板，见 _packet_template
+        self._read_requests = {}  # 读寄存器请求包，见 _read_request
         
         self.initial_angle = inspire_cfg['initial_angle']
         self.binary_open = inspire_cfg['binary_open']
@@ -24,6 +95,23 @@ class InspireController:
         self.radian_to_cylinder_ratio = inspire_cfg['radian_to_cylinder_ratio']
         self.radian_to_cylinder_offset = inspire_cfg['radian_to_cylinder_offset']
 
+        # 后台遥测轮询（见 start_polling）：快照整体替换，读取方不需要加锁
+        self.max_age = None  # 取值方法默认接受的缓存时长（秒），None 表示总是读取串口
+        self._snapshot = None
+        self._force_limit = None  # (读取/设置时间, 力阈值)，见 get_force_limit
+        self._polling = False
+        self._poll_thread = None
+        self._poll_stop = threading.Event()
+        self._poll_callback = None
+        self._reset_poll_stats(0.0)
+
+        # 异步设定值写入（见 start_command_writer）：每个寄存器只保留最新的待写值
+        self._pending_writes = {}  # {寄存器地址: 数值}，按首次提交的顺序
+        self._write_cond = threading.Condition()
+        self._writer_thread = None
+        self._writer_running = False
+        self._reset_command_stats()
+
         if connect:
             self.connect()
 
@@ -42,7 +130,7 @@ class InspireController:
                 self.ser = serial.Serial(
                     port=self.port,
                     baudrate=self.baudrate,
-                    timeout=0.5  # 设置较短的超时时间
+                    timeout=self.SERIAL_READ_TIMEOUT
                 )
             return True
         except Exception as e:
@@ -59,6 +147,8 @@ class InspireController:
             try:
                 if not self.ser.is_open:
                     self.ser.open()
+                self._rx.clear()
+                self._force_limit = None  # 重新连接后设备可能已被其他程序修改或重新上电
                 return True
             except Exception as e:
                 print(f"打开串口失败: {e}")
@@ -66,6 +156,8 @@ class InspireController:
                 return False
 
     def disconnect(self):
+        self.stop_polling()
+        self.stop_command_writer()
         with self.lock:
             try:
                 if self.ser and not self.ser.closed:
@@ -80,6 +172,260 @@ class InspireController:
         with self.lock:
             return self.ser is not None and self.ser.is_open
 
+    # ------------------------------------------------------------------
+    # 后台遥测轮询
+    # ------------------------------------------------------------------
+
+    def start_polling(self, rate: float = 50.0, max_age: float = None, callback=None):
+        """启动后台轮询线程，按 rate 的频率调用 read_snapshot 并发布最新快照
+
+        轮询期间 get_angle(actual=True)、get_force、get_status、get_error 在快照
+        不超过 max_age 时直接返回缓存值，不再各自占用串口往返。
+
+        Args:
+            rate: 轮询频率（Hz）
+            max_age: 取值方法默认接受的缓存时长（秒），默认为两个轮询周期
+            callback: 每得到一个快照时在轮询线程中调用 callback(snapshot)
+        """
+        if rate <= 0:
+            raise ValueError('轮询频率必须大于0')
+        self.stop_polling()
+
+        period = 1.0 / rate
+        self.max_age = max_age if max_age is not None else 2 * period
+        self._poll_callback = callback
+        self._reset_poll_stats(rate)
+        self._poll_stop.clear()
+        self._polling = True
+        self._poll_thread = threading.Thread(target=self._poll_loop, args=(period,), daemon=True)
+        self._poll_thread.start()
+
+    def stop_polling(self):
+        """停止后台轮询，之后的取值方法恢复为直接读取串口"""
+        if not self._polling:
+            return
+        self._polling = False
+        self._poll_stop.set()
+        if self._poll_thread and self._poll_thread.is_alive() and self._poll_thread is not threading.current_thread():
+            self._poll_thread.join(timeout=1.0)
+        self._poll_thread = None
+        self.max_age = None
+
+    @property
+    def polling(self):
+        return self._polling
+
+    @property
+    def latest_snapshot(self) -> Optional[HandSnapshot]:
+        """最近一次轮询得到的快照，尚未轮询时为 None"""
+        return self._snapshot
+
+    def get_poll_stats(self):
+        """获取轮询统计
+
+        Returns:
+            dict: achieved_rate 为实际轮询频率，jitter_ms 为轮询间隔的标准差，
+            cycle_ms / max_cycle_ms 为单次读取耗时，snapshot_age_ms 为最新快照的时长
+        """
+        intervals = np.array(self._poll_intervals, dtype=np.float64)
+        cycles = np.array(self._poll_cycle_times, dtype=np.float64)
+        snapshot = self._snapshot
+        return {
+            'running': self._polling,
+            'rate': self._poll_rate,
+            'achieved_rate': float(1.0 / intervals.mean()) if len(intervals) and intervals.mean() > 0 else 0.0,
+            'jitter_ms': float(intervals.std() * 1000) if len(intervals) else 0.0,
+            'cycle_ms': float(cycles.mean() * 1000) if len(cycles) else 0.0,
+            'max_cycle_ms': float(cycles.max() * 1000) if len(cycles) else 0.0,
+            'cycles': self._poll_cycles,
+            'failures': self._poll_failures,
+            'snapshot_age_ms': snapshot.age() * 1000 if snapshot else None
+        }
+
+    def _reset_poll_stats(self, rate):
+        self._poll_rate = rate
+        self._poll_intervals = deque(maxlen=self.POLL_STATS_WINDOW)  # 最近的轮询间隔
+        self._poll_cycle_times = deque(maxlen=self.POLL_STATS_WINDOW)  # 最近的单次读取耗时
+        self._poll_cycles = 0
+        self._poll_failures = 0
+
+    def _poll_loop(self, period):
+        """轮询线程函数：按绝对时间排程，读取超时落后时不追赶"""
+        next_time = time.monotonic()
+        last_start = None
+        consecutive_failures = 0
+        while self._polling:
+            start = time.monotonic()
+            if last_start is not None:
+                self._poll_intervals.append(start - last_start)
+            last_start = start
+
+            try:
+                snapshot = self.read_snapshot()
+            except Exception as e:
+                if consecutive_failures == 0:  # 连续失败只打印第一次
+                    print(f"机械手遥测轮询错误: {e}")
+                snapshot = None
+            self._poll_cycle_times.append(time.monotonic() - start)
+            self._poll_cycles += 1
+
+            if snapshot is None:
+                self._poll_failures += 1
+                consecutive_failures += 1
+            else:
+                consecutive_failures = 0
+                self._snapshot = snapshot
+                if self._poll_callback:
+                    try:
+                        self._poll_callback(snapshot)
+                    except Exception as e:
+                        print(f"机械手遥测回调错误: {e}")
+
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._poll_stop.wait(delay)
+            else:
+                next_time = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # 异步设定值写入
+    # ------------------------------------------------------------------
+
+    def start_command_writer(self):
+        """启动后台写入线程
+
+        set_angle / set_speed / set_force_limit 以 wait=False 调用时只登记待写值并立即
+        返回；同一寄存器尚未写出的旧值被新值替换（最新值优先）。写入线程每次取出全部
+        待写值，连续写到总线上后再依次确认应答，而不是每条命令等待一次往返。
+        """
+        with self._write_cond:
+            if self._writer_running:
+                return
+            self._writer_running = True
+        self._writer_thread = threading.Thread(target=self._command_writer_loop, daemon=True)
+        self._writer_thread.start()
+
+    def stop_command_writer(self, flush: bool = True):
+        """停止后台写入线程
+
+        Args:
+            flush: True 时先写出尚未写出的设定值，False 时丢弃
+        """
+        with self._write_cond:
+            if not self._writer_running:
+                return
+            self._writer_running = False
+            if not flush:
+                self._command_stats['dropped'] += len(self._pending_writes)
+                self._pending_writes.clear()
+            self._write_cond.notify_all()
+        if self._writer_thread and self._writer_thread.is_alive() and self._writer_thread is not threading.current_thread():
+            self._writer_thread.join(timeout=2 * self.RESPONSE_TIMEOUT)
+        self._writer_thread = None
+
+    def get_command_stats(self):
+        """获取异步写入统计
+
+        Returns:
+            dict: submitted 为提交的设定值数，superseded 为写出前被新值替换的数量，
+            written / acked / rejected / failed 为写出、确认成功、设备拒绝、未收到有效应答的数量，
+            dropped 为未能写出而丢弃的数量，pending 为当前待写数量，ack_ms 为最近一批的确认耗时
+        """
+        with self._write_cond:
+            stats = dict(self._command_stats)
+            stats['pending'] = len(self._pending_writes)
+            stats['running'] = self._writer_running
+        return stats
+
+    def _reset_command_stats(self):
+        self._command_stats = {
+            'submitted': 0, 'superseded': 0, 'written': 0, 'acked': 0,
+            'rejected': 0, 'failed': 0, 'dropped': 0, 'batches': 0, 'ack_ms': 0.0
+        }
+
+    def _write_registers(self, addr: int, values: List[int], wait: bool):
+        """写设定值寄存器：wait 为 True 时同步写入并等待应答，否则交给后台写入线程"""
+        values = list(values)
+        with self._write_cond:
+            if addr in self._pending_writes:
+                self._command_stats['superseded'] += 1
+            if not wait:
+                self._pending_writes[addr] = values  # 已有待写值时原位替换，保持首次提交的顺序
+                self._command_stats['submitted'] += 1
+                self._write_cond.notify()
+            else:
+                self._pending_writes.pop(addr, None)
+        if not wait:
+            if not self._writer_running:
+                self.start_command_writer()
+            return
+
+        # 同步写入：上面已撤销同一寄存器尚未写出的旧值，避免其随后覆盖本次写入
+        packet = self._build_packet(len(values) * 2 + 3, 0x12, addr, values)
+        self._send_and_receive(packet)
+        if addr == REG_FORCE_LIMIT:
+            self._force_limit = (time.monotonic(), tuple(values))
+
+    def _command_writer_loop(self):
+        """写入线程函数：取出全部待写值，批量写出后确认应答"""
+        while True:
+            with self._write_cond:
+                while self._writer_running and not self._pending_writes:
+                    self._write_cond.wait()
+                if not self._pending_writes:
+                    return
+                batch = list(self._pending_writes.items())
+                self._pending_writes.clear()
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        """连续写出一批设定值，再按写出顺序接收各自的应答（应答数据 0x01 表示成功）"""
+        counts = {'written': 0, 'acked': 0, 'rejected': 0, 'failed': 0, 'dropped': 0}
+        start = time.monotonic()
+        with self.lock:
+            try:
+                self._write_packets([self._build_packet(len(values) * 2 + 3, 0x12, addr, values)
+                                     for addr, values in batch])
+                counts['written'] = len(batch)
+            except InspireError as e:
+                print(f"机械手设定值写入失败: {e}")
+                counts['dropped'] = len(batch)
+                batch = []
+
+            deadline = time.monotonic() + self.RESPONSE_TIMEOUT
+            for addr, values in batch:
+                try:
+                    frame = self._receive_frame(0x12, addr, deadline)
+                except InspireError as e:
+                    print(f"机械手设定值应答错误: {e}")
+                    counts['failed'] += 1
+                    continue
+                if len(frame) > 8 and frame[7] == 0x01:
+                    counts['acked'] += 1
+                    if addr == REG_FORCE_LIMIT:
+                        self._force_limit = (time.monotonic(), tuple(values))
+                else:
+                    counts['rejected'] += 1
+
+        with self._write_cond:
+            for key, value in counts.items():
+                self._command_stats[key] += value
+            self._command_stats['batches'] += 1
+            self._command_stats['ack_ms'] = (time.monotonic() - start) * 1000
+
+    def _cached(self, field: str, max_age: Optional[float]):
+        """返回缓存快照中的字段（列表），快照不存在或超过 max_age 时返回 None"""
+        if max_age is None:
+            max_age = self.max_age
+        snapshot = self._snapshot
+        if max_age is None or snapshot is None:
+            return None
+        value = getattr(snapshot, field)
+        if value is None or time.monotonic() - snapshot.timestamp > max_age:
+            return None
+        return list(value)
+
     @property
     def exceed_force_limit(self):
         force = np.array(self.get_force())
@@ -97,129 +443,189 @@ class InspireController:
         """计算校验和"""
         return sum(data[start:end]) & 0xff
 
-    def _split_to_bytes(self, value: int, little_endian: bool = True) -> tuple:
-        """
-        将整数拆分为高位和低位字节。
+    def _packet_template(self, data_len: int, cmd: int, addr: int, count: int) -> tuple:
+        """工具函数：获取命令包模板（首次使用时构建并缓存）
 
-        参数:
-            value (int): 要拆分的整数，范围为 -1 或 0 ~ 65535。
-            little_endian (bool): 字节顺序，'True'（低位在前，高位在后，默认）或 'big'（高位在前，低位在后）。
+        Returns:
+            tuple: (已填好包头、校验和位置为包头部分校验和的字节串, 数据部分的 struct 编码器, 包头部分的校验和)
+        """
+        key = (self.hand_id, data_len, cmd, addr, count)
+        template = self._packet_templates.get(key)
+        if template is None:
+            packet = bytearray(_PACKET_HEADER.size + count * 2 + 1)
+            _PACKET_HEADER.pack_into(packet, 0, 0xEB, 0x90, self.hand_id, data_len, cmd, addr)
+            header_sum = self._calculate_checksum(packet, 2, _PACKET_HEADER.size)
+            packet[-1] = header_sum
+            template = self._packet_templates[key] = (bytes(packet), struct.Struct(f'<{count}h'), header_sum)
+        return template
 
-        返回:
-            tuple: (高位字节, 低位字节) 或 (低位字节, 高位字节)，取决于 endian 参数。
+    def _build_packet(self, data_len: int, cmd: int, addr: int, data: List[int] = None) -> bytearray:
+        """工具函数：构建数据包
 
-        示例:
-            >>> controller._split_to_bytes(1000, 'little')
-            (232, 3)  # 0x03E8 -> (低位 0xE8, 高位 0x03)
-            >>> controller._split_to_bytes(1000, 'big')
-            (3, 232)  # 0x03E8 -> (高位 0x03, 低位 0xE8)
+        复制命令的包头模板，用 struct.pack_into 写入数据（小端，每个值 2 字节，-1 编码为
+        0xFFFF，取值范围 -1 ~ 32767），校验和只需在包头部分校验和上加数据字节和。
         """
-        if value == -1:
-            return 0xff, 0xff
-        if little_endian:
-            return value & 0xff, (value >> 8) & 0xff
-        else:
-            return (value >> 8) & 0xff, value & 0xff
+        count = len(data) if data else 0
+        template = self._packet_templates.get((self.hand_id, data_len, cmd, addr, count))
+        header, values, header_sum = template or self._packet_template(data_len, cmd, addr, count)
+        packet = bytearray(header)  # 轮询、写入和界面线程会同时构建数据包，因此每次复制模板而不共用缓冲
+        if data:
+            values.pack_into(packet, _PACKET_HEADER.size, *data)
+            packet[-1] = (header_sum + sum(packet[_PACKET_HEADER.size:-1])) & 0xff
+        return packet
 
-    def _bytes_to_int(self, high: int, low: int) -> int:
-        """工具函数：从字节数组合并为整数"""
-        if high == 0xff and low == 0xff:
-            return -1
-        return (high << 8) + low
+    def _read_request(self, addr: int, count: int) -> bytes:
+        """工具函数：读寄存器的请求包（内容只取决于地址和长度，首次使用时构建并缓存）"""
+        key = (self.hand_id, addr, count)
+        packet = self._read_requests.get(key)
+        if packet is None:
+            packet = self._read_requests[key] = bytes(self._build_packet(0x05, 0x11, addr, [count]))
+        return packet
 
-    def _build_packet(self, data_len: int, cmd: int, addr: int, data: List[int] = None) -> bytearray:
-        """工具函数：构建数据包"""
-        packet = [0xEB, 0x90, self.hand_id, data_len, cmd]  # 包头 + ID + 数据长度 + 命令
-        packet.extend(self._split_to_bytes(addr))  # 地址高低字节
-        if data:
-            for value in data:
-                packet.extend(self._split_to_bytes(value))  # 数据低字节在前，高字节在后
-        packet.append(self._calculate_checksum(packet, 2, len(packet)))
-        return bytearray(packet)
+    def _send_and_receive(self, packet: bytearray, timeout: float = None) -> bytes:
+        """工具函数：发送数据包并接收与之匹配的响应帧
+
+        不再每次清空输入缓冲、切换串口超时：接收到的字节累积在 self._rx 中，
+        按 0x90 0xEB 帧头同步、按长度字节取出整帧并校验，ID/命令/地址与请求不符的帧
+        （如上一次超时请求迟到的响应）被丢弃。
 
-    def _send_and_receive(self, packet: bytearray, response_len: int, timeout: float = 1.0) -> bytes:
-        """工具函数：发送数据并接收响应（带超时保护）
-        
         Args:
-            packet: 要发送的数据包
-            response_len: 期望接收的响应长度
-            timeout: 超时时间（秒）
+            packet: 要发送的数据包（由 _build_packet 构建）
+            timeout: 等待响应的超时时间（秒），默认为 RESPONSE_TIMEOUT
+
+        Returns:
+            bytes: 完整的响应帧（含帧头和校验和）
+
+        Raises:
+            InspireNotConnectedError: 串口未连接
+            InspireTimeoutError: 超时时间内没有收到匹配的响应帧
+            InspireChecksumError: 超时前只收到校验和错误的帧
+            InspireError: 串口读写失败
         """
+        deadline = time.monotonic() + (timeout if timeout is not None else self.RESPONSE_TIMEOUT)
         with self.lock:
-            try:
-                # 检查串口对象是否存在
-                if self.ser is None or not self.ser.is_open:
-                    print("串口未连接或已关闭")
-                    return b'\x00' * response_len  # 返回空响应
-                
-                # 清空输入缓冲区
-                if self.ser.in_waiting > 0:
-                    self.ser.read(self.ser.in_waiting)
-                
-                # 发送数据
-                self.ser.write(packet)
-                
-                # 设置读取超时
-                old_timeout = self.ser.timeout
-                self.ser.timeout = timeout
-                
-                try:
-                    # 接收响应
-                    response = self.ser.read(response_len)
-                    if len(response) < response_len:
-                        # 如果没有接收到足够的数据，尝试再次读取
-                        remaining = response_len - len(response)
-                        additional = self.ser.read(remaining)
-                        response += additional
-                    
-                    return response
-                finally:
-                    # 恢复原始超时设置
-                    self.ser.timeout = old_timeout
-                    
-            except Exception as e:
-                # 记录错误但不抛出，避免中断程序
-                print(f"串口通信错误: {e}")
-                return b'\x00' * response_len  # 返回空响应
+            self._write_packets([packet])
+            return self._receive_frame(packet[4], packet[5] | (packet[6] << 8), deadline)
 
-    def _parse_multi_dof_response(self, response: bytes, offset: int = 7) -> List[int]:
-        """工具函数: 解析多DOF响应数据"""
-        result = []
-        
-        # 检查响应数据长度是否足够
-        required_length = offset + self.HAND_DOF * 2  # 每个DOF需要2个字节
-        if len(response) < required_length:
-            print(f"警告: 响应数据长度不足 (需要: {required_length}, 实际: {len(response)})")
-            # 返回默认值而不是抛出异常
-            return [0] * self.HAND_DOF
-        
+    def _write_packets(self, packets: List[bytearray]):
+        """工具函数：连续写出若干数据包，须在持有 self.lock 时调用"""
+        if self.ser is None or not self.ser.is_open:
+            raise InspireNotConnectedError('串口未连接或已关闭')
         try:
-            for i in range(self.HAND_DOF):
-                byte_index = offset + i * 2
-                # 再次检查索引是否在范围内
-                if byte_index + 1 >= len(response):
-                    print(f"警告: 字节索引超出范围 (索引: {byte_index + 1}, 长度: {len(response)})")
-                    # 用0填充剩余的DOF
-                    result.extend([0] * (self.HAND_DOF - i))
+            self.ser.write(b''.join(packets))
+        except serial.SerialException as e:
+            raise InspireError(f'串口通信错误: {e}') from e
+
+    def _receive_frame(self, cmd: int, addr: int, deadline: float) -> bytes:
+        """工具函数：接收与命令、地址匹配的响应帧，须在持有 self.lock 时调用
+
+        Raises:
+            见 _send_and_receive
+        """
+        self._bad_frames = 0
+        self._stale_frames = 0
+        try:
+            while True:
+                frame, needed = self._extract_frame(cmd, addr)
+                if frame is not None:
+                    return frame
+                if time.monotonic() >= deadline:
                     break
-                
-                low, high = response[byte_index], response[byte_index + 1]
-                value = self._bytes_to_int(high, low)
-                result.append(value)
-        except Exception as e:
-            print(f"解析响应数据时出错: {e}")
-            # 返回默认值
-            return [0] * self.HAND_DOF
-            
-        return result
+                # 读取缺少的字节数：数据到齐即返回，串口超时只决定检查截止时间的粒度
+                self._rx += self.ser.read(max(needed, self.ser.in_waiting))
+        except serial.SerialException as e:
+            self._rx.clear()
+            raise InspireError(f'串口通信错误: {e}') from e
+
+        # 超时：丢弃半帧，避免与下一次请求的响应拼接
+        self._rx.clear()
+        if self._bad_frames:
+            raise InspireChecksumError(f'响应校验和错误 (命令: 0x{cmd:02X}, 地址: 0x{addr:04X})')
+        raise InspireTimeoutError(f'等待响应超时 (命令: 0x{cmd:02X}, 地址: 0x{addr:04X}, '
+                                  f'丢弃不匹配的帧: {self._stale_frames})')
+
+    def _extract_frame(self, cmd: int, addr: int):
+        """从接收缓冲中取出第一个与请求匹配的完整响应帧
+
+        帧格式: 0x90 0xEB | ID | 长度 | 命令 | 地址低 | 地址高 | 数据 ... | 校验和，
+        长度为命令、地址与数据的字节数，校验和为 ID 到数据末尾的字节和的低 8 位。
+
+        Returns:
+            tuple: (帧, 0)；缓冲中还没有完整的匹配帧时为 (None, 还需要读取的最少字节数)
+        """
+        rx = self._rx
+        while True:
+            start = rx.find(b'\x90\xeb')
+            if start < 0:
+                # 没有帧头：只保留可能是帧头前半的最后一个字节
+                del rx[:len(rx) - 1 if rx[-1:] == b'\x90' else len(rx)]
+                return None, 8 - len(rx)
+            del rx[:start]
+
+            if len(rx) < 4:
+                return None, 8 - len(rx)
+            total = rx[3] + 5
+            if len(rx) < total:
+                # 帧头可能是数据中偶然出现的 0x90 0xEB（长度字节随之无意义）：
+                # 后面已有完整有效的帧时跳过当前帧头，而不是等到超时
+                later = rx.find(b'\x90\xeb', 2)
+                if later < 0 or not self._is_valid_frame(rx, later):
+                    return None, total - len(rx)
+                self._bad_frames += 1
+                del rx[:later]
+                continue
+
+            if not self._is_valid_frame(rx, 0):
+                # 帧无效：可能是数据中偶然出现的 0x90 0xEB，跳过帧头重新同步
+                self._bad_frames += 1
+                del rx[:2]
+                continue
+
+            frame = bytes(rx[:total])
+            del rx[:total]
+            if frame[2] == self.hand_id and frame[4] == cmd and (frame[5] | (frame[6] << 8)) == addr:
+                return frame, 0
+            self._stale_frames += 1
+
+    def _is_valid_frame(self, rx: bytearray, start: int) -> bool:
+        """rx[start:] 是否以一个完整且校验和正确的帧开头"""
+        if len(rx) < start + 4 or rx[start + 3] < 3:
+            return False
+        end = start + rx[start + 3] + 5
+        return len(rx) >= end and self._calculate_checksum(rx, start + 2, end - 1) == rx[end - 1]
 
-    def set_angle(self, angle: Union[int, List[int]]):
+    def _parse_multi_dof_response(self, response: bytes, offset: int = 7, signed: bool = False) -> List[int]:
+        """工具函数: 解析多DOF响应数据（每个自由度 2 字节，无符号时 0xFFFF 表示 -1）
+
+        Raises:
+            InspireResponseError: 响应中的数据不足 HAND_DOF 个
+        """
+        required_length = offset + self.HAND_DOF * 2 + 1  # 每个DOF需要2个字节，末尾为校验和
+        if len(response) < required_length:
+            raise InspireResponseError(f'响应数据长度不足 (需要: {required_length}, 实际: {len(response)})')
+        if signed:
+            return list(self._DOF_SIGNED_WORDS.unpack_from(response, offset))
+        return [-1 if v == 0xFFFF else v for v in self._DOF_WORDS.unpack_from(response, offset)]
+
+    def _parse_byte_response(self, response: bytes, offset: int = 7) -> List[int]:
+        """工具函数: 解析每个自由度 1 字节的响应数据（故障码、状态等）"""
+        required_length = offset + self.HAND_DOF + 1
+        if len(response) < required_length:
+            raise InspireResponseError(f'响应数据长度不足 (需要: {required_length}, 实际: {len(response)})')
+        return list(response[offset:offset + self.HAND_DOF])
+
+    def set_angle(self, angle: Union[int, List[int]], wait: bool = True):
+        """设置角度
+
+        Args:
+            angle: 6 个关节的角度（或同一个值），范围 -1 ~ 1000，-1 表示保持不变
+            wait: False 时交给后台写入线程（见 start_command_writer），立即返回
+        """
         if isinstance(angle, int):
             angle = [angle] * self.HAND_DOF
         if len(angle) != self.HAND_DOF or any(a < -1 or a > 1000 for a in angle):
             raise ValueError('角度数据必须为6个, 且范围在 -1 ~ 1000')
-        packet = self._build_packet(0x0F, 0x12, 0x05CE, angle)
-        self._send_and_receive(packet, 9)
+        self._write_registers(REG_ANGLE_SET, angle, wait)
 
     def set_i_angle(self, i: int, angle: int):
         """设置第i个关节的角度"""
@@ -228,25 +634,35 @@ class InspireController:
         o[i] = angle
         self.set_angle(o)
     
-    def get_angle(self, actual: bool = False):
+    def get_angle(self, actual: bool = False, max_age: float = None):
+        """读取角度
+
+        Args:
+            actual: True 读取实际角度，False 读取设定角度
+            max_age: 实际角度可接受的缓存时长（秒），默认为 self.max_age，0 表示强制读取串口
+        """
+        if actual:
+            cached = self._cached('angle', max_age)
+            if cached is not None:
+                return cached
         addr = 0x060A if actual else 0x05CE
-        packet = self._build_packet(0x05, 0x11, addr, [0x0C])
-        response = self._send_and_receive(packet, 20)
+        packet = self._read_request(addr, 0x0C)
+        response = self._send_and_receive(packet)
         return self._parse_multi_dof_response(response)
 
     # def get_pos(self, actual: bool = False):
     #     addr = 0x05FE if actual else 0x05C2
     #     packet = self._build_packet(0x05, 0x11, addr, [0x0C])
-    #     response = self._send_and_receive(packet, 20)
+    #     response = self._send_and_receive(packet)
     #     return self._parse_multi_dof_response(response)
 
-    def set_speed(self, speed: Union[int, List[int]]):
+    def set_speed(self, speed: Union[int, List[int]], wait: bool = True):
+        """设置速度，wait 含义同 set_angle"""
         if isinstance(speed, int):
             speed = [speed] * self.HAND_DOF
         if len(speed) != self.HAND_DOF or any(s < 0 or s > 1000 for s in speed):
             raise ValueError('速度数据必须为6个, 且范围在 0 ~ 1000')
-        packet = self._build_packet(0x0F, 0x12, 0x05F2, speed)
-        self._send_and_receive(packet, 9)
+        self._write_registers(REG_SPEED_SET, speed, wait)
 
     def set_i_speed(self, i: int, speed: int):
         """设置第i个关节的速度"""
@@ -256,24 +672,26 @@ class InspireController:
         self.set_speed(o)
 
     def get_speed(self):
-        packet = self._build_packet(0x05, 0x11, 0x05F2, [0x0C])
-        response = self._send_and_receive(packet, 20)
+        packet = self._read_request(0x05F2, 0x0C)
+        response = self._send_and_receive(packet)
         return self._parse_multi_dof_response(response)
 
-    def get_force(self):
-        packet = self._build_packet(0x05, 0x11, 0x062E, [0x0C])
-        response = self._send_and_receive(packet, 20)
-        force = self._parse_multi_dof_response(response)
-        # 处理有符号数据
-        return [f - 65536 if f > 32767 else f for f in force]
-
-    def set_force_limit(self, force_limit: Union[int, List[int]]):
+    def get_force(self, max_age: float = None):
+        """读取实际受力，max_age 含义同 get_angle"""
+        cached = self._cached('force', max_age)
+        if cached is not None:
+            return cached
+        packet = self._read_request(0x062E, 0x0C)
+        response = self._send_and_receive(packet)
+        return self._parse_multi_dof_response(response, signed=True)
+
+    def set_force_limit(self, force_limit: Union[int, List[int]], wait: bool = True):
+        """设置力阈值，wait 含义同 set_angle"""
         if isinstance(force_limit, int):
             force_limit = [force_limit] * self.HAND_DOF
         if len(force_limit) != self.HAND_DOF or any(f < 0 or f > 1000 for f in force_limit):
             raise ValueError('力限制数据必须为6个，且范围在 0 ~ 1000')
-        packet = self._build_packet(0x0F, 0x12, 0x05DA, force_limit)
-        self._send_and_receive(packet, 9)
+        self._write_registers(REG_FORCE_LIMIT, force_limit, wait)
 
     def set_i_force_limit(self, i: int, force_limit: int):
         """设置第i个关节的力阈值"""
@@ -282,29 +700,106 @@ class InspireController:
         o[i] = force_limit
         self.set_force_limit(o)
 
-    def get_force_limit(self):
-        packet = self._build_packet(0x05, 0x11, 0x05DA, [0x0C])
-        response = self._send_and_receive(packet, 20)
-        return self._parse_multi_dof_response(response)
+    def get_force_limit(self, max_age: float = None):
+        """读取力阈值
+
+        力阈值通常只由 set_force_limit 写入，因此在缓存时长内直接返回最近一次设置/读取的值。
+        未指定 max_age 时，轮询期间使用 FORCE_LIMIT_MAX_AGE，否则总是读取串口；
+        力阈值校准和重新连接会清除缓存。
+        """
+        if max_age is None and self._polling:
+            max_age = self.FORCE_LIMIT_MAX_AGE
+        cached = self._force_limit
+        if cached is not None and max_age is not None:
+            timestamp, force_limit = cached
+            if time.monotonic() - timestamp <= max_age:
+                return list(force_limit)
+        packet = self._read_request(REG_FORCE_LIMIT, 0x0C)
+        response = self._send_and_receive(packet)
+        force_limit = self._parse_multi_dof_response(response)
+        self._force_limit = (time.monotonic(), tuple(force_limit))
+        return force_limit
 
     def gesture_force_clb(self):
         """力阈值校准, 该方法执行15秒"""
+        self._force_limit = None  # 校准会改写力阈值
         packet = self._build_packet(0x05, 0x12, 0x03F1, [0x01])
-        self._send_and_receive(packet, 18)
+        self._send_and_receive(packet)
+
+    def get_error(self, max_age: float = None):
+        """读取故障码，max_age 含义同 get_angle"""
+        cached = self._cached('error', max_age)
+        if cached is not None:
+            return cached
+        packet = self._read_request(0x0646, 0x06)
+        response = self._send_and_receive(packet)
+        return self._parse_byte_response(response)
+
+    def get_status(self, max_age: float = None):
+        """读取状态，max_age 含义同 get_angle"""
+        cached = self._cached('status', max_age)
+        if cached is not None:
+            return cached
+        packet = self._read_request(0x064C, 0x06)
+        response = self._send_and_receive(packet)
+        return self._parse_byte_response(response)
+
+    def read_snapshot(self, start: int = None, end: int = None) -> HandSnapshot:
+        """在一次请求/响应中读取一段连续寄存器并解码为遥测快照
+
+        默认读取 0x060A（实际角度）到温度寄存器末尾的整段，一次往返即可得到
+        get_angle(actual=True)、get_force、get_status、get_error 分别读取的内容。
 
-    def get_error(self):
-        packet = self._build_packet(0x05, 0x11, 0x0646, [0x06])
-        response = self._send_and_receive(packet, 14)
-        return list(response[7:13])
+        Args:
+            start: 起始寄存器地址，默认为 SNAPSHOT_START
+            end: 结束寄存器地址（不含），默认为 SNAPSHOT_END
 
-    def get_status(self):
-        packet = self._build_packet(0x05, 0x11, 0x064C, [0x06])
-        response = self._send_and_receive(packet, 14)
-        return list(response[7:13])
+        Returns:
+            HandSnapshot: 完全落在读取范围内的字段被解码，其余为 None
+
+        Raises:
+            InspireError: 通信失败或响应无效（见 _send_and_receive）
+        """
+        start = self.SNAPSHOT_START if start is None else start
+        end = self.SNAPSHOT_END if end is None else end
+        count = end - start
+        if not (0 < count <= 0xFF):
+            raise ValueError('读取的寄存器长度必须在 1 ~ 255 字节')
+
+        packet = self._read_request(start, count)
+        response = self._send_and_receive(packet)
+        if len(response) != count + 8:
+            raise InspireResponseError(f'遥测快照响应长度不符 (需要: {count + 8}, 实际: {len(response)})')
+
+        dof = self.HAND_DOF
+
+        def words(addr, signed=False):
+            offset = addr - start
+            if offset < 0 or offset + dof * 2 > count:
+                return None
+            if signed:
+                return self._DOF_SIGNED_WORDS.unpack_from(response, 7 + offset)
+            return tuple(-1 if v == 0xFFFF else v for v in self._DOF_WORDS.unpack_from(response, 7 + offset))
+
+        def octets(addr):
+            offset = addr - start
+            if offset < 0 or offset + dof > count:
+                return None
+            return tuple(response[7 + offset:7 + offset + dof])
+
+        return HandSnapshot(
+            timestamp=time.monotonic(),
+            angle=words(REG_ANGLE_ACT),
+            force=words(REG_FORCE_ACT, signed=True),
+            current=words(REG_CURRENT),
+            error=octets(REG_ERROR),
+            status=octets(REG_STATUS),
+            temperature=octets(REG_TEMP)
+        )
 
     def clear_error(self):
         packet = self._build_packet(0x05, 0x12, 0x03EC, [0x01])
-        self._send_and_receive(packet, 9)
+        self._send_and_receive(packet)
 
     def set_last_angle(self, angle: int, sleep: bool = True, callback=None):
         """大拇指翻转角度, 0~1000
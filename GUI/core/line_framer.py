@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# 视为空白的字节，全部由这些字节组成的行会被跳过
+_BLANK_BYTES = frozenset(b' \t\r\n\x0b\x0c')
+
+
+class LineFramer:
+    """基于预分配 bytearray 的按行分帧器
+
+    数据被拷贝进固定容量的缓冲区，换行符的查找从上次扫描结束的位置继续，
+    因此一段不含换行符的突发数据不会被重复扫描。完整的行以 memoryview
+    切片的形式交出，不产生中间拷贝；切片只在下一次 feed 之前有效。
+
+    未完成的行超过 max_line_length 时会被丢弃直到下一个换行符，
+    并计入 overflow_count / dropped_bytes。
+    """
+
+    def __init__(self, capacity=65536, max_line_length=4096):
+        if max_line_length <= 0:
+            raise ValueError("max_line_length 必须为正数")
+        # 缓冲区至少要能放下一整行（含换行符）
+        capacity = max(capacity, max_line_length + 1)
+
+        self.capacity = capacity
+        self.max_line_length = max_line_length
+
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0  # 当前未完成行的起始位置
+        self._end = 0  # 写入位置
+        self._scan = 0  # 下一次查找换行符的起始位置
+        self._discarding = False  # 正在丢弃超长行的剩余部分
+
+        # 统计
+        self.line_count = 0
+        self.overflow_count = 0
+        self.dropped_bytes = 0
+
+    def feed(self, data):
+        """写入数据并逐个产出完整的行（包含结尾的换行符）
+
+        Args:
+            data: bytes / bytearray / memoryview
+
+        Yields:
+            memoryview: 指向内部缓冲区的行切片，下一次 feed 后失效
+        """
+        src = memoryview(data)
+        pos = 0
+        total = len(src)
+
+        while pos < total:
+            if self._start == self._end:
+                # 没有未完成的行，直接从头写入
+                self._start = self._end = self._scan = 0
+            elif self.capacity - self._end < total - pos:
+                self._compact()
+            n = min(total - pos, self.capacity - self._end)
+            self._buf[self._end:self._end + n] = src[pos:pos + n]
+            self._end += n
+            pos += n
+            yield from self._scan_lines()
+
+    def pending(self):
+        """缓冲区中尚未组成完整行的字节数"""
+        return self._end - self._start
+
+    def reset(self):
+        """清空缓冲区（统计保留）"""
+        self._start = self._end = self._scan = 0
+        self._discarding = False
+
+    def get_stats(self):
+        """获取分帧统计"""
+        return {
+            'lines': self.line_count,
+            'overflows': self.overflow_count,
+            'dropped_bytes': self.dropped_bytes,
+            'pending_bytes': self.pending()
+        }
+
+    def _scan_lines(self):
+        """从上次扫描位置开始查找换行符并产出完整的行"""
+        buf = self._buf
+        while True:
+            nl = buf.find(b'\n', self._scan, self._end)
+            if nl < 0:
+                self._scan = self._end
+                if self._end - self._start > self.max_line_length:
+                    # 未完成的行已经超长，丢弃已缓存的部分
+                    if not self._discarding:
+                        self.overflow_count += 1
+                        self._discarding = True
+                    self.dropped_bytes += self._end - self._start
+                    self._start = self._scan = self._end
+                return
+
+            line_end = nl + 1
+            if self._discarding:
+                # 超长行的尾部
+                self.dropped_bytes += line_end - self._start
+                self._discarding = False
+            elif nl - self._start > self.max_line_length:
+                self.overflow_count += 1
+                self.dropped_bytes += line_end - self._start
+            elif not self._is_blank(self._start, nl):
+                self.line_count += 1
+                yield self._view[self._start:line_end]
+
+            self._start = self._scan = line_end
+
+    def _is_blank(self, start, end):
+        """判断区间内是否全为空白字节（正常数据行在首字节即返回）"""
+        buf = self._buf
+        for i in range(start, end):
+            if buf[i] not in _BLANK_BYTES:
+                return False
+        return True
+
+    def _compact(self):
+        """把未完成的行移到缓冲区开头，为新数据腾出空间"""
+        if self._start == 0:
+            return
+        # 剩余部分长度不超过 max_line_length，拷贝代价有界
+        tail = bytes(self._buf[self._start:self._end])
+        n = len(tail)
+        self._buf[0:n] = tail
+        self._scan -= self._start
+        self._end = n
+        self._start = 0
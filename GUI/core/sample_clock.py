@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""传感器样本的时间基准
+
+串口读取线程在数据到达时用 time.monotonic_ns() 打上捕获时间戳，存储中统一保存为
+单调时钟的秒数（float64）。单调时钟不受系统时间调整的影响，但没有日历意义，
+因此在模块加载时记录一对 (单调时间, 墙上时间) 锚点，导出时据此换算为墙上时间。
+"""
+
+import time
+from datetime import datetime
+import numpy as np
+
+# 时间锚点：同一时刻的单调时间（纳秒）和墙上时间（秒）
+_MONOTONIC_ANCHOR_NS = time.monotonic_ns()
+_WALL_ANCHOR = time.time()
+
+
+def capture_ns():
+    """当前的捕获时间戳（单调时钟，纳秒）"""
+    return time.monotonic_ns()
+
+
+def now():
+    """当前的单调时间（秒），与存储中的时间戳同一时间基准"""
+    return time.monotonic_ns() / 1e9
+
+
+def ns_to_seconds(ns):
+    """把纳秒捕获时间戳（标量或数组）转换为单调时钟的秒数"""
+    if np.isscalar(ns):
+        return ns / 1e9
+    return np.asarray(ns, dtype=np.int64) / 1e9
+
+
+def to_wall_time(timestamp, anchor=None):
+    """把单调时钟的秒数（标量或数组）换算为墙上时间（Unix 秒）
+
+    Args:
+        timestamp: 单调时钟的秒数
+        anchor: (单调时间秒数, 墙上时间) 锚点，默认使用本进程的锚点；
+            换算其他会话录制的数据时应传入录制时保存的锚点
+    """
+    monotonic_anchor, wall_anchor = anchor or get_anchor()
+    offset = wall_anchor - monotonic_anchor
+    if np.isscalar(timestamp):
+        return timestamp + offset
+    return np.asarray(timestamp, dtype=np.float64) + offset
+
+
+def get_anchor():
+    """获取时间锚点
+
+    Returns:
+        tuple: (单调时间秒数, 对应的墙上时间)
+    """
+    return _MONOTONIC_ANCHOR_NS / 1e9, _WALL_ANCHOR
+
+
+def format_timestamps(timestamps, anchor=None):
+    """把单调时钟的秒数数组向量化格式化为本地墙上时间 'YYYY-mm-dd HH:MM:SS.fff'
+
+    时区偏移取第一个样本时刻的本地偏移（同一批数据内不考虑夏令时切换）。
+
+    Args:
+        timestamps: 单调时钟的秒数数组
+        anchor: 时间锚点，含义同 to_wall_time
+
+    Returns:
+        numpy.ndarray: 字符串数组
+    """
+    wall = to_wall_time(np.asarray(timestamps, dtype=np.float64), anchor)
+    if len(wall) == 0:
+        return np.empty(0, dtype='<U23')
+    offset = datetime.fromtimestamp(wall[0]).astimezone().utcoffset().total_seconds()
+    millis = np.floor((wall + offset) * 1000).astype(np.int64).astype('datetime64[ms]')
+    return np.char.replace(np.datetime_as_string(millis, unit='ms'), 'T', ' ')
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""多传感器时间对齐与重采样
+
+各传感器的采样率和采样时刻不同，按列表下标拼接会错位。这里把所有传感器
+重采样到同一条等间隔时间轴上：对每个输出时刻用 numpy.searchsorted 向量化地
+找到相邻样本，再做线性插值、取最近样本或取前一个样本。
+
+历史数据较长（含磁盘层或录制文件）时使用 iter_aligned 逐块读取、逐块输出，
+每个传感器只保留覆盖当前输出段的样本和一个边界样本。
+"""
+
+import csv
+import numpy as np
+
+from core import sample_clock
+
+# 重采样方式
+METHOD_LINEAR = 'linear'      # 相邻两个样本线性插值
+METHOD_NEAREST = 'nearest'    # 取时间上最近的样本
+METHOD_PREVIOUS = 'previous'  # 取不晚于输出时刻的最近样本（零阶保持）
+METHODS = (METHOD_LINEAR, METHOD_NEAREST, METHOD_PREVIOUS)
+
+
+def estimate_rate(timestamps):
+    """根据相邻时间戳间隔的中位数估计采样率（Hz）
+
+    同一批读到的样本可能共用一个捕获时间戳，计算时忽略零间隔。
+
+    Returns:
+        float: 采样率，样本不足时返回 0.0
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if len(timestamps) < 2:
+        return 0.0
+    intervals = np.diff(timestamps)
+    intervals = intervals[intervals > 0]
+    if len(intervals) == 0:
+        return 0.0
+    # 共用时间戳的样本使平均间隔大于真实间隔，用总时长/样本数作为下限校正
+    span = timestamps[-1] - timestamps[0]
+    return max(1.0 / float(np.median(intervals)), (len(timestamps) - 1) / span)
+
+
+def make_time_base(series, rate=None, start=None, end=None):
+    """生成公共时间轴
+
+    Args:
+        series: {传感器ID: (时间戳数组, shape (n, 3) 的数值数组)}
+        rate: 输出采样率（Hz），默认取各传感器中最高的估计采样率
+        start: 起始时间（单调时钟秒数），默认为最早的样本
+        end: 结束时间（单调时钟秒数），默认为最晚的样本
+
+    Returns:
+        numpy.ndarray: 等间隔的时间戳数组
+    """
+    non_empty = [timestamps for timestamps, _ in series.values() if len(timestamps) > 0]
+    if not non_empty:
+        return np.empty(0, dtype=np.float64)
+
+    if start is None:
+        start = min(float(timestamps[0]) for timestamps in non_empty)
+    if end is None:
+        end = max(float(timestamps[-1]) for timestamps in non_empty)
+    if rate is None:
+        rate = max(estimate_rate(timestamps) for timestamps in non_empty)
+    return start + np.arange(_time_base_length(start, end, rate), dtype=np.float64) / (rate if rate > 0 else 1.0)
+
+
+def _time_base_length(start, end, rate):
+    """公共时间轴的点数（采样率无效时只有起点一个点）"""
+    if end < start:
+        return 0
+    if rate <= 0:
+        return 1
+    return int(np.floor((end - start) * rate + 1e-9)) + 1
+
+
+def resample(timestamps, values, time_base, method=METHOD_LINEAR, max_gap=None):
+    """把一个传感器的样本重采样到给定时间轴
+
+    超出该传感器样本时间范围的输出时刻，以及所用样本间隔（或距离）超过
+    max_gap 的输出时刻，结果为 NaN。
+
+    Args:
+        timestamps: 单调递增（允许相等）的时间戳数组
+        values: shape (n, 3) 的数值数组
+        time_base: 输出时间轴
+        method: METHOD_LINEAR / METHOD_NEAREST / METHOD_PREVIOUS
+        max_gap: 允许的最大样本间隔（秒），None 表示不限制
+
+    Returns:
+        numpy.ndarray: shape (len(time_base), 3) 的数组
+    """
+    if method not in METHODS:
+        raise ValueError(f"不支持的重采样方式: {method}")
+
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(-1, 3)
+    time_base = np.asarray(time_base, dtype=np.float64)
+    result = np.full((len(time_base), 3), np.nan)
+    n = len(timestamps)
+    if n == 0 or len(time_base) == 0:
+        return result
+
+    # right[i]: 第一个晚于 time_base[i] 的样本下标；left = right - 1 为不晚于它的最后一个样本
+    right = np.searchsorted(timestamps, time_base, side='right')
+    left = right - 1
+
+    if method == METHOD_PREVIOUS:
+        valid = left >= 0
+        index = np.where(valid, left, 0)
+        if max_gap is not None:
+            valid &= (time_base - timestamps[index]) <= max_gap
+        result[valid] = values[index[valid]]
+        return result
+
+    # 线性插值和最近样本只在样本时间范围内有效
+    valid = (time_base >= timestamps[0]) & (time_base <= timestamps[-1])
+    lo = np.clip(left, 0, n - 1)
+    hi = np.clip(right, 0, n - 1)
+
+    if method == METHOD_NEAREST:
+        use_hi = (timestamps[hi] - time_base) < (time_base - timestamps[lo])
+        index = np.where(use_hi, hi, lo)
+        if max_gap is not None:
+            valid &= np.abs(timestamps[index] - time_base) <= max_gap
+        result[valid] = values[index[valid]]
+        return result
+
+    gap = timestamps[hi] - timestamps[lo]
+    if max_gap is not None:
+        valid &= gap <= max_gap
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(gap > 0, (time_base - timestamps[lo]) / gap, 0.0)
+    interpolated = values[lo] + (values[hi] - values[lo]) * weight[:, None]
+    result[valid] = interpolated[valid]
+    return result
+
+
+def align_sensors(series, rate=None, method=METHOD_LINEAR, start=None, end=None, max_gap=None):
+    """把多个传感器对齐到公共时间轴
+
+    Args:
+        series: {传感器ID: (时间戳数组, shape (n, 3) 的数值数组)}
+        rate, start, end: 公共时间轴参数，见 make_time_base
+        method, max_gap: 重采样参数，见 resample
+
+    Returns:
+        tuple: (时间轴, {传感器ID: shape (len(时间轴), 3) 的数组})
+    """
+    time_base = make_time_base(series, rate, start, end)
+    aligned = {
+        sensor_id: resample(timestamps, values, time_base, method, max_gap)
+        for sensor_id, (timestamps, values) in series.items()
+    }
+    return time_base, aligned
+
+
+class _SampleBuffer:
+    """流式对齐中一个传感器的样本缓冲
+
+    按需从块迭代器读入样本；整块早于当前输出段的数据只保留最后一个样本，
+    输出一段之后丢弃不再需要的样本，只留下一个边界样本供下一段插值。
+    """
+
+    def __init__(self, blocks):
+        self._blocks = iter(blocks)
+        self._exhausted = False
+        self.timestamps = np.empty(0, dtype=np.float64)
+        self.values = np.empty((0, 3), dtype=np.float64)
+        # 读入第一个非空块，用于确定起始时间和估计采样率
+        self.fill(-np.inf, -np.inf)
+
+    def fill(self, segment_start, segment_end):
+        """读入样本，直到最后一个样本晚于 segment_end 或数据读完"""
+        timestamps = [self.timestamps]
+        values = [self.values]
+        last = self.timestamps[-1] if len(self.timestamps) else -np.inf
+        while not self._exhausted and last <= segment_end:
+            try:
+                block_timestamps, block_values = next(self._blocks)
+            except StopIteration:
+                self._exhausted = True
+                break
+            if len(block_timestamps) == 0:
+                continue
+            last = block_timestamps[-1]
+            if last < segment_start:
+                # 整块早于当前输出段，只保留最后一个样本作为边界
+                timestamps = [block_timestamps[-1:]]
+                values = [np.asarray(block_values).reshape(-1, 3)[-1:]]
+            else:
+                timestamps.append(block_timestamps)
+                values.append(np.asarray(block_values).reshape(-1, 3))
+        if len(timestamps) > 1:
+            self.timestamps = np.concatenate(timestamps).astype(np.float64, copy=False)
+            self.values = np.concatenate(values).astype(np.float64, copy=False)
+        elif timestamps[0] is not self.timestamps:
+            self.timestamps = np.array(timestamps[0], dtype=np.float64)
+            self.values = np.array(values[0], dtype=np.float64)
+
+    def discard_until(self, t):
+        """丢弃早于 t 的样本，保留不晚于 t 的最后一个样本作为边界"""
+        keep = max(int(np.searchsorted(self.timestamps, t, side='right')) - 1, 0)
+        self.timestamps = self.timestamps[keep:]
+        self.values = self.values[keep:]
+
+
+def iter_aligned(blocks, end, rate=None, method=METHOD_LINEAR, start=None, max_gap=None, block_size=65536):
+    """流式地把多个传感器对齐到公共时间轴，按段产出结果
+
+    各传感器的样本逐块读入，内存中只保留覆盖当前输出段的样本和一个边界样本，
+    内存占用与历史长度无关。结果与 align_sensors 相同；未给出 rate 时采样率由
+    各传感器的第一块数据估计。
+
+    Args:
+        blocks: {传感器ID: 按时间顺序产出 (timestamps, values) 块的可迭代对象}
+        end: 结束时间（单调时钟秒数）；流式读取无法预知最后一个样本，由调用方从存储的元数据给出
+        rate: 输出采样率（Hz），默认取各传感器第一块数据中最高的估计采样率
+        method, max_gap: 重采样参数，见 resample
+        start: 起始时间（单调时钟秒数），默认为最早的样本
+        block_size: 每段输出的行数
+
+    Yields:
+        tuple: (时间轴的一段, {传感器ID: shape (len(该段), 3) 的数组})
+    """
+    if method not in METHODS:
+        raise ValueError(f"不支持的重采样方式: {method}")
+
+    buffers = {sensor_id: _SampleBuffer(source) for sensor_id, source in blocks.items()}
+    non_empty = [buffer.timestamps for buffer in buffers.values() if len(buffer.timestamps)]
+    if not non_empty or end is None:
+        return
+    if start is None:
+        start = min(float(timestamps[0]) for timestamps in non_empty)
+    if rate is None:
+        rate = max(estimate_rate(timestamps) for timestamps in non_empty)
+
+    count = _time_base_length(start, end, rate)
+    step = 1.0 / rate if rate > 0 else 1.0
+    for offset in range(0, count, block_size):
+        time_base = start + np.arange(offset, min(offset + block_size, count), dtype=np.float64) * step
+        segment_start, segment_end = time_base[0], time_base[-1]
+        aligned = {}
+        for sensor_id, buffer in buffers.items():
+            buffer.fill(segment_start, segment_end)
+            aligned[sensor_id] = resample(buffer.timestamps, buffer.values, time_base, method, max_gap)
+            buffer.discard_until(segment_end)
+        yield time_base, aligned
+
+
+def collect_aligned(sensor_ids, segments):
+    """把逐段产出的对齐结果（见 iter_aligned）拼接为完整数组
+
+    Returns:
+        tuple: (时间轴, {传感器ID: shape (len(时间轴), 3) 的数组})
+    """
+    time_base = [np.empty(0, dtype=np.float64)]
+    parts = {sensor_id: [np.empty((0, 3), dtype=np.float64)] for sensor_id in sensor_ids}
+    for segment, aligned in segments:
+        time_base.append(segment)
+        for sensor_id, values in aligned.items():
+            parts[sensor_id].append(values)
+    return np.concatenate(time_base), {sensor_id: np.concatenate(values) for sensor_id, values in parts.items()}
+
+
+def write_aligned_csv(csvfile, time_base, aligned, anchor=None, block_size=65536):
+    """把对齐后的数据写为宽表 CSV（Timestamp, Sensor<ID>_Data1..3, ...）
+
+    按块格式化时间戳并写出，无数据的位置留空。
+
+    Args:
+        csvfile: 已打开的文本文件对象
+        time_base: 公共时间轴（单调时钟秒数）
+        aligned: {传感器ID: shape (len(时间轴), 3) 的数组}
+        anchor: 时间锚点，见 sample_clock.to_wall_time
+        block_size: 每次格式化和写出的行数
+
+    Returns:
+        int: 写出的行数
+    """
+    segments = (
+        (time_base[offset:offset + block_size],
+         {sensor_id: values[offset:offset + block_size] for sensor_id, values in aligned.items()})
+        for offset in range(0, len(time_base), block_size)
+    )
+    return write_aligned_segments(csvfile, list(aligned), segments, anchor)
+
+
+def write_aligned_segments(csvfile, sensor_ids, segments, anchor=None):
+    """把逐段产出的对齐结果（见 iter_aligned）增量写为宽表 CSV
+
+    Args:
+        csvfile: 已打开的文本文件对象
+        sensor_ids: 传感器ID列表，决定列顺序
+        segments: 产出 (时间轴的一段, {传感器ID: 数组}) 的可迭代对象
+        anchor: 时间锚点，见 sample_clock.to_wall_time
+
+    Returns:
+        int: 写出的行数
+    """
+    writer = csv.writer(csvfile)
+    sensor_ids = list(sensor_ids)
+    header = ['Timestamp']
+    for sensor_id in sensor_ids:
+        header.extend([f'Sensor{sensor_id}_Data1', f'Sensor{sensor_id}_Data2', f'Sensor{sensor_id}_Data3'])
+    writer.writerow(header)
+
+    if not sensor_ids:
+        return 0
+    count = 0
+    for time_base, aligned in segments:
+        block = np.hstack([aligned[sensor_id] for sensor_id in sensor_ids])
+        texts = sample_clock.format_timestamps(time_base, anchor).tolist()
+        rows = block.tolist()
+        # 只有含 NaN 的行才逐个替换为空值
+        for i in np.flatnonzero(np.isnan(block).any(axis=1)).tolist():
+            rows[i] = ['' if value != value else value for value in rows[i]]
+        writer.writerows([text] + row for text, row in zip(texts, rows))
+        count += len(texts)
+    return count
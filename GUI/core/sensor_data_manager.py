@@ -3,53 +3,374 @@
 
 import re
 import time
+import threading
 import os
 import csv
 import json
+from collections import OrderedDict
 import numpy as np
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 from datetime import datetime
+from core.sensor_protocol import TEXT_SAMPLE_PATTERN, decode_text_samples, decode_timed_text_samples
+from core import sample_clock
+from core.sensor_decimation import decimate, MODE_MINMAX
+from core.sensor_alignment import iter_aligned, collect_aligned, write_aligned_segments, METHOD_LINEAR
+from core.sensor_store import SpillStore, remove_spill_directory
+
+
+class RunningStatistics:
+    """三轴数据的增量统计
+
+    逐样本使用 Welford 算法、整块使用 Chan 合并公式更新均值和二阶中心矩，
+    同时维护最小值和最大值，查询为常数时间，与已采集的数据量无关。
+    """
+
+    AXES = ('data1', 'data2', 'data3')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = [0.0, 0.0, 0.0]
+        self.m2 = [0.0, 0.0, 0.0]
+        self.min = [float('inf')] * 3
+        self.max = [float('-inf')] * 3
+
+    def add(self, values):
+        """加入一个样本 [x, y, z]"""
+        self.count += 1
+        n = self.count
+        for axis, value in enumerate(values):
+            delta = value - self.mean[axis]
+            self.mean[axis] += delta / n
+            self.m2[axis] += delta * (value - self.mean[axis])
+            if value < self.min[axis]:
+                self.min[axis] = value
+            if value > self.max[axis]:
+                self.max[axis] = value
+
+    def add_block(self, values):
+        """加入一块样本，shape (n, 3)"""
+        nb = len(values)
+        if nb == 0:
+            return
+        block_mean = values.mean(axis=0)
+        block_m2 = ((values - block_mean) ** 2).sum(axis=0)
+        block_min = values.min(axis=0)
+        block_max = values.max(axis=0)
+
+        na = self.count
+        n = na + nb
+        for axis in range(3):
+            delta = float(block_mean[axis]) - self.mean[axis]
+            self.mean[axis] += delta * nb / n
+            self.m2[axis] += float(block_m2[axis]) + delta * delta * na * nb / n
+            self.min[axis] = min(self.min[axis], float(block_min[axis]))
+            self.max[axis] = max(self.max[axis], float(block_max[axis]))
+        self.count = n
+
+    def to_dict(self):
+        """转换为 {'data1': {'min', 'max', 'mean', 'std'}, ...}，std 为总体标准差"""
+        if self.count == 0:
+            return None
+        return {
+            name: {
+                'min': self.min[axis],
+                'max': self.max[axis],
+                'mean': self.mean[axis],
+                'std': (self.m2[axis] / self.count) ** 0.5
+            }
+            for axis, name in enumerate(self.AXES)
+        }
 
 
 class SensorData:
-    """传感器数据类，用于存储单个传感器的数据"""
+    """传感器数据类，用于存储单个传感器的数据
+
+    数据保存在预分配的列式环形缓冲区中（时间戳、x、y、z 四列 float64），
+    只保留最近 capacity 个样本，内存占用与会话时长无关。缓冲区长度为
+    2 * capacity，每个样本同时写入 i 和 i + capacity 两处，因此任意最近 N 个
+    样本在内存中总是连续的，可以直接以视图的形式交出而不需要拷贝。
+
+    提供磁盘层（spill_store）时，缓冲区写满前最旧的 spill_block 个样本会整块
+    转存到磁盘，不会被覆盖；get_all / iter_blocks 按时间顺序同时读取两层。
+
+    timestamp 中保存的是样本的捕获时间（单调时钟的秒数，见 core.sample_clock），
+    导出时通过 sample_clock.to_wall_time 换算为墙上时间。
+    timestamp / data1 / data2 / data3 以及 get_recent 返回的都是缓冲区的视图，
+    之后的写入可能覆盖其内容，需要长期保存时请先拷贝。
+    """
+
+    DEFAULT_CAPACITY = 65536  # 默认保留的样本数
+
+    def __init__(self, sensor_id, capacity=None, spill_store=None, spill_block=None):
+        """
+        Args:
+            sensor_id: 传感器ID
+            capacity: 内存中保留的样本数
+            spill_store: 磁盘层（SpillStore），为None时写满后直接覆盖最旧的样本
+            spill_block: 每次转存到磁盘的样本数，默认为容量的四分之一
+        """
+        capacity = int(capacity or self.DEFAULT_CAPACITY)
+        if capacity < 1:
+            raise ValueError("缓冲区容量必须大于0")
 
-    def __init__(self, sensor_id):
         self.sensor_id = sensor_id
-        self.timestamp = []
-        self.data1 = []  # x轴
-        self.data2 = []  # y轴
-        self.data3 = []  # z轴
+        self.capacity = capacity
+        self._columns = np.zeros((4, 2 * capacity), dtype=np.float64)  # 时间戳, x, y, z
+        self._pos = 0  # 下一个样本的写入位置 [0, capacity)
+        self._count = 0  # 缓冲区中的有效样本数
+        self.total_count = 0  # 累计写入的样本数（含已被覆盖或转存的）
+        self.generation = 0  # 每次清空数据时加一，用于使缓存失效
         self.latest_values = [0, 0, 0]  # 最新的三轴值
+        self.statistics = RunningStatistics()  # 全部样本的增量统计
+
+        self.spill = spill_store
+        self.spill_block = max(int(spill_block or capacity // 4), 1)
+
+    @property
+    def timestamp(self):
+        """捕获时间列（视图）"""
+        return self._window(0)
+
+    @property
+    def data1(self):
+        """x轴数据列（视图）"""
+        return self._window(1)
+
+    @property
+    def data2(self):
+        """y轴数据列（视图）"""
+        return self._window(2)
+
+    @property
+    def data3(self):
+        """z轴数据列（视图）"""
+        return self._window(3)
+
+    def _window(self, row, n=None):
+        """最近 n 个样本在缓冲区中的连续视图"""
+        n = self._count if n is None else min(max(int(n), 0), self._count)
+        end = self._pos + self.capacity
+        return self._columns[row, end - n:end]
+
+    def add_data(self, d1, d2, d3, timestamp=None):
+        """添加一组数据
+
+        Args:
+            timestamp: 捕获时间（单调时钟秒数），为None时使用当前时间
+        """
+        # 添加时间戳和数据，同时写入镜像位置
+        if timestamp is None:
+            timestamp = sample_clock.now()
+        if self.spill is not None and self._count == self.capacity:
+            self._spill_oldest(self.spill_block)
+        values = [float(d1), float(d2), float(d3)]
+        sample = (float(timestamp), *values)
+        pos = self._pos
+        columns = self._columns
+        columns[:, pos] = sample
+        columns[:, pos + self.capacity] = sample
+
+        pos += 1
+        self._pos = 0 if pos == self.capacity else pos
+        if self._count < self.capacity:
+            self._count += 1
+        self.total_count += 1
+
+        # 更新最新值和统计
+        self.latest_values = values
+        self.statistics.add(values)
+
+    def add_block(self, values, timestamps=None):
+        """批量添加多组数据
+
+        Args:
+            values: shape (n, 3) 的数组
+            timestamps: shape (n,) 的捕获时间数组（单调时钟秒数），为None时使用当前时间
+        """
+        n = len(values)
+        if n == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        if timestamps is None:
+            timestamps = np.full(n, sample_clock.now())
+        self.total_count += n
+        self.latest_values = values[-1].tolist()
+        self.statistics.add_block(values)
+
+        if self.spill is not None:
+            # 先把缓冲区中放不下的旧样本转存到磁盘
+            free = self.capacity - self._count
+            if n > free:
+                self._spill_oldest(max(self.spill_block, n - free))
+            if n > self.capacity:
+                head = n - self.capacity
+                self.spill.append(np.vstack([timestamps[:head], values[:head].T]))
+
+        # 超过容量的部分只保留最后 capacity 个样本
+        if n > self.capacity:
+            values = values[-self.capacity:]
+            timestamps = timestamps[-self.capacity:]
+            n = self.capacity
+
+        capacity = self.capacity
+        pos = self._pos
+        first = min(n, capacity - pos)
+        rest = n - first
+        for offset in (0, capacity):
+            self._columns[0, offset + pos:offset + pos + first] = timestamps[:first]
+            self._columns[1:, offset + pos:offset + pos + first] = values[:first].T
+            if rest:
+                self._columns[0, offset:offset + rest] = timestamps[first:]
+                self._columns[1:, offset:offset + rest] = values[first:].T
+
+        self._pos = (pos + n) % capacity
+        self._count = min(self._count + n, capacity)
+
+    def get_recent(self, n=None):
+        """获取最近 n 个样本（零拷贝视图）
+
+        Args:
+            n: 样本数，为None时返回缓冲区中的全部样本
+
+        Returns:
+            tuple: (timestamps, values)，shape 分别为 (n,) 和 (n, 3)
+        """
+        n = self._count if n is None else min(max(int(n), 0), self._count)
+        end = self._pos + self.capacity
+        return self._columns[0, end - n:end], self._columns[1:, end - n:end].T
 
-    def add_data(self, d1, d2, d3):
-        """添加一组数据"""
-        # 添加时间戳
-        self.timestamp.append(time.time())
+    def get_range(self, start=None, end=None):
+        """获取捕获时间在 [start, end] 内的样本
 
-        # 添加数据
-        self.data1.append(float(d1))
-        self.data2.append(float(d2))
-        self.data3.append(float(d3))
+        时间戳单调递增，在内存层的时间戳列上二分查找边界，复杂度为 O(log n)。
+        范围完全落在内存层时返回缓冲区的零拷贝视图；范围延伸到磁盘层时，
+        从磁盘层按块索引读取相交的部分并与内存层拼接（拷贝）。
 
-        # 更新最新值
-        self.latest_values = [float(d1), float(d2), float(d3)]
+        Args:
+            start: 起始时间（单调时钟秒数），None 表示最早的样本
+            end: 结束时间（单调时钟秒数），None 表示最新的样本
+
+        Returns:
+            tuple: (timestamps, values)，shape 分别为 (n,) 和 (n, 3)
+        """
+        window_start = self._pos + self.capacity - self._count
+        timestamps = self._columns[0, window_start:window_start + self._count]
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = self._count if end is None else int(np.searchsorted(timestamps, end, side='right'))
+        hi = max(hi, lo)
+        columns = self._columns[:, window_start + lo:window_start + hi]
+
+        # 起点早于内存层的第一个样本时，前面的部分在磁盘层
+        if lo == 0 and self.spill is not None and self.spill.sample_count:
+            spilled = self.spill.read_range(start, end)
+            if spilled.shape[1]:
+                columns = np.concatenate([spilled, columns], axis=1)
+        return columns[0], columns[1:].T
+
+    def get_last(self, seconds):
+        """获取最近 seconds 秒内（相对最新样本的捕获时间）的样本
+
+        Returns:
+            tuple: (timestamps, values)，见 get_range
+        """
+        latest = self.get_latest_timestamp()
+        if latest is None:
+            return self.get_recent(0)
+        return self.get_range(latest - seconds, None)
+
+    def _spill_oldest(self, n):
+        """把缓冲区中最旧的 n 个样本转存到磁盘层"""
+        n = min(n, self._count)
+        if n == 0:
+            return
+        start = self._pos + self.capacity - self._count
+        self.spill.append(self._columns[:, start:start + n])
+        self._count -= n
+
+    def iter_blocks(self):
+        """按时间顺序逐块读取两层中的全部样本（磁盘层为内存映射）
+
+        Yields:
+            tuple: (timestamps, values)，shape 分别为 (n,) 和 (n, 3)
+        """
+        if self.spill is not None:
+            for columns in self.spill.iter_chunks():
+                yield columns[0], columns[1:].T
+        if self._count:
+            yield self.get_recent()
+
+    def snapshot_blocks(self):
+        """固定两层当前的内容，返回之后可以不持锁逐块读取的迭代器
+
+        磁盘层的块写出后不再修改，只复制块列表；内存层拷贝一份（大小受缓冲区容量限制）。
+        调用本方法时须持有管理器的锁，返回的迭代器可在锁外使用。
+
+        Returns:
+            iterator: 按时间顺序产出 (timestamps, values) 的迭代器，见 iter_blocks
+        """
+        chunks = list(self.spill.chunks) if self.spill is not None else []
+        window = self._window_columns().copy()
+        return self._iter_snapshot(chunks, window)
+
+    def _iter_snapshot(self, chunks, window):
+        if chunks:
+            for columns in self.spill.iter_chunks(chunks):
+                yield columns[0], columns[1:].T
+        if window.shape[1]:
+            yield window[0], window[1:].T
+
+    def get_all(self):
+        """读取两层中的全部样本（拷贝）
+
+        Returns:
+            tuple: (timestamps, values)，shape 分别为 (n,) 和 (n, 3)
+        """
+        if self.spill is None or self.spill.sample_count == 0:
+            timestamps, values = self.get_recent()
+            return timestamps.copy(), values.copy()
+        columns = np.concatenate([self.spill.read_all(), self._window_columns()], axis=1)
+        return columns[0], columns[1:].T
+
+    def _window_columns(self):
+        """缓冲区中全部有效样本的 (4, n) 视图"""
+        end = self._pos + self.capacity
+        return self._columns[:, end - self._count:end]
 
     def clear_data(self):
-        """清空数据"""
-        self.timestamp.clear()
-        self.data1.clear()
-        self.data2.clear()
-        self.data3.clear()
+        """清空数据（包括磁盘层）"""
+        self._pos = 0
+        self._count = 0
+        self.total_count = 0
         self.latest_values = [0, 0, 0]
+        self.statistics.reset()
+        self.generation += 1
+        if self.spill is not None:
+            self.spill.clear()
 
     def get_latest_values(self):
         """获取最新的数据值"""
         return self.latest_values
 
+    def get_latest_timestamp(self):
+        """获取最新样本的捕获时间（单调时钟秒数），无数据时返回None"""
+        if self._count == 0:
+            return None
+        return float(self._columns[0, self._pos + self.capacity - 1])
+
     def get_data_count(self):
-        """获取数据点数量"""
-        return len(self.timestamp)
+        """获取缓冲区中保留的数据点数量"""
+        return self._count
+
+    def get_stored_count(self):
+        """获取两层合计保存的数据点数量"""
+        return self._count + (self.spill.sample_count if self.spill is not None else 0)
+
+    def get_memory_usage(self):
+        """缓冲区占用的字节数（固定，与写入的样本数无关）"""
+        return self._columns.nbytes
 
 
 class SensorDataManager(QObject):
@@ -58,23 +379,59 @@ class SensorDataManager(QObject):
     # 定义信号
     data_updated_signal = pyqtSignal(int, list)  # 数据更新信号 (传感器ID, [data1, data2, data3])
     data_parsed_signal = pyqtSignal(bool)  # 数据解析状态信号
+    batch_updated_signal = pyqtSignal(dict)  # 批量更新信号 {传感器ID: [data1, data2, data3]}，每批发射一次
+    samples_added_signal = pyqtSignal(object)  # 新存储的样本 (sensor_ids, values, timestamps)，在写入线程中发射
 
-    def __init__(self):
+    DECIMATION_CACHE_SIZE = 256  # 降采样结果缓存的条目数（滚动显示时每个传感器约占 blocks + 1 条）
+
+    def __init__(self, buffer_capacity=None, spill_to_disk=False, spill_block=None):
+        """
+        Args:
+            buffer_capacity: 每个传感器在内存中保留的样本数，为None时使用 SensorData.DEFAULT_CAPACITY
+            spill_to_disk: 内存写满后是否把旧数据转存到 data_dir 下的磁盘层，否则直接覆盖
+            spill_block: 每次转存的样本数，为None时为容量的四分之一
+        """
         super().__init__()
 
         # 传感器数据字典 {sensor_id: SensorData对象}
         self.sensors = {}
+        self.buffer_capacity = buffer_capacity or SensorData.DEFAULT_CAPACITY
+        self.spill_to_disk = spill_to_disk
+        self.spill_block = spill_block
+        # 解析可能在工作线程中进行，读写传感器数据时加锁
+        self.lock = threading.RLock()
+
+        # 降采样结果缓存 {(传感器ID, start, end, points, mode): (有效性标记, 结果)}，按最近使用淘汰
+        self._decimation_cache = OrderedDict()
 
         # 数据正则表达式匹配模式
         self.pattern = re.compile(r'sensor(\d+):\s*([-+]?\d*\.?\d+),\s*([-+]?\d*\.?\d+),\s*([-+]?\d*\.?\d+)')
+        # 批量解析使用的模式：空白只匹配行内的空格和制表符，避免跨行匹配
+        self.batch_pattern = TEXT_SAMPLE_PATTERN
 
         # 数据文件目录
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
-    def parse_data(self, data_str):
-        """解析传感器数据字符串"""
+        # 磁盘层目录：每个会话一个子目录，清空数据或关闭时删除
+        session = f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}"
+        self.spill_dir = os.path.join(self.data_dir, "spill", session)
+
+    def _create_sensor(self, sensor_id):
+        """创建传感器数据对象（按配置带上磁盘层）"""
+        spill_store = None
+        if self.spill_to_disk:
+            spill_store = SpillStore(self.spill_dir, sensor_id)
+        return SensorData(sensor_id, self.buffer_capacity, spill_store, self.spill_block)
+
+    def parse_data(self, data_str, capture_ns=None):
+        """解析传感器数据字符串
+
+        Args:
+            data_str: 一行传感器数据
+            capture_ns: 该行的捕获时间戳（time.monotonic_ns），为None时以解析时刻为准
+        """
         try:
             data_str = data_str.strip()
             # 查找匹配模式
@@ -86,15 +443,25 @@ class SensorDataManager(QObject):
                 data2 = match.group(3)
                 data3 = match.group(4)
 
-                # 确保传感器实例存在
-                if sensor_id not in self.sensors:
-                    self.sensors[sensor_id] = SensorData(sensor_id)
+                with self.lock:
+                    # 确保传感器实例存在
+                    if sensor_id not in self.sensors:
+                        self.sensors[sensor_id] = self._create_sensor(sensor_id)
 
-                # 添加数据
-                self.sensors[sensor_id].add_data(data1, data2, data3)
+                    # 添加数据
+                    if capture_ns is None:
+                        timestamp = sample_clock.now()
+                    else:
+                        timestamp = sample_clock.ns_to_seconds(capture_ns)
+                    self.sensors[sensor_id].add_data(data1, data2, data3, timestamp)
 
                 # 发射数据更新信号
-                self.data_updated_signal.emit(sensor_id, [float(data1), float(data2), float(data3)])
+                values = [float(data1), float(data2), float(data3)]
+                if self.receivers(self.data_updated_signal) > 0:
+                    self.data_updated_signal.emit(sensor_id, values)
+                if self.receivers(self.samples_added_signal) > 0:
+                    self.samples_added_signal.emit(
+                        (np.array([sensor_id]), np.array([values]), np.array([timestamp])))
 
                 # 发射数据解析状态信号 - 成功
                 self.data_parsed_signal.emit(True)
@@ -110,6 +477,75 @@ class SensorDataManager(QObject):
             self.data_parsed_signal.emit(False)
             return False
 
+    def parse_batch(self, lines_or_bytes, capture_ns=None):
+        """批量解析传感器数据
+
+        对整块文本只做一次正则扫描，所有数值一次性转换为 NumPy 数组，
+        再按传感器整块写入，每批只发射一次汇总更新。
+
+        Args:
+            lines_or_bytes: 行列表（bytes 或 str）、或一整块 bytes / str 文本
+            capture_ns: 与行列表等长的捕获时间戳（time.monotonic_ns），为None时以解析时刻为准
+
+        Returns:
+            int: 解析成功的样本数
+        """
+        try:
+            if capture_ns is not None:
+                sensor_ids, values, capture_ns = decode_timed_text_samples(
+                    lines_or_bytes, capture_ns, self.batch_pattern)
+            else:
+                sensor_ids, values = decode_text_samples(lines_or_bytes, self.batch_pattern)
+            if len(sensor_ids) == 0:
+                self.data_parsed_signal.emit(False)
+                return 0
+            return self.add_samples(sensor_ids, values, capture_ns)
+        except Exception as e:
+            print(f"批量数据解析错误: {e}")
+            self.data_parsed_signal.emit(False)
+            return 0
+
+    def add_samples(self, sensor_ids, values, capture_ns=None):
+        """批量添加已解码的样本（例如二进制帧）
+
+        Args:
+            sensor_ids: shape (n,) 的传感器ID数组
+            values: shape (n, 3) 的三轴数值数组
+            capture_ns: shape (n,) 的捕获时间戳（time.monotonic_ns），为None时以当前时刻为准
+
+        Returns:
+            int: 添加的样本数
+        """
+        sensor_ids = np.asarray(sensor_ids)
+        values = np.asarray(values, dtype=np.float64).reshape(-1, 3)
+        if len(sensor_ids) == 0:
+            return 0
+        if capture_ns is None:
+            timestamps = np.full(len(sensor_ids), sample_clock.now())
+        else:
+            timestamps = sample_clock.ns_to_seconds(capture_ns)
+
+        latest = {}
+        with self.lock:
+            for sensor_id in np.unique(sensor_ids).tolist():
+                mask = sensor_ids == sensor_id
+                block = values[mask]
+
+                # 确保传感器实例存在
+                if sensor_id not in self.sensors:
+                    self.sensors[sensor_id] = self._create_sensor(sensor_id)
+                self.sensors[sensor_id].add_block(block, timestamps[mask])
+                latest[sensor_id] = block[-1].tolist()
+
+        # 每个传感器只发射一次最新值，整批再发射一次汇总更新
+        if self.receivers(self.data_updated_signal) > 0:
+            for sensor_id, sensor_values in latest.items():
+                self.data_updated_signal.emit(sensor_id, sensor_values)
+        self.batch_updated_signal.emit(latest)
+        self.samples_added_signal.emit((sensor_ids, values, timestamps))
+        self.data_parsed_signal.emit(True)
+        return len(sensor_ids)
+
     def get_sensor_data(self, sensor_id):
         """获取指定传感器的数据对象"""
         if sensor_id in self.sensors:
@@ -118,24 +554,188 @@ class SensorDataManager(QObject):
 
     def get_all_sensors(self):
         """获取所有传感器ID列表"""
-        return list(self.sensors.keys())
+        with self.lock:
+            return list(self.sensors.keys())
+
+    def get_latest_snapshot(self):
+        """获取所有传感器最新值的快照 {传感器ID: [data1, data2, data3]}"""
+        with self.lock:
+            return {sensor_id: list(sensor.get_latest_values()) for sensor_id, sensor in self.sensors.items()}
+
+    def get_storage_stats(self):
+        """获取存储占用统计
+
+        Returns:
+            dict: {'memory_bytes', 'memory_samples', 'disk_bytes', 'disk_samples'}
+        """
+        stats = {'memory_bytes': 0, 'memory_samples': 0, 'disk_bytes': 0, 'disk_samples': 0}
+        with self.lock:
+            for sensor in self.sensors.values():
+                stats['memory_bytes'] += sensor.get_memory_usage()
+                stats['memory_samples'] += sensor.get_data_count()
+                if sensor.spill is not None:
+                    stats['disk_bytes'] += sensor.spill.disk_bytes
+                    stats['disk_samples'] += sensor.spill.sample_count
+        return stats
+
+    def close(self):
+        """释放存储资源，删除本会话的磁盘层文件"""
+        with self.lock:
+            for sensor in self.sensors.values():
+                if sensor.spill is not None:
+                    sensor.spill.clear()
+            remove_spill_directory(self.spill_dir)
 
     def clear_sensor_data(self, sensor_id=None):
         """清空指定传感器的数据，如果sensor_id为None则清空所有传感器数据"""
-        if sensor_id is not None:
-            if sensor_id in self.sensors:
-                self.sensors[sensor_id].clear_data()
-        else:
-            for sensor in self.sensors.values():
-                sensor.clear_data()
+        with self.lock:
+            if sensor_id is not None:
+                if sensor_id in self.sensors:
+                    self.sensors[sensor_id].clear_data()
+            else:
+                for sensor in self.sensors.values():
+                    sensor.clear_data()
 
-    def save_to_csv(self, sensor_id=None, filename=None, filepath=None):
+    def get_decimated(self, sensor_id, start=None, end=None, points=1000, mode=MODE_MINMAX):
+        """获取某个传感器在时间范围内降采样到约 points 个点的数据（用于绘图）
+
+        结果按 (范围, 点数, 方式) 缓存：范围已经封闭（end 早于最新样本且数据不会再被覆盖）
+        时缓存一直有效，直到数据被清空；范围包含最新数据时，有新样本写入才重新计算。
+
+        Args:
+            sensor_id: 传感器ID
+            start: 起始时间（单调时钟秒数），None 表示最早的样本
+            end: 结束时间（单调时钟秒数），None 表示最新的样本
+            points: 目标点数，通常取绘图区域的像素宽度
+            mode: 降采样方式 minmax / lttb
+
+        Returns:
+            tuple: (timestamps, values)，传感器不存在时返回None；结果为共享的缓存数组，请勿修改
+        """
+        with self.lock:
+            sensor_data = self.sensors.get(sensor_id)
+            if sensor_data is None:
+                return None
+
+            latest = sensor_data.get_latest_timestamp()
+            oldest = float(sensor_data.timestamp[0]) if sensor_data.get_data_count() else None
+            closed = (end is not None and latest is not None and end < latest
+                      and (sensor_data.spill is not None or (start is not None and start >= oldest)))
+            token = (sensor_data.generation,) if closed else (sensor_data.generation, sensor_data.total_count)
+
+            key = (sensor_id, start, end, int(points), mode)
+            cached = self._decimation_cache.get(key)
+            if cached is not None and cached[0] == token:
+                self._decimation_cache.move_to_end(key)
+                return cached[1]
+
+            timestamps, values = sensor_data.get_range(start, end)
+            result = decimate(timestamps, values, points, mode)
+            if result[0] is timestamps:
+                # 未降采样时原样返回的是缓冲区视图，缓存前拷贝
+                result = (timestamps.copy(), values.copy())
+
+            self._decimation_cache[key] = (token, result)
+            self._decimation_cache.move_to_end(key)
+            while len(self._decimation_cache) > self.DECIMATION_CACHE_SIZE:
+                self._decimation_cache.popitem(last=False)
+            return result
+
+    def get_decimated_recent(self, sensor_id, duration, points=1000, mode=MODE_MINMAX, blocks=8):
+        """获取某个传感器最近 duration 秒降采样后的数据（用于滚动显示的曲线）
+
+        窗口起点随最新样本每帧移动，直接以 (start, end) 调用 get_decimated 时缓存每帧都不命中。
+        这里把时间轴按 duration / blocks 对齐分块：中间已经封闭的整块各自降采样并缓存，
+        每帧只重新计算窗口起点所在的部分块和包含最新样本的末块。
+
+        Args:
+            sensor_id: 传感器ID
+            duration: 窗口时长（秒），相对最新样本
+            points: 整个窗口的目标点数
+            mode: 降采样方式 minmax / lttb
+            blocks: 窗口划分的块数
+
+        Returns:
+            tuple: (timestamps, values)，传感器不存在或没有数据时返回None
+        """
+        with self.lock:
+            sensor_data = self.sensors.get(sensor_id)
+            latest = sensor_data.get_latest_timestamp() if sensor_data else None
+            if latest is None:
+                return None
+
+            start = latest - duration
+            step = duration / blocks
+            block_points = max(int(points) // (blocks + 1), 2)  # 起点部分块 + 中间 blocks - 1 个整块 + 末块
+            first, last = int(np.floor(start / step)) + 1, int(np.floor(latest / step))
+
+            # get_range 的范围包含两端：块的终点取块边界前一个浮点数，边界上的样本只属于后一块
+            def block_end(k):
+                return np.nextafter(k * step, -np.inf)
+
+            # 起点所在的部分块每帧都不同，不进入缓存
+            parts = [decimate(*sensor_data.get_range(start, block_end(first)), block_points, mode)]
+            parts += [self.get_decimated(sensor_id, k * step, block_end(k + 1), block_points, mode)
+                      for k in range(first, last)]
+            parts.append(self.get_decimated(sensor_id, last * step, None, block_points, mode))
+
+            timestamps = np.concatenate([part[0] for part in parts])
+            values = np.concatenate([part[1] for part in parts])
+        return timestamps, values
+
+    def iter_aligned_data(self, sensor_ids=None, rate=None, method=METHOD_LINEAR, start=None, end=None,
+                          max_gap=None, block_size=65536):
+        """把多个传感器的数据流式地对齐到公共时间轴，按段产出结果
+
+        持锁时只固定各传感器当前的数据（磁盘层块列表和内存层拷贝），之后在锁外逐块读取
+        （磁盘层为内存映射）并逐段对齐，不会把完整历史载入内存，也不阻塞数据写入。
+        参数见 get_aligned_data。
+
+        Yields:
+            tuple: (时间轴的一段, {传感器ID: shape (len(该段), 3) 的数组})
+        """
+        with self.lock:
+            if sensor_ids is None:
+                sensor_ids = self.get_all_sensors()
+            sensors = [self.sensors[sid] for sid in sensor_ids if sid in self.sensors]
+            blocks = {sensor.sensor_id: sensor.snapshot_blocks() for sensor in sensors}
+            if end is None:
+                latest = [sensor.get_latest_timestamp() for sensor in sensors]
+                latest = [t for t in latest if t is not None]
+                end = max(latest) if latest else None
+        return iter_aligned(blocks, end, rate, method, start, max_gap, block_size)
+
+    def get_aligned_data(self, sensor_ids=None, rate=None, method=METHOD_LINEAR, start=None, end=None, max_gap=None):
+        """把多个传感器的数据对齐到公共时间轴
+
+        对齐过程逐块进行（见 iter_aligned_data），只有输出结果完整驻留内存。
+
+        Args:
+            sensor_ids: 传感器ID列表，默认全部
+            rate: 输出采样率（Hz），默认取各传感器第一块数据中最高的估计采样率
+            method: 重采样方式 linear / nearest / previous
+            start: 起始时间（单调时钟秒数）
+            end: 结束时间（单调时钟秒数）
+            max_gap: 允许的最大样本间隔（秒），超过时输出 NaN
+
+        Returns:
+            tuple: (时间轴, {传感器ID: shape (len(时间轴), 3) 的数组})
+        """
+        with self.lock:
+            if sensor_ids is None:
+                sensor_ids = self.get_all_sensors()
+            sensor_ids = [sid for sid in sensor_ids if sid in self.sensors]
+        return collect_aligned(sensor_ids, self.iter_aligned_data(sensor_ids, rate, method, start, end, max_gap))
+
+    def save_to_csv(self, sensor_id=None, filename=None, filepath=None, rate=None, method=METHOD_LINEAR):
         """将传感器数据保存为CSV文件
 
         Args:
             sensor_id: 要保存的传感器ID，如果为None则保存所有传感器
             filename: 文件名，如果为None则自动生成
             filepath: 完整文件路径，如果提供则直接使用该路径保存，忽略 filename 参数
+            rate: 保存所有传感器时公共时间轴的采样率（Hz），默认取最高的估计采样率
+            method: 保存所有传感器时的重采样方式 linear / nearest / previous
 
         Returns:
             bool: 保存是否成功，返回实际保存的文件路径
@@ -159,7 +759,7 @@ class SensorDataManager(QObject):
             if not os.path.exists(save_dir):
                 os.makedirs(save_dir)
 
-            # 写入CSV文件
+            # 写入CSV文件：持锁只固定当前数据，之后在锁外逐块写出，写入过程中不阻塞数据追加
             with open(filepath, 'w', newline='') as csvfile:
                 writer = csv.writer(csvfile)
 
@@ -167,90 +767,94 @@ class SensorDataManager(QObject):
                 if sensor_id is not None:
                     # 单个传感器
                     writer.writerow(['Timestamp', 'Data1', 'Data2', 'Data3'])
-                    sensor_data = self.get_sensor_data(sensor_id)
-                    if sensor_data:
-                        for i in range(sensor_data.get_data_count()):
-                            # 将时间戳转换为可读格式
-                            timestamp_readable = datetime.fromtimestamp(sensor_data.timestamp[i]).strftime(
-                                "%Y-%m-%d %H:%M:%S.%f")[:-3]
-                            writer.writerow([
-                                timestamp_readable,
-                                sensor_data.data1[i],
-                                sensor_data.data2[i],
-                                sensor_data.data3[i]
-                            ])
+                    with self.lock:
+                        sensor_data = self.get_sensor_data(sensor_id)
+                        blocks = sensor_data.snapshot_blocks() if sensor_data else ()
+                    # 逐块写出（磁盘层和内存层），时间戳整块换算为墙上时间并格式化
+                    for timestamps, values in blocks:
+                        texts = sample_clock.format_timestamps(timestamps).tolist()
+                        writer.writerows([text, d1, d2, d3] for text, (d1, d2, d3) in zip(texts, values.tolist()))
                 else:
-                    # 所有传感器
-                    sensor_ids = self.get_all_sensors()
-                    header = ['Timestamp']
-                    for sid in sensor_ids:
-                        header.extend([f'Sensor{sid}_Data1', f'Sensor{sid}_Data2', f'Sensor{sid}_Data3'])
-                    writer.writerow(header)
-
-                    # 找出最大数据点数
-                    max_data_points = 0
-                    for sid in sensor_ids:
-                        sensor_data = self.get_sensor_data(sid)
-                        if sensor_data:
-                            max_data_points = max(max_data_points, sensor_data.get_data_count())
-
-                    # 写入数据行
-                    for i in range(max_data_points):
-                        row = []
-                        # 使用第一个传感器的时间戳
-                        first_sensor = self.get_sensor_data(sensor_ids[0])
-                        if first_sensor and i < first_sensor.get_data_count():
-                            # 将时间戳转换为可读格式
-                            timestamp_readable = datetime.fromtimestamp(first_sensor.timestamp[i]).strftime(
-                                "%Y-%m-%d %H:%M:%S.%f")[:-3]
-                            row.append(timestamp_readable)
-                        else:
-                            row.append('')
-
-                        # 添加所有传感器的数据
-                        for sid in sensor_ids:
-                            sensor_data = self.get_sensor_data(sid)
-                            if sensor_data and i < sensor_data.get_data_count():
-                                row.extend([
-                                    sensor_data.data1[i],
-                                    sensor_data.data2[i],
-                                    sensor_data.data3[i]
-                                ])
-                            else:
-                                row.extend(['', '', ''])
-                        writer.writerow(row)
+                    # 所有传感器：流式对齐到公共时间轴，逐段写为宽表
+                    with self.lock:
+                        sensor_ids = self.get_all_sensors()
+                    segments = self.iter_aligned_data(sensor_ids, rate=rate, method=method)
+                    write_aligned_segments(csvfile, sensor_ids, segments)
 
             return True, filepath
         except Exception as e:
             print(f"保存CSV文件错误: {e}")
             return False, None
 
-    def get_sensor_statistics(self, sensor_id):
-        """获取传感器数据的统计信息"""
+    def get_sensor_range(self, sensor_id, start=None, end=None):
+        """获取某个传感器捕获时间在 [start, end] 内的样本（见 SensorData.get_range）
+
+        Returns:
+            tuple: (timestamps, values)，传感器不存在时返回None
+        """
+        with self.lock:
+            sensor_data = self.sensors.get(sensor_id)
+            if sensor_data is None:
+                return None
+            return sensor_data.get_range(start, end)
+
+    def get_sensor_last(self, sensor_id, seconds):
+        """获取某个传感器最近 seconds 秒内的样本（见 SensorData.get_last）
+
+        Returns:
+            tuple: (timestamps, values)，传感器不存在时返回None
+        """
+        with self.lock:
+            sensor_data = self.sensors.get(sensor_id)
+            if sensor_data is None:
+                return None
+            return sensor_data.get_last(seconds)
+
+    def get_sensor_statistics(self, sensor_id, window=None, window_seconds=None):
+        """获取传感器数据的统计信息
+
+        不指定窗口时返回自开始（或上次清空）以来全部样本的增量统计，为常数时间查询；
+        指定窗口时只统计最近的样本（window_seconds 可跨越磁盘层）。
+
+        Args:
+            sensor_id: 传感器ID
+            window: 只统计最近 window 个样本
+            window_seconds: 只统计最近 window_seconds 秒内（按捕获时间）的样本
+
+        Returns:
+            dict: {'data1': {'min', 'max', 'mean', 'std'}, 'data2': ..., 'data3': ...}，无数据时返回None
+        """
         sensor_data = self.get_sensor_data(sensor_id)
-        if not sensor_data or sensor_data.get_data_count() == 0:
+        if not sensor_data:
             return None
 
-        # 计算统计数据
-        stats = {
-            'data1': {
-                'min': min(sensor_data.data1),
-                'max': max(sensor_data.data1),
-                'mean': np.mean(sensor_data.data1),
-                'std': np.std(sensor_data.data1)
-            },
-            'data2': {
-                'min': min(sensor_data.data2),
-                'max': max(sensor_data.data2),
-                'mean': np.mean(sensor_data.data2),
-                'std': np.std(sensor_data.data2)
-            },
-            'data3': {
-                'min': min(sensor_data.data3),
-                'max': max(sensor_data.data3),
-                'mean': np.mean(sensor_data.data3),
-                'std': np.std(sensor_data.data3)
+        with self.lock:
+            if window is None and window_seconds is None:
+                return sensor_data.statistics.to_dict()
+
+            if window_seconds is not None:
+                _, values = sensor_data.get_last(window_seconds)
+                if window is not None:
+                    values = values[-window:] if window > 0 else values[:0]
+            else:
+                _, values = sensor_data.get_recent(window)
+            if len(values) == 0:
+                return None
+            return self._compute_statistics(values)
+
+    @staticmethod
+    def _compute_statistics(values):
+        """计算一段三轴数据 (n, 3) 的统计信息"""
+        minimum = values.min(axis=0)
+        maximum = values.max(axis=0)
+        mean = values.mean(axis=0)
+        std = values.std(axis=0)
+        return {
+            name: {
+                'min': float(minimum[axis]),
+                'max': float(maximum[axis]),
+                'mean': float(mean[axis]),
+                'std': float(std[axis])
             }
+            for axis, name in enumerate(RunningStatistics.AXES)
         }
-
-        return stats
\ No newline at end of file
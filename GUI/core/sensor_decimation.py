@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""传感器数据降采样（用于绘图）
+
+曲线只有约一千个像素宽，没有必要把数小时的样本全部交给绘图控件。这里把一段
+三轴数据缩减到目标点数:
+    minmax: 等分为若干桶，每桶输出各轴最小值和最大值所在的样本，保留尖峰和包络
+    lttb:   Largest-Triangle-Three-Buckets，每桶选出与前一个选中点及下一桶均值
+            构成三角形面积最大的样本，保留曲线形状
+"""
+
+import numpy as np
+
+MODE_MINMAX = 'minmax'
+MODE_LTTB = 'lttb'
+MODES = (MODE_MINMAX, MODE_LTTB)
+
+
+def _bucket_bounds(n, buckets):
+    """把 n 个样本等分为 buckets 个桶，返回 buckets + 1 个边界下标"""
+    return np.linspace(0, n, buckets + 1).astype(np.int64)
+
+
+def decimate_minmax(timestamps, values, points):
+    """最小/最大值包络降采样
+
+    等分为若干桶，每个桶输出各轴最小值和最大值所在的样本（去重后按时间排序，
+    每桶 2~6 个），输出是原始样本的子集，极值保留在它们真实的时刻上。
+    桶数取 points // 6，输出不超过 points 个点；points 小于 6 时不足一个桶，
+    改为均匀选取 points 个样本（含首尾）。
+
+    Args:
+        timestamps: shape (n,) 的时间戳
+        values: shape (n, 3) 的数值
+        points: 目标点数（输出的上限）
+
+    Returns:
+        tuple: (timestamps, values)，样本数不超过目标点数时原样返回
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(-1, 3)
+    n = len(timestamps)
+    points = int(points)
+    if points < 1:
+        raise ValueError("目标点数必须大于0")
+    if n <= max(points, 2):
+        return timestamps, values
+    if points < 6:
+        selected = np.unique(np.linspace(0, n - 1, points).round().astype(np.int64))
+        return timestamps[selected], values[selected]
+
+    # 等长的桶（最后一个桶用 ±inf 补齐），整形为 (桶数, 桶长, 3) 后按桶求极值下标
+    size = -(-n // (points // 6))
+    buckets = -(-n // size)
+    padded = np.full((buckets * size, 3), np.inf)
+    padded[:n] = values
+    shaped = padded.reshape(buckets, size, 3)
+    argmin = shaped.argmin(axis=1)
+    padded[n:] = -np.inf
+    argmax = shaped.argmax(axis=1)
+
+    # 每个桶内的样本下标 (桶数, 6)，排序去重后按行展开即为按时间排序的输出
+    offsets = (np.arange(buckets) * size)[:, None]
+    selected = np.sort(np.hstack([argmin, argmax]) + offsets, axis=1)
+    keep = np.ones(selected.shape, dtype=bool)
+    keep[:, 1:] = selected[:, 1:] != selected[:, :-1]
+    selected = selected[keep]
+    return timestamps[selected], values[selected]
+
+
+def decimate_lttb(timestamps, values, points):
+    """Largest-Triangle-Three-Buckets 降采样
+
+    首尾样本固定保留，中间等分为 points - 2 个桶；三轴的三角形面积相加后选点，
+    因此三轴共用同一组样本，输出仍是原始样本的子集。
+
+    Args:
+        timestamps: shape (n,) 的时间戳
+        values: shape (n, 3) 的数值
+        points: 目标点数
+
+    Returns:
+        tuple: (timestamps, values)，样本数不超过目标点数时原样返回
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(-1, 3)
+    n = len(timestamps)
+    points = int(points)
+    if n <= max(points, 3) or points < 3:
+        return timestamps, values
+
+    buckets = points - 2
+    bounds = 1 + _bucket_bounds(n - 2, buckets)  # 中间样本 [1, n-1) 的桶边界
+    starts = bounds[:-1]
+
+    # 每个桶的平均点（下一桶的平均点作为三角形的第三个顶点），向量化一次算出
+    counts = np.diff(bounds).astype(np.float64)
+    mean_times = np.add.reduceat(timestamps[1:n - 1], starts - 1) / counts
+    mean_values = np.add.reduceat(values[1:n - 1], starts - 1, axis=0) / counts[:, None]
+    next_times = np.append(mean_times[1:], timestamps[-1])
+    next_values = np.vstack([mean_values[1:], values[-1:]])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for k in range(buckets):
+        lo, hi = bounds[k], bounds[k + 1]
+        t = timestamps[lo:hi]
+        v = values[lo:hi]
+        # 三角形面积（省略 1/2）：|(t_a - t_c)(v_b - v_a) - (t_a - t_b)(v_c - v_a)|，三轴相加
+        area = np.abs(
+            (timestamps[previous] - next_times[k]) * (v - values[previous])
+            - (timestamps[previous] - t)[:, None] * (next_values[k] - values[previous])
+        ).sum(axis=1)
+        previous = lo + int(np.argmax(area))
+        selected[k + 1] = previous
+
+    return timestamps[selected], values[selected]
+
+
+def decimate(timestamps, values, points, mode=MODE_MINMAX):
+    """按指定方式降采样，见 decimate_minmax / decimate_lttb"""
+    if mode == MODE_MINMAX:
+        return decimate_minmax(timestamps, values, points)
+    if mode == MODE_LTTB:
+        return decimate_lttb(timestamps, values, points)
+    raise ValueError(f"不支持的降采样方式: {mode}")
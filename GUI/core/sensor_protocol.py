@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""传感器串口线路格式
+
+除了文本格式 "sensorN: x, y, z\\n" 之外，支持一种带长度前缀的二进制帧：
+
+    偏移  长度  内容
+    0     2     帧头 0xAA 0x55
+    2     1     长度 L = 2 + 载荷长度（传感器ID + 格式 + 载荷）
+    3     1     传感器ID
+    4     1     格式 0x01: float32 三元组 / 0x02: int16 三元组（乘以 int16_scale）
+    5     12/6  载荷，小端
+    5+P   2     CRC-16/CCITT-FALSE（小端），覆盖长度字节到载荷末尾
+
+二进制帧用 numpy.frombuffer 按结构化 dtype 批量解码。
+"""
+
+import re
+import struct
+import binascii
+import numpy as np
+
+# 线路格式
+WIRE_FORMAT_TEXT = 'text'
+WIRE_FORMAT_BINARY = 'binary'
+WIRE_FORMAT_AUTO = 'auto'
+WIRE_FORMATS = (WIRE_FORMAT_TEXT, WIRE_FORMAT_BINARY, WIRE_FORMAT_AUTO)
+
+# 帧常量
+FRAME_MAGIC = b'\xAA\x55'
+FRAME_FLOAT32 = 0x01
+FRAME_INT16 = 0x02
+INT16_SCALE = 0.01  # int16 载荷的默认缩放系数
+MAX_FRAME_SENSOR_ID = 0xFF  # 帧中的传感器ID字段为1字节
+CRC_INIT = 0xFFFF
+
+# 文本格式识别
+_TEXT_PATTERN = re.compile(rb'sensor\d+:')
+
+# 文本样本模式：空白只匹配行内的空格和制表符，避免在合并后的文本中跨行匹配
+TEXT_SAMPLE_PATTERN = re.compile(
+    r'sensor(\d+):[ \t]*([-+]?\d*\.?\d+),[ \t]*([-+]?\d*\.?\d+),[ \t]*([-+]?\d*\.?\d+)')
+
+
+class _FrameSpec:
+    """一种定长帧的布局"""
+
+    def __init__(self, fmt, value_type, struct_code):
+        self.fmt = fmt
+        self.payload_len = 3 * np.dtype(value_type).itemsize
+        self.length = 2 + self.payload_len
+        self.size = 3 + self.length + 2
+        self.dtype = np.dtype([
+            ('magic', '<u2'),
+            ('length', 'u1'),
+            ('sensor_id', 'u1'),
+            ('fmt', 'u1'),
+            ('values', value_type, (3,)),
+            ('crc', '<u2')
+        ])
+        self.body = struct.Struct('<BBB3' + struct_code)
+
+
+_SPECS = {
+    FRAME_FLOAT32: _FrameSpec(FRAME_FLOAT32, '<f4', 'f'),
+    FRAME_INT16: _FrameSpec(FRAME_INT16, '<i2', 'h'),
+}
+_SPEC_BY_LENGTH = {spec.length: spec for spec in _SPECS.values()}
+_MAGIC_WORD = 0x55AA
+MIN_FRAME_SIZE = min(spec.size for spec in _SPECS.values())
+
+
+def crc16(data):
+    """计算 CRC-16/CCITT-FALSE"""
+    return binascii.crc_hqx(data, CRC_INIT)
+
+
+def encode_frame(sensor_id, values, fmt=FRAME_FLOAT32, int16_scale=INT16_SCALE):
+    """编码一帧二进制传感器数据（供固件对照和模拟器使用）
+
+    Args:
+        sensor_id: 传感器ID（0 ~ MAX_FRAME_SENSOR_ID）
+        values: 三轴数值
+        fmt: FRAME_FLOAT32 或 FRAME_INT16
+        int16_scale: int16 格式的缩放系数
+
+    Returns:
+        bytes: 完整的帧
+    """
+    spec = _SPECS.get(fmt)
+    if spec is None:
+        raise ValueError(f"不支持的帧格式: {fmt}")
+    if not 0 <= sensor_id <= MAX_FRAME_SENSOR_ID:
+        raise ValueError(f"传感器ID必须在 0 ~ {MAX_FRAME_SENSOR_ID}")
+    if fmt == FRAME_INT16:
+        values = [int(round(v / int16_scale)) for v in values]
+    body = spec.body.pack(spec.length, sensor_id, fmt, *values)
+    return FRAME_MAGIC + body + struct.pack('<H', crc16(body))
+
+
+def join_text(lines_or_bytes):
+    """把行列表（bytes 或 str）或字节块合并为一个字符串"""
+    if isinstance(lines_or_bytes, str):
+        return lines_or_bytes
+    if isinstance(lines_or_bytes, (bytes, bytearray, memoryview)):
+        return bytes(lines_or_bytes).decode('utf-8', errors='replace')
+    if lines_or_bytes and all(isinstance(line, (bytes, bytearray)) for line in lines_or_bytes):
+        return b'\n'.join(lines_or_bytes).decode('utf-8', errors='replace')
+    return '\n'.join(
+        line.decode('utf-8', errors='replace') if isinstance(line, (bytes, bytearray)) else str(line)
+        for line in lines_or_bytes
+    )
+
+
+def decode_text_samples(lines_or_bytes, pattern=TEXT_SAMPLE_PATTERN):
+    """批量解码文本格式的样本
+
+    对合并后的整块文本只做一次正则扫描，捕获的数值一次性转换为 NumPy 数组。
+
+    Returns:
+        tuple: (sensor_ids, values)，分别为 shape (n,) 的 int 数组和 shape (n, 3) 的 float64 数组
+    """
+    return _matches_to_arrays(pattern.findall(join_text(lines_or_bytes)))
+
+
+def decode_timed_text_samples(lines, capture_ns, pattern=TEXT_SAMPLE_PATTERN):
+    """批量解码文本格式的样本，并为每个样本带上所在行的捕获时间戳
+
+    通常每行恰好一个样本，此时整批只做一次正则扫描，时间戳与行一一对应；
+    样本数与行数不一致时（存在非数据行或一行多个样本）改为逐行匹配。
+
+    Args:
+        lines: 行列表（bytes 或 str）
+        capture_ns: 与 lines 等长的捕获时间戳（time.monotonic_ns）
+
+    Returns:
+        tuple: (sensor_ids, values, capture_ns)，capture_ns 为 shape (n,) 的 int64 数组
+    """
+    capture_ns = np.asarray(capture_ns, dtype=np.int64)
+    sensor_ids, values = decode_text_samples(lines, pattern)
+    if len(sensor_ids) == len(lines):
+        return sensor_ids, values, capture_ns
+
+    matches, times = [], []
+    for line, line_ns in zip(lines, capture_ns.tolist()):
+        found = pattern.findall(join_text(line))
+        matches.extend(found)
+        times.extend([line_ns] * len(found))
+    sensor_ids, values = _matches_to_arrays(matches)
+    return sensor_ids, values, np.array(times, dtype=np.int64)
+
+
+def _matches_to_arrays(matches):
+    """把正则捕获的 (ID, x, y, z) 字符串元组转换为 NumPy 数组"""
+    if not matches:
+        return np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.float64)
+    fields = np.array(matches)
+    return fields[:, 0].astype(np.int64), fields[:, 1:].astype(np.float64)
+
+
+def detect_wire_format(data):
+    """根据开头的数据判断线路格式
+
+    Returns:
+        str: WIRE_FORMAT_BINARY / WIRE_FORMAT_TEXT，无法判断时返回None
+    """
+    data = bytes(data)
+    pos = data.find(FRAME_MAGIC)
+    while pos >= 0:
+        if pos + 3 > len(data):
+            break
+        spec = _SPEC_BY_LENGTH.get(data[pos + 2])
+        if spec is not None and pos + spec.size <= len(data):
+            frame = data[pos:pos + spec.size]
+            crc = struct.unpack_from('<H', frame, spec.size - 2)[0]
+            if frame[4] == spec.fmt and crc16(frame[2:-2]) == crc:
+                return WIRE_FORMAT_BINARY
+        pos = data.find(FRAME_MAGIC, pos + 1)
+
+    if _TEXT_PATTERN.search(data):
+        return WIRE_FORMAT_TEXT
+    # 多行数据中没有出现任何帧头，也按文本处理
+    if FRAME_MAGIC not in data and data.count(b'\n') >= 2:
+        return WIRE_FORMAT_TEXT
+    return None
+
+
+class BinaryFrameDecoder:
+    """二进制帧流解码器
+
+    feed() 接收任意切分的字节流，返回其中所有完整、校验通过的帧。
+    连续的同格式帧通过 numpy.frombuffer 一次解码；帧头、长度或CRC
+    不匹配时逐字节重新同步，并计入统计。
+    """
+
+    def __init__(self, int16_scale=INT16_SCALE, max_pending=65536):
+        self.int16_scale = int16_scale
+        self.max_pending = max_pending
+        self._pending = b''
+
+        # 统计
+        self.frame_count = 0
+        self.crc_errors = 0
+        self.resync_bytes = 0
+
+    def feed(self, data):
+        """解码数据
+
+        Returns:
+            tuple: (sensor_ids, values)，分别为 shape (n,) 的 int 数组和 shape (n, 3) 的 float64 数组
+        """
+        buf = self._pending + bytes(data) if self._pending else bytes(data)
+        ids_parts, value_parts = [], []
+        pos = 0
+        n = len(buf)
+
+        while n - pos >= 3:
+            if buf[pos] != 0xAA or buf[pos + 1] != 0x55:
+                nxt = buf.find(FRAME_MAGIC, pos + 1)
+                if nxt < 0:
+                    # 末尾的 0xAA 可能是下一个帧头的前半部分
+                    nxt = n - 1 if buf[-1] == 0xAA else n
+                self.resync_bytes += nxt - pos
+                pos = nxt
+                continue
+
+            spec = _SPEC_BY_LENGTH.get(buf[pos + 2])
+            if spec is None:
+                self.resync_bytes += 1
+                pos += 1
+                continue
+
+            count = (n - pos) // spec.size
+            if count == 0:
+                # 帧尚未接收完整
+                break
+
+            accepted = self._decode_run(buf, pos, count, spec, ids_parts, value_parts)
+            if accepted:
+                # 之后的数据可能是其他格式的帧，回到循环开头重新判断
+                pos += accepted * spec.size
+                continue
+
+            # 帧头和长度合法但格式字节不符或CRC错误，跳过一个字节重新同步
+            if buf[pos + 4] == spec.fmt:
+                self.crc_errors += 1
+            self.resync_bytes += 1
+            pos += 1
+
+        self._pending = buf[pos:]
+        if len(self._pending) > self.max_pending:
+            self.resync_bytes += len(self._pending) - self.max_pending
+            self._pending = self._pending[-self.max_pending:]
+
+        if not ids_parts:
+            return np.empty(0, dtype=np.int64), np.empty((0, 3), dtype=np.float64)
+        if len(ids_parts) == 1:
+            return ids_parts[0], value_parts[0]
+        return np.concatenate(ids_parts), np.concatenate(value_parts)
+
+    def reset(self):
+        """清空未完成的数据（统计保留）"""
+        self._pending = b''
+
+    def get_stats(self):
+        """获取解码统计"""
+        return {
+            'frames': self.frame_count,
+            'crc_errors': self.crc_errors,
+            'resync_bytes': self.resync_bytes,
+            'pending_bytes': len(self._pending)
+        }
+
+    def _decode_run(self, buf, pos, count, spec, ids_parts, value_parts):
+        """从 pos 开始按 spec 批量解码连续的帧，返回有效帧的数量"""
+        frames = np.frombuffer(buf, dtype=spec.dtype, count=count, offset=pos)
+        valid = (frames['magic'] == _MAGIC_WORD) & (frames['length'] == spec.length) & (frames['fmt'] == spec.fmt)
+        if not valid.all():
+            count = int(np.argmin(valid))
+            frames = frames[:count]
+        if count == 0:
+            return 0
+
+        # 逐帧计算CRC（binascii 为C实现），截断到第一个CRC错误之前
+        view = memoryview(buf)
+        size = spec.size
+        start = pos + 2
+        crcs = np.fromiter(
+            (crc16(view[start + i * size:start + (i + 1) * size - 4]) for i in range(count)),
+            dtype=np.uint16, count=count
+        )
+        crc_ok = crcs == frames['crc']
+        if not crc_ok.all():
+            count = int(np.argmin(crc_ok))
+            frames = frames[:count]
+        if count == 0:
+            return 0
+
+        values = frames['values'].astype(np.float64)
+        if spec.fmt == FRAME_INT16:
+            values *= self.int16_scale
+        ids_parts.append(frames['sensor_id'].astype(np.int64))
+        value_parts.append(values)
+        self.frame_count += count
+        return count
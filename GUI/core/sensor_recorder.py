@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+from core import sample_clock
+from core.sensor_recording import RecordingWriter, SensorRecording
+
+RECORD_FORMAT_NPY = 'npy'  # 分块二进制录制（见 core.sensor_recording），CSV 为其导出视图
+RECORD_FORMAT_CSV = 'csv'  # 直接写 CSV 文本
+
+
+class SensorRecorder(QObject):
+    """传感器数据的后台流式记录器
+
+    以直连方式接收 SensorDataManager.samples_added_signal，在写入线程中只做入队；
+    后台线程每隔 flush_interval 把累积的样本整块写盘。导出时只需调用 flush()
+    把缓冲的数据写到磁盘，无需重写整个历史。
+
+    npy 格式写入一个分块二进制录制目录（带时间索引，可按时间范围读取和导出CSV）；
+    定期写盘只写出凑满 chunk_size 的数据块，不足一块的样本留在内存中，直到
+    flush() / stop() 时才写出。csv 格式把时间戳向量化换算后追加写入 CSV 文件
+    （长表，每行一个样本: Timestamp, SensorID, Data1, Data2, Data3），文件超过
+    max_file_bytes 或 max_file_seconds 时轮换；轮换只作用于 csv 格式，npy 录制
+    按块存储，单个文件大小已由 chunk_size 限定。
+    """
+
+    # 定义信号
+    file_opened_signal = pyqtSignal(str)  # 开始写入新文件 (文件路径)
+    error_signal = pyqtSignal(str)  # 记录错误
+    export_finished_signal = pyqtSignal(bool, str, str)  # 导出完成 (是否成功, 文件路径, 说明)
+
+    HEADER = "Timestamp,SensorID,Data1,Data2,Data3\n"
+
+    def __init__(self, sensor_data_manager, directory=None, max_file_bytes=64 * 1024 * 1024,
+                 max_file_seconds=3600, flush_interval=0.5, max_queue_size=1024,
+                 record_format=RECORD_FORMAT_NPY, chunk_size=None):
+        """
+        Args:
+            sensor_data_manager: 传感器数据管理器
+            directory: 记录文件目录，默认为 data_dir/recordings
+            max_file_bytes: 单个CSV文件的最大字节数，0 表示不按大小轮换（仅 csv 格式）
+            max_file_seconds: 单个CSV文件的最长时长（秒），0 表示不按时间轮换（仅 csv 格式）
+            flush_interval: 后台线程写盘的间隔（秒）
+            max_queue_size: 待写入批次队列的容量，队列满时丢弃并计数
+            record_format: 记录格式 RECORD_FORMAT_NPY / RECORD_FORMAT_CSV
+            chunk_size: npy 格式每个数据块的样本数
+        """
+        super().__init__()
+
+        if record_format not in (RECORD_FORMAT_NPY, RECORD_FORMAT_CSV):
+            raise ValueError(f"不支持的记录格式: {record_format}")
+
+        self.sensor_data_manager = sensor_data_manager
+        self.directory = directory or os.path.join(sensor_data_manager.data_dir, "recordings")
+        self.max_file_bytes = max_file_bytes
+        self.max_file_seconds = max_file_seconds
+        self.flush_interval = flush_interval
+        self.record_format = record_format
+        self.chunk_size = chunk_size
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._recording = False
+        self._prefix = "sensor_record"
+
+        # 当前文件或录制（只在后台线程中访问）
+        self._writer = None
+        self._file = None
+        self._file_bytes = 0
+        self._file_opened_at = 0.0
+        self._part = 0
+
+        self.files = []  # 本次记录写入过的文件（npy 格式为录制目录）
+        self.recorded_samples = 0
+        self.dropped_samples = 0
+        self._export_thread = None
+
+    def start(self, prefix=None):
+        """开始记录
+
+        Args:
+            prefix: 文件名前缀，默认为 sensor_record
+
+        Returns:
+            bool: 是否成功开始
+        """
+        if self._recording:
+            return True
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            self.error_signal.emit(f"无法创建记录目录: {e}")
+            return False
+
+        self._prefix = f"{prefix or 'sensor_record'}_{datetime.now():%Y%m%d_%H%M%S}"
+        self._part = 0
+        self.files = []
+        self.recorded_samples = 0
+        self.dropped_samples = 0
+
+        if self.record_format == RECORD_FORMAT_NPY:
+            path = os.path.join(self.directory, self._prefix)
+            try:
+                self._writer = RecordingWriter(path, self.chunk_size)
+            except OSError as e:
+                self.error_signal.emit(f"无法创建录制: {e}")
+                return False
+            self.files.append(path)
+            self.file_opened_signal.emit(path)
+
+        self._recording = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.sensor_data_manager.samples_added_signal.connect(self._on_samples, Qt.ConnectionType.DirectConnection)
+        return True
+
+    def stop(self):
+        """停止记录（已入队的数据会被写完）"""
+        if not self._recording:
+            return
+        try:
+            self.sensor_data_manager.samples_added_signal.disconnect(self._on_samples)
+        except TypeError:
+            pass
+        self._recording = False
+        self._queue.put(None)
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def is_recording(self):
+        return self._recording
+
+    def flush(self, timeout=2.0):
+        """把已入队的数据写入磁盘
+
+        Returns:
+            list: 本次记录写入过的文件路径
+        """
+        if self._recording:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait(timeout)
+        return list(self.files)
+
+    def open_recording(self):
+        """刷新缓冲并以只读方式打开本次 npy 录制
+
+        Returns:
+            SensorRecording: 录制读取器，非 npy 格式或尚未开始记录时返回 None
+        """
+        if self.record_format != RECORD_FORMAT_NPY or not self.files:
+            return None
+        self.flush()
+        return SensorRecording(self.files[0])
+
+    def export_csv(self, filepath, sensor_ids=None):
+        """在后台线程中把本次 npy 录制导出为 CSV，完成后发出 export_finished_signal
+
+        单个传感器导出为长表，多个传感器按时间戳对齐到公共时间轴后导出为宽表。
+
+        Args:
+            filepath: 输出文件路径
+            sensor_ids: 要导出的传感器ID，默认全部（不在录制中的ID被忽略）
+
+        Returns:
+            bool: 是否开始导出（非 npy 格式、尚未开始记录或上一次导出未完成时返回 False）
+        """
+        if self.record_format != RECORD_FORMAT_NPY or not self.files:
+            return False
+        if self._export_thread is not None and self._export_thread.is_alive():
+            return False
+        self._export_thread = threading.Thread(target=self._run_export, args=(filepath, sensor_ids), daemon=True)
+        self._export_thread.start()
+        return True
+
+    def is_exporting(self):
+        return self._export_thread is not None and self._export_thread.is_alive()
+
+    def _run_export(self, filepath, sensor_ids):
+        """导出线程函数"""
+        try:
+            recording = self.open_recording()
+            available = recording.get_sensor_ids()
+            if sensor_ids is not None:
+                sensor_ids = [sensor_id for sensor_id in sensor_ids if sensor_id in available] or None
+            if sensor_ids is not None and len(sensor_ids) == 1:
+                count = recording.export_csv(filepath, sensor_ids=sensor_ids)
+                message = f"已导出 {count} 个样本"
+            else:
+                count = recording.export_aligned_csv(filepath, sensor_ids=sensor_ids)
+                message = f"已导出 {count} 行（时间对齐）"
+            self.export_finished_signal.emit(True, filepath, message)
+        except Exception as e:
+            self.export_finished_signal.emit(False, filepath, str(e))
+
+    def get_stats(self):
+        """获取记录统计"""
+        return {
+            'recording': self._recording,
+            'files': list(self.files),
+            'recorded_samples': self.recorded_samples,
+            'dropped_samples': self.dropped_samples,
+            'queue_depth': self._queue.qsize()
+        }
+
+    def _on_samples(self, samples):
+        """写入线程中：样本入队"""
+        try:
+            self._queue.put_nowait(samples)
+        except queue.Full:
+            self.dropped_samples += len(samples[0])
+
+    def _run(self):
+        """后台写入线程"""
+        pending = []
+        last_write = time.monotonic()
+        try:
+            while True:
+                timeout = max(self.flush_interval - (time.monotonic() - last_write), 0.0)
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = False
+
+                if item is None or isinstance(item, threading.Event) or item is False:
+                    self._write_block(pending)
+                    pending = []
+                    last_write = time.monotonic()
+                    # 空闲超时只写出整块；不足一块的样本在显式 flush() 或停止时才写出
+                    if self._writer and item is not False:
+                        self._writer.flush()
+                    if self._file:
+                        self._file.flush()
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    if item is None:
+                        break
+                    continue
+
+                pending.append(item)
+                if time.monotonic() - last_write >= self.flush_interval:
+                    self._write_block(pending)
+                    pending = []
+                    last_write = time.monotonic()
+        except Exception as e:
+            self.error_signal.emit(f"传感器数据记录错误: {e}")
+            self._recording = False
+        finally:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+            self._close_file()
+
+    def _write_block(self, pending):
+        """把累积的若干批样本格式化后一次写入"""
+        if not pending:
+            return
+        sensor_ids = np.concatenate([np.asarray(p[0]) for p in pending])
+        values = np.concatenate([np.asarray(p[1], dtype=np.float64).reshape(-1, 3) for p in pending])
+        timestamps = np.concatenate([np.asarray(p[2], dtype=np.float64) for p in pending])
+        if len(sensor_ids) == 0:
+            return
+
+        if self._writer is not None:
+            self._writer.append(sensor_ids, values, timestamps)
+            self.recorded_samples += len(sensor_ids)
+            return
+
+        texts = sample_clock.format_timestamps(timestamps).tolist()
+        data = ''.join(
+            f"{text},{sensor_id},{x},{y},{z}\n"
+            for text, sensor_id, (x, y, z) in zip(texts, sensor_ids.tolist(), values.tolist())
+        )
+
+        self._rotate_if_needed()
+        self._file.write(data)
+        self._file_bytes += len(data)
+        self.recorded_samples += len(sensor_ids)
+
+    def _rotate_if_needed(self):
+        """按大小或时长轮换文件"""
+        if self._file is not None:
+            too_large = self.max_file_bytes and self._file_bytes >= self.max_file_bytes
+            too_old = self.max_file_seconds and time.monotonic() - self._file_opened_at >= self.max_file_seconds
+            if not (too_large or too_old):
+                return
+            self._close_file()
+
+        self._part += 1
+        path = os.path.join(self.directory, f"{self._prefix}_part{self._part:03d}.csv")
+        # 行缓冲由我们自己按块控制，文件对象使用较大的缓冲区
+        self._file = open(path, 'w', newline='', buffering=1024 * 1024)
+        self._file.write(self.HEADER)
+        self._file_bytes = len(self.HEADER)
+        self._file_opened_at = time.monotonic()
+        self.files.append(path)
+        self.file_opened_signal.emit(path)
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
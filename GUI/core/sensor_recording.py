@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""传感器数据的分块二进制录制格式
+
+一个录制是一个目录:
+    index.json              录制头（格式版本、时间锚点、列名），开始录制时写入一次
+    chunks.jsonl            块索引，每写出一个数据块追加一行: [传感器ID, 文件名, 样本数, 首个时间戳, 末个时间戳]
+    sensor<ID>_<序号>.npy   数据块，shape (4, n) 的 float64：时间戳、x、y、z
+
+块索引只追加不重写，长时间录制时每写一块的开销保持不变。版本 1 的录制把块列表
+保存在 index.json 的 sensors 字段中，仍可读取。
+
+时间戳为采集时的单调时钟秒数，索引中保存录制时的 (单调时间, 墙上时间) 锚点，
+跨会话打开时据此换算墙上时间。按时间范围读取时先用块索引二分定位，再以内存映射
+方式打开相交的块，不需要扫描整个录制。CSV 只是这种存储的一种导出视图。
+"""
+
+import os
+import csv
+import json
+import numpy as np
+
+from core import sample_clock
+from core.sensor_store import SpillStore
+from core.sensor_alignment import iter_aligned, collect_aligned, write_aligned_segments, METHOD_LINEAR
+
+INDEX_FILENAME = "index.json"
+CHUNK_LOG_FILENAME = "chunks.jsonl"
+FORMAT_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+
+
+class RecordingWriter:
+    """录制写入器
+
+    样本先按传感器缓存在内存中，凑满 chunk_size 个后写成一个数据块并在块索引中追加一行。
+    flush() 把不足一块的缓存也写出，保证此前的数据都已落盘、可被读取；它会产生
+    不满的数据块，只应在导出或停止等显式请求时调用。
+    """
+
+    DEFAULT_CHUNK_SIZE = 8192
+
+    def __init__(self, directory, chunk_size=None):
+        """
+        Args:
+            directory: 录制目录（不存在时自动创建）
+            chunk_size: 每个数据块的样本数
+        """
+        self.directory = directory
+        self.chunk_size = int(chunk_size or self.DEFAULT_CHUNK_SIZE)
+        self.anchor = sample_clock.get_anchor()
+        self.stores = {}  # {传感器ID: SpillStore}
+        self._pending = {}  # {传感器ID: [shape (4, k) 的数组]}
+        self._pending_counts = {}
+        self.sample_count = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._write_index()
+        self._chunk_log = open(os.path.join(directory, CHUNK_LOG_FILENAME), 'a', encoding='utf-8')
+
+    def append(self, sensor_ids, values, timestamps):
+        """追加一批样本（与 SensorDataManager.samples_added_signal 的载荷相同）
+
+        Args:
+            sensor_ids: 每个样本的传感器ID
+            values: shape (n, 3) 的数值
+            timestamps: 单调时钟的秒数
+        """
+        sensor_ids = np.asarray(sensor_ids)
+        if len(sensor_ids) == 0:
+            return
+        values = np.asarray(values, dtype=np.float64).reshape(-1, 3)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+
+        # 按传感器分组（稳定排序，保持各传感器内的时间顺序）
+        order = np.argsort(sensor_ids, kind='stable')
+        unique_ids, starts = np.unique(sensor_ids[order], return_index=True)
+        bounds = np.append(starts, len(order))
+
+        chunks_written = False
+        for k, sensor_id in enumerate(unique_ids.tolist()):
+            rows = order[bounds[k]:bounds[k + 1]]
+            block = np.empty((4, len(rows)), dtype=np.float64)
+            block[0] = timestamps[rows]
+            block[1:] = values[rows].T
+            self._pending.setdefault(sensor_id, []).append(block)
+            self._pending_counts[sensor_id] = self._pending_counts.get(sensor_id, 0) + len(rows)
+            if self._pending_counts[sensor_id] >= self.chunk_size:
+                self._write_chunks(sensor_id, full_only=True)
+                chunks_written = True
+
+        self.sample_count += len(sensor_ids)
+        if chunks_written:
+            self._chunk_log.flush()
+
+    def flush(self):
+        """把所有缓存写成数据块并更新索引"""
+        for sensor_id in list(self._pending):
+            self._write_chunks(sensor_id, full_only=False)
+        self._chunk_log.flush()
+
+    def close(self):
+        if self._chunk_log.closed:
+            return
+        self.flush()
+        self._chunk_log.close()
+
+    def _write_chunks(self, sensor_id, full_only):
+        """把某个传感器的缓存写成数据块
+
+        Args:
+            full_only: 为True时只写满 chunk_size 的块，余下的留在缓存中
+        """
+        blocks = self._pending.pop(sensor_id, [])
+        self._pending_counts.pop(sensor_id, None)
+        if not blocks:
+            return
+        columns = np.concatenate(blocks, axis=1) if len(blocks) > 1 else blocks[0]
+
+        store = self.stores.get(sensor_id)
+        if store is None:
+            store = self.stores[sensor_id] = SpillStore(self.directory, sensor_id)
+
+        offset = 0
+        total = columns.shape[1]
+        while total - offset >= self.chunk_size or (not full_only and offset < total):
+            end = min(offset + self.chunk_size, total)
+            store.append(columns[:, offset:end])
+            path, count, first, last = store.chunks[-1]
+            self._chunk_log.write(json.dumps([sensor_id, os.path.basename(path), count, first, last]) + "\n")
+            offset = end
+
+        if offset < total:
+            self._pending[sensor_id] = [columns[:, offset:]]
+            self._pending_counts[sensor_id] = total - offset
+
+    def _write_index(self):
+        """写入录制头（先写临时文件再替换，读取方不会看到半个文件）"""
+        index = {
+            "version": FORMAT_VERSION,
+            "anchor": {"monotonic": self.anchor[0], "wall": self.anchor[1]},
+            "columns": ["timestamp", "data1", "data2", "data3"]
+        }
+        path = os.path.join(self.directory, INDEX_FILENAME)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(temp_path, path)
+
+
+class SensorRecording:
+    """只读打开一个录制目录"""
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: 录制目录
+
+        Raises:
+            FileNotFoundError: 目录中没有索引文件
+            ValueError: 索引版本不受支持
+        """
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILENAME), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("version") not in SUPPORTED_VERSIONS:
+            raise ValueError(f"不支持的录制格式版本: {index.get('version')}")
+
+        anchor = index.get("anchor", {})
+        self.anchor = (anchor.get("monotonic", 0.0), anchor.get("wall", 0.0))
+
+        self.stores = {}
+        for key, chunks in index.get("sensors", {}).items():
+            for name, count, first, last in chunks:
+                self._add_chunk(int(key), name, count, first, last)
+        for sensor_id, name, count, first, last in self._read_chunk_log():
+            self._add_chunk(sensor_id, name, count, first, last)
+
+    def _read_chunk_log(self):
+        """读取块索引，跳过录制仍在写入时可能不完整的最后一行"""
+        path = os.path.join(self.directory, CHUNK_LOG_FILENAME)
+        if not os.path.isfile(path):
+            return []
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+        return entries
+
+    def _add_chunk(self, sensor_id, name, count, first, last):
+        store = self.stores.get(sensor_id)
+        if store is None:
+            store = self.stores[sensor_id] = SpillStore(self.directory, sensor_id)
+        store.chunks.append((os.path.join(self.directory, name), count, first, last))
+        store.sample_count += count
+        store.disk_bytes += 4 * 8 * count
+
+    @staticmethod
+    def is_recording(directory):
+        """目录是否为录制目录"""
+        return os.path.isfile(os.path.join(directory, INDEX_FILENAME))
+
+    def get_sensor_ids(self):
+        return sorted(self.stores)
+
+    def get_sample_count(self, sensor_id=None):
+        """获取样本数，不指定传感器时返回总数"""
+        if sensor_id is None:
+            return sum(store.sample_count for store in self.stores.values())
+        store = self.stores.get(sensor_id)
+        return store.sample_count if store else 0
+
+    def get_time_range(self, sensor_id=None):
+        """获取时间范围（单调时钟秒数）
+
+        Returns:
+            tuple: (起始时间, 结束时间)，没有数据时返回 None
+        """
+        stores = self.stores.values() if sensor_id is None else [self.stores.get(sensor_id)]
+        chunks = [chunk for store in stores if store for chunk in store.chunks]
+        if not chunks:
+            return None
+        return min(chunk[2] for chunk in chunks), max(chunk[3] for chunk in chunks)
+
+    def iter_blocks(self, sensor_id, start=None, end=None):
+        """按时间范围逐块读取某个传感器的数据
+
+        Yields:
+            tuple: (时间戳视图, shape (k, 3) 的数值视图)
+        """
+        store = self.stores.get(sensor_id)
+        if store is None:
+            return
+        for columns in store.iter_range(start, end):
+            yield columns[0], columns[1:].T
+
+    def load(self, sensor_id, start=None, end=None):
+        """读取某个传感器在时间范围 [start, end] 内的数据
+
+        Args:
+            sensor_id: 传感器ID
+            start: 起始时间（单调时钟秒数），None 表示从头开始
+            end: 结束时间（单调时钟秒数），None 表示到末尾
+
+        Returns:
+            tuple: (时间戳数组, shape (n, 3) 的数值数组)
+        """
+        store = self.stores.get(sensor_id)
+        if store is None:
+            return np.empty(0, dtype=np.float64), np.empty((0, 3), dtype=np.float64)
+        columns = store.read_range(start, end)
+        return columns[0], columns[1:].T
+
+    def to_wall_time(self, timestamps):
+        """把录制中的时间戳换算为墙上时间"""
+        return sample_clock.to_wall_time(timestamps, self.anchor)
+
+    def export_csv(self, filepath, sensor_ids=None, start=None, end=None):
+        """把录制导出为 CSV（长表: Timestamp, SensorID, Data1, Data2, Data3）
+
+        Args:
+            filepath: 输出文件路径
+            sensor_ids: 要导出的传感器ID列表，默认全部
+            start: 起始时间（单调时钟秒数）
+            end: 结束时间（单调时钟秒数）
+
+        Returns:
+            int: 导出的样本数
+        """
+        if sensor_ids is None:
+            sensor_ids = self.get_sensor_ids()
+
+        count = 0
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Timestamp', 'SensorID', 'Data1', 'Data2', 'Data3'])
+            for sensor_id in sensor_ids:
+                for timestamps, values in self.iter_blocks(sensor_id, start, end):
+                    texts = sample_clock.format_timestamps(timestamps, self.anchor).tolist()
+                    writer.writerows([text, sensor_id, d1, d2, d3]
+                                     for text, (d1, d2, d3) in zip(texts, values.tolist()))
+                    count += len(texts)
+        return count
+
+    def iter_aligned(self, sensor_ids=None, rate=None, method=METHOD_LINEAR, start=None, end=None, max_gap=None,
+                     block_size=65536):
+        """逐块读取多个传感器并流式对齐到公共时间轴（参数见 core.sensor_alignment.iter_aligned）
+
+        Yields:
+            tuple: (时间轴的一段, {传感器ID: shape (len(该段), 3) 的数组})
+        """
+        if sensor_ids is None:
+            sensor_ids = self.get_sensor_ids()
+        sensor_ids = list(sensor_ids)
+        if end is None:
+            ranges = [self.get_time_range(sensor_id) for sensor_id in sensor_ids]
+            ranges = [r for r in ranges if r is not None]
+            end = max(r[1] for r in ranges) if ranges else None
+        blocks = {sensor_id: self.iter_blocks(sensor_id, start, end) for sensor_id in sensor_ids}
+        return iter_aligned(blocks, end, rate, method, start, max_gap, block_size)
+
+    def load_aligned(self, sensor_ids=None, rate=None, method=METHOD_LINEAR, start=None, end=None, max_gap=None):
+        """读取多个传感器并对齐到公共时间轴（参数见 core.sensor_alignment.align_sensors）
+
+        对齐过程逐块进行（见 iter_aligned），只有输出结果完整驻留内存。
+
+        Returns:
+            tuple: (时间轴, {传感器ID: shape (len(时间轴), 3) 的数组})
+        """
+        if sensor_ids is None:
+            sensor_ids = self.get_sensor_ids()
+        return collect_aligned(sensor_ids, self.iter_aligned(sensor_ids, rate, method, start, end, max_gap))
+
+    def export_aligned_csv(self, filepath, sensor_ids=None, rate=None, method=METHOD_LINEAR, start=None, end=None):
+        """把多个传感器流式对齐后逐段导出为宽表 CSV（Timestamp, Sensor<ID>_Data1..3, ...）
+
+        Returns:
+            int: 导出的行数
+        """
+        if sensor_ids is None:
+            sensor_ids = self.get_sensor_ids()
+        segments = self.iter_aligned(sensor_ids, rate, method, start, end)
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            return write_aligned_segments(f, sensor_ids, segments, self.anchor)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""传感器数据流模拟器
+
+创建一个伪终端（PTY），按设定的传感器数量、采样率和波形持续输出传感器数据，
+SerialManager.connect 可以像打开真实串口一样打开它，从而在没有硬件的情况下
+运行完整的接入链路（负载测试、回归测试）。
+
+用法（在 GUI 目录下运行）:
+    python -m core.sensor_simulator --sensors 4 --rate 200 --format text --profile sine
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+from core.sensor_protocol import (
+    encode_frame, FRAME_FLOAT32, FRAME_INT16, MAX_FRAME_SENSOR_ID, WIRE_FORMAT_TEXT, WIRE_FORMAT_BINARY
+)
+
+try:
+    import pty
+    import tty
+except ImportError:  # Windows 没有伪终端
+    pty = None
+    tty = None
+
+# 波形
+PROFILE_CONSTANT = 'constant'  # 恒定值加噪声
+PROFILE_SINE = 'sine'          # 正弦波加噪声
+PROFILE_STEP = 'step'          # 在 0 和幅值之间周期性阶跃，加噪声
+PROFILE_SEQUENCE = 'sequence'  # x 轴为轮次序号，用于把收到的样本对应回发送时刻
+PROFILES = (PROFILE_CONSTANT, PROFILE_SINE, PROFILE_STEP, PROFILE_SEQUENCE)
+
+
+class SensorSimulator:
+    """基于伪终端的传感器数据流模拟器
+
+    每一轮为每个传感器输出一个样本（文本行或二进制帧），轮次按 rate 均匀排布。
+    写入线程落后于计划时会合并补发，读取端来不及消费、积压超过 max_backlog
+    时丢弃新的轮次并计数，而不是阻塞。
+    """
+
+    def __init__(self, sensor_count=4, rate=100.0, wire_format=WIRE_FORMAT_TEXT, profile=PROFILE_SINE,
+                 noise=0.05, amplitude=5.0, period=1.0, first_sensor_id=1, frame_format=FRAME_FLOAT32,
+                 seed=None, max_backlog=65536):
+        """
+        Args:
+            sensor_count: 传感器数量
+            rate: 每个传感器每秒的样本数
+            wire_format: 'text' 或 'binary'
+            profile: 波形 constant / sine / step / sequence
+            noise: 高斯噪声的标准差
+            amplitude: 波形幅值
+            period: 正弦周期或阶跃周期（秒）
+            first_sensor_id: 第一个传感器的ID；二进制格式下全部ID须在 0 ~ MAX_FRAME_SENSOR_ID 之内
+            frame_format: 二进制帧的载荷格式 FRAME_FLOAT32 / FRAME_INT16
+            seed: 随机数种子
+            max_backlog: 允许积压的最大字节数
+        """
+        if sensor_count < 1:
+            raise ValueError("传感器数量必须大于0")
+        if rate <= 0:
+            raise ValueError("采样率必须为正数")
+        if wire_format not in (WIRE_FORMAT_TEXT, WIRE_FORMAT_BINARY):
+            raise ValueError(f"不支持的线路格式: {wire_format}")
+        if profile not in PROFILES:
+            raise ValueError(f"不支持的波形: {profile}")
+        if first_sensor_id < 0:
+            raise ValueError("传感器ID不能为负数")
+        last_sensor_id = first_sensor_id + sensor_count - 1
+        if wire_format == WIRE_FORMAT_BINARY and last_sensor_id > MAX_FRAME_SENSOR_ID:
+            raise ValueError(f"二进制帧的传感器ID字段为1字节，传感器ID {first_sensor_id} ~ {last_sensor_id} "
+                             f"超出 0 ~ {MAX_FRAME_SENSOR_ID}")
+
+        self.sensor_count = sensor_count
+        self.rate = float(rate)
+        self.wire_format = wire_format
+        self.profile = profile
+        self.noise = noise
+        self.amplitude = amplitude
+        self.period = period
+        self.sensor_ids = list(range(first_sensor_id, first_sensor_id + sensor_count))
+        self.frame_format = frame_format
+        self.max_backlog = max_backlog
+        self.record_send_times = False  # 为True时记录每一轮写出的时刻（time.monotonic_ns）
+
+        self._rng = np.random.default_rng(seed)
+        self._phases = np.linspace(0.0, np.pi, sensor_count, endpoint=False)
+        self._tick = 0
+
+        self._master_fd = None
+        self._slave_fd = None
+        self.port_name = None
+        self._thread = None
+        self._running = False
+        self._backlog = bytearray()
+
+        # 统计
+        self.sent_samples = 0
+        self.sent_bytes = 0
+        self.dropped_samples = 0
+        self.late_ticks = 0
+        self.send_times = []
+
+    def open(self):
+        """只创建伪终端、暂不输出（便于先连接串口再开始计时）
+
+        Returns:
+            str: 伪终端从设备的路径，可作为串口名传给 SerialManager.connect
+        """
+        if self._master_fd is not None:
+            return self.port_name
+        if pty is None:
+            raise RuntimeError("当前平台不支持伪终端，无法运行传感器模拟器")
+
+        self._master_fd, self._slave_fd = pty.openpty()
+        # 从设备设为原始模式，避免回显和行缓冲改变数据
+        tty.setraw(self._slave_fd)
+        os.set_blocking(self._master_fd, False)
+        self.port_name = os.ttyname(self._slave_fd)
+        return self.port_name
+
+    def start(self):
+        """创建伪终端（如尚未创建）并开始输出
+
+        Returns:
+            str: 伪终端从设备的路径，可作为串口名传给 SerialManager.connect
+        """
+        if self._running:
+            return self.port_name
+        self.open()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self.port_name
+
+    def stop_output(self, flush_timeout=1.0):
+        """停止产生新数据但保留伪终端，并在超时前尽量写出积压的数据"""
+        self._running = False
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        if self._master_fd is None:
+            return
+        deadline = time.monotonic() + flush_timeout
+        while self._backlog and time.monotonic() < deadline:
+            self._flush()
+            if self._backlog:
+                time.sleep(0.001)
+
+    def stop(self):
+        """停止输出并关闭伪终端"""
+        self.stop_output(flush_timeout=0.0)
+        if self._master_fd is None:
+            return
+        for fd in (self._master_fd, self._slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._master_fd = self._slave_fd = None
+
+    def is_running(self):
+        return self._running
+
+    def generate(self, ticks):
+        """生成若干轮数据（不写入伪终端，可用作内存数据源）
+
+        Returns:
+            bytes: 线路格式的数据，共 ticks * sensor_count 个样本
+        """
+        values = self._next_values(ticks)
+        return self._encode(values)
+
+    def get_stats(self):
+        """获取输出统计"""
+        return {
+            'sent_samples': self.sent_samples,
+            'sent_bytes': self.sent_bytes,
+            'dropped_samples': self.dropped_samples,
+            'late_ticks': self.late_ticks,
+            'backlog_bytes': len(self._backlog)
+        }
+
+    def _next_values(self, ticks):
+        """按波形生成接下来 ticks 轮的数值，shape (ticks, sensor_count, 3)"""
+        index = np.arange(self._tick, self._tick + ticks)
+        self._tick += ticks
+        t = index / self.rate
+
+        shape = (ticks, self.sensor_count, 3)
+        if self.profile == PROFILE_SINE:
+            base = self.amplitude * np.sin(2 * np.pi * t[:, None] / self.period + self._phases[None, :])
+            values = np.repeat(base[:, :, None], 3, axis=2)
+        elif self.profile == PROFILE_STEP:
+            level = np.where((t // (self.period / 2)) % 2 == 0, 0.0, self.amplitude)
+            values = np.broadcast_to(level[:, None, None], shape).copy()
+        else:
+            values = np.full(shape, self.amplitude)
+
+        if self.noise > 0:
+            values += self._rng.normal(0.0, self.noise, shape)
+        if self.profile == PROFILE_SEQUENCE:
+            values[:, :, 0] = index[:, None]
+        return values
+
+    def _encode(self, values):
+        """把 (ticks, sensor_count, 3) 的数值编码为线路格式"""
+        parts = []
+        if self.wire_format == WIRE_FORMAT_TEXT:
+            for tick_values in values.tolist():
+                for sensor_id, (x, y, z) in zip(self.sensor_ids, tick_values):
+                    parts.append(f"sensor{sensor_id}: {x:.3f}, {y:.3f}, {z:.3f}\n")
+            return ''.join(parts).encode('ascii')
+
+        for tick_values in values.tolist():
+            for sensor_id, tick_value in zip(self.sensor_ids, tick_values):
+                parts.append(encode_frame(sensor_id, tick_value, self.frame_format))
+        return b''.join(parts)
+
+    def _run(self):
+        """写入线程函数：按计划时刻输出每一轮数据"""
+        start = time.monotonic()
+        sent_ticks = 0
+        try:
+            while self._running:
+                # 计算到当前为止应当输出的轮数，落后时合并补发
+                due = int((time.monotonic() - start) * self.rate) + 1 - sent_ticks
+                if due > 1:
+                    self.late_ticks += due - 1
+                if due > 0:
+                    data = self.generate(due)
+                    if len(self._backlog) + len(data) > self.max_backlog:
+                        self.dropped_samples += due * self.sensor_count
+                    else:
+                        self._backlog += data
+                        self.sent_samples += due * self.sensor_count
+                        if self.record_send_times:
+                            self.send_times.extend([time.monotonic_ns()] * due)
+                    sent_ticks += due
+                self._flush()
+
+                next_time = start + sent_ticks / self.rate
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        except OSError as e:
+            print(f"传感器模拟器写入错误: {e}")
+            self._running = False
+
+    def _flush(self):
+        """尽量写出积压的数据（非阻塞）"""
+        if not self._backlog:
+            return
+        try:
+            written = os.write(self._master_fd, self._backlog)
+        except BlockingIOError:
+            return
+        self.sent_bytes += written
+        del self._backlog[:written]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基于伪终端的传感器数据流模拟器")
+    parser.add_argument("--sensors", type=int, default=4, help="传感器数量")
+    parser.add_argument("--rate", type=float, default=100.0, help="每个传感器每秒的样本数")
+    parser.add_argument("--format", choices=(WIRE_FORMAT_TEXT, WIRE_FORMAT_BINARY), default=WIRE_FORMAT_TEXT,
+                        help="线路格式")
+    parser.add_argument("--frame-format", choices=("float32", "int16"), default="float32", help="二进制帧载荷格式")
+    parser.add_argument("--profile", choices=PROFILES, default=PROFILE_SINE, help="波形")
+    parser.add_argument("--noise", type=float, default=0.05, help="噪声标准差")
+    parser.add_argument("--amplitude", type=float, default=5.0, help="幅值")
+    parser.add_argument("--period", type=float, default=1.0, help="正弦/阶跃周期（秒）")
+    parser.add_argument("--duration", type=float, default=0.0, help="运行时长（秒），0 表示直到 Ctrl+C")
+    args = parser.parse_args()
+
+    simulator = SensorSimulator(
+        sensor_count=args.sensors, rate=args.rate, wire_format=args.format, profile=args.profile,
+        noise=args.noise, amplitude=args.amplitude, period=args.period,
+        frame_format=FRAME_INT16 if args.frame_format == "int16" else FRAME_FLOAT32
+    )
+    port = simulator.start()
+    print(f"传感器模拟器已启动: {port}  ({args.sensors} 个传感器, {args.rate:g} Hz, {args.format})")
+    sys.stdout.flush()
+
+    try:
+        start = time.monotonic()
+        while simulator.is_running() and (args.duration <= 0 or time.monotonic() - start < args.duration):
+            time.sleep(1.0)
+            stats = simulator.get_stats()
+            print(f"已发送 {stats['sent_samples']} 个样本, {stats['sent_bytes']} 字节, "
+                  f"丢弃 {stats['dropped_samples']}, 积压 {stats['backlog_bytes']} 字节")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import numpy as np
+
+
+class SpillStore:
+    """单个传感器的磁盘层
+
+    内存环形缓冲区写满时，最旧的样本块被转存为 .npy 文件（shape (4, n)：
+    时间戳、x、y、z），读取时以内存映射方式打开，不会一次性载入内存。
+    """
+
+    def __init__(self, directory, sensor_id):
+        self.directory = directory
+        self.sensor_id = sensor_id
+        self.chunks = []  # [(文件路径, 样本数, 首个时间戳, 末个时间戳)]
+        self.sample_count = 0
+        self.disk_bytes = 0
+        self._next_chunk = 0  # 下一个块文件的序号，清空后也不重置
+
+    def append(self, columns):
+        """把一块样本写入磁盘
+
+        Args:
+            columns: shape (4, n) 的数组（时间戳、x、y、z）
+        """
+        n = columns.shape[1]
+        if n == 0:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # 序号只增不减：清空前复制的块列表（如正在后台导出的快照）不会指向清空后写入的新文件
+        path = os.path.join(self.directory, f"sensor{self.sensor_id}_{self._next_chunk:06d}.npy")
+        self._next_chunk += 1
+        np.save(path, np.ascontiguousarray(columns, dtype=np.float64))
+
+        self.chunks.append((path, n, float(columns[0, 0]), float(columns[0, -1])))
+        self.sample_count += n
+        self.disk_bytes += columns.shape[0] * n * 8
+
+    def iter_chunks(self, chunks=None):
+        """按时间顺序逐块读取（内存映射）
+
+        Args:
+            chunks: 要读取的块列表（例如此前复制的 self.chunks），默认为当前全部块
+
+        Yields:
+            numpy.memmap: shape (4, n) 的只读数组
+        """
+        for path, _, _, _ in (self.chunks if chunks is None else chunks):
+            yield np.load(path, mmap_mode='r')
+
+    def iter_range(self, start=None, end=None):
+        """按时间范围逐块读取，只打开与 [start, end] 相交的块
+
+        块按时间顺序排列，先用每块的首末时间戳二分定位相交的块，
+        再在块内对时间戳列二分截取，不扫描范围外的数据。
+
+        Yields:
+            numpy.ndarray: shape (4, k) 的只读视图（内存映射）
+        """
+        if not self.chunks:
+            return
+        first_times = np.fromiter((chunk[2] for chunk in self.chunks), dtype=np.float64, count=len(self.chunks))
+        last_times = np.fromiter((chunk[3] for chunk in self.chunks), dtype=np.float64, count=len(self.chunks))
+        lo = 0 if start is None else int(np.searchsorted(last_times, start, side='left'))
+        hi = len(self.chunks) if end is None else int(np.searchsorted(first_times, end, side='right'))
+
+        for path, _, _, _ in self.chunks[lo:hi]:
+            columns = np.load(path, mmap_mode='r')
+            i = 0 if start is None else int(np.searchsorted(columns[0], start, side='left'))
+            j = columns.shape[1] if end is None else int(np.searchsorted(columns[0], end, side='right'))
+            if j > i:
+                yield columns[:, i:j]
+
+    def read_range(self, start=None, end=None):
+        """读取时间范围 [start, end] 内的样本，返回 shape (4, n) 的数组"""
+        blocks = list(self.iter_range(start, end))
+        if not blocks:
+            return np.empty((4, 0), dtype=np.float64)
+        return np.concatenate(blocks, axis=1)
+
+    def read_all(self):
+        """读取磁盘层的全部样本，返回 shape (4, n) 的数组"""
+        if not self.chunks:
+            return np.empty((4, 0), dtype=np.float64)
+        return np.concatenate(list(self.iter_chunks()), axis=1)
+
+    def clear(self):
+        """删除磁盘层的所有文件"""
+        for path, _, _, _ in self.chunks:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.chunks = []
+        self.sample_count = 0
+        self.disk_bytes = 0
+
+
+def remove_spill_directory(directory):
+    """删除整个磁盘层目录"""
+    if directory and os.path.isdir(directory):
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+import numpy as np
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+from core.serial_manager import SerialManager, READ_MODE_EVENT
+from core.sensor_protocol import WIRE_FORMAT_AUTO, decode_timed_text_samples
+
+
+class _PortEntry:
+    """单个串口在汇聚器中的状态"""
+
+    def __init__(self, port, slot, manager):
+        self.port = port
+        self.slot = slot
+        self.manager = manager
+        self.connected_at = time.monotonic()
+
+        # 统计
+        self.lines = 0
+        self.samples = 0
+        self.parse_failures = 0
+        self.rejected_ids = 0  # 超出本端口ID范围而被丢弃的样本数
+        self.errors = 0
+        self.last_error = None
+
+        # 用于计算区间速率
+        self._rate_mark = (self.connected_at, 0)
+
+
+class SerialHub(QObject):
+    """多串口汇聚器
+
+    同时打开多个传感器板的串口，每个串口由独立的 SerialManager 及其读取线程负责。
+    各路数据在读取线程中解码后合并为一条带捕获时间戳（time.monotonic_ns）的样本流，
+    传感器ID按端口分配命名空间：全局ID = 端口槽位 * SENSOR_ID_STRIDE + 板上传感器ID。
+
+    槽位单调分配，移除的端口的槽位不会再分给其他端口（包括重新加入的同一端口），
+    因此一个全局ID在整个会话中只对应一路数据。板上传感器ID必须在 [0, SENSOR_ID_STRIDE)
+    之内，超出范围的样本会占用下一个槽位的命名空间，因此被丢弃并计数。
+    """
+
+    # 定义信号
+    samples_signal = pyqtSignal(object)  # 合并后的样本流 (sensor_ids, values, capture_ns)
+    port_connected_signal = pyqtSignal(str, bool)  # 端口连接状态变化 (端口, 是否连接)
+    port_error_signal = pyqtSignal(str, str)  # 端口错误 (端口, 错误信息)
+
+    # 每个端口可用的传感器ID范围
+    SENSOR_ID_STRIDE = 1000
+
+    def __init__(self, read_mode=READ_MODE_EVENT, wire_format=WIRE_FORMAT_AUTO):
+        super().__init__()
+
+        self.read_mode = read_mode
+        self.wire_format = wire_format
+        self.ports = {}  # {端口名: _PortEntry}
+        self.pipeline = None  # 可选的接入流水线
+        self._lock = threading.RLock()
+        self._next_slot = 0
+
+    @classmethod
+    def namespace_sensor_id(cls, slot, sensor_id):
+        """把端口槽位和板上传感器ID合成为全局传感器ID"""
+        return slot * cls.SENSOR_ID_STRIDE + sensor_id
+
+    @classmethod
+    def split_sensor_id(cls, global_id):
+        """把全局传感器ID拆分为 (端口槽位, 板上传感器ID)"""
+        return divmod(int(global_id), cls.SENSOR_ID_STRIDE)
+
+    def attach_pipeline(self, pipeline):
+        """把合并后的样本转发给接入流水线（在读取线程中入队）"""
+        self.pipeline = pipeline
+
+    def add_port(self, port, baud_rate=115200, **kwargs):
+        """打开一个串口并加入汇聚
+
+        Args:
+            port: 串口名
+            baud_rate: 波特率
+            kwargs: 其余参数传给 SerialManager.connect
+
+        Returns:
+            bool: 是否连接成功
+        """
+        with self._lock:
+            # 检查和占用在同一次加锁中完成，避免并发添加同一端口或分配到相同的槽位
+            if port in self.ports:
+                return True
+            manager = SerialManager(read_mode=self.read_mode, wire_format=self.wire_format)
+            manager.set_batching(True)
+            entry = _PortEntry(port, self._next_slot, manager)
+            self._next_slot += 1
+            self.ports[port] = entry
+
+        # 直连：在各自的读取线程中解码并合并
+        manager.received_batch_signal.connect(
+            lambda lines, capture_ns, e=entry: self._on_lines(e, lines, capture_ns),
+            Qt.ConnectionType.DirectConnection)
+        manager.received_frames_signal.connect(
+            lambda frames, e=entry: self._on_frames(e, frames), Qt.ConnectionType.DirectConnection)
+        manager.error_signal.connect(
+            lambda msg, e=entry: self._on_error(e, msg), Qt.ConnectionType.DirectConnection)
+
+        if not manager.connect(port, baud_rate, **kwargs):
+            with self._lock:
+                self.ports.pop(port, None)
+            return False
+
+        with self._lock:
+            entry.connected_at = time.monotonic()
+            entry._rate_mark = (entry.connected_at, 0)
+        self.port_connected_signal.emit(port, True)
+        return True
+
+    def remove_port(self, port):
+        """关闭并移除一个串口"""
+        with self._lock:
+            entry = self.ports.pop(port, None)
+        if entry is None:
+            return False
+        entry.manager.disconnect()
+        self.port_connected_signal.emit(port, False)
+        return True
+
+    def close_all(self):
+        """关闭所有串口"""
+        for port in list(self.ports.keys()):
+            self.remove_port(port)
+
+    def get_ports(self):
+        """获取已打开的端口及其槽位 {端口名: 槽位}"""
+        with self._lock:
+            return {port: entry.slot for port, entry in self.ports.items()}
+
+    def get_port_stats(self):
+        """获取各端口的吞吐量和错误统计
+
+        Returns:
+            dict: {端口名: {'slot', 'lines', 'samples', 'parse_failures', 'rejected_ids', 'errors', 'last_error',
+                   'samples_per_sec', 'avg_samples_per_sec', 'framer', 'frames', 'latency'}}
+            samples_per_sec 为自上次调用以来的速率，avg_samples_per_sec 为连接以来的平均速率
+        """
+        now = time.monotonic()
+        stats = {}
+        with self._lock:
+            entries = list(self.ports.values())
+        for entry in entries:
+            mark_time, mark_samples = entry._rate_mark
+            interval = now - mark_time
+            elapsed = now - entry.connected_at
+            stats[entry.port] = {
+                'slot': entry.slot,
+                'lines': entry.lines,
+                'samples': entry.samples,
+                'parse_failures': entry.parse_failures,
+                'rejected_ids': entry.rejected_ids,
+                'errors': entry.errors,
+                'last_error': entry.last_error,
+                'samples_per_sec': (entry.samples - mark_samples) / interval if interval > 0 else 0.0,
+                'avg_samples_per_sec': entry.samples / elapsed if elapsed > 0 else 0.0,
+                'framer': entry.manager.get_framer_stats(),
+                'frames': entry.manager.get_frame_stats(),
+                'latency': entry.manager.get_latency_stats()
+            }
+            entry._rate_mark = (now, entry.samples)
+        return stats
+
+    def _on_lines(self, entry, lines, capture_ns):
+        """读取线程中：解码一批文本行"""
+        sensor_ids, values, capture_ns = decode_timed_text_samples(lines, capture_ns)
+        entry.lines += len(lines)
+        entry.parse_failures += max(len(lines) - len(sensor_ids), 0)
+        self._publish(entry, sensor_ids, values, capture_ns)
+
+    def _on_frames(self, entry, frames):
+        """读取线程中：转发一批二进制帧"""
+        sensor_ids, values, capture_ns = frames
+        entry.lines += len(sensor_ids)
+        self._publish(entry, sensor_ids, values, capture_ns)
+
+    def _on_error(self, entry, message):
+        entry.errors += 1
+        entry.last_error = message
+        self.port_error_signal.emit(entry.port, message)
+
+    def _publish(self, entry, sensor_ids, values, capture_ns):
+        """为样本加上命名空间后并入合并流（捕获时间戳沿用读取线程打上的值）"""
+        if len(sensor_ids) == 0:
+            return
+        sensor_ids = np.asarray(sensor_ids)
+        valid = (sensor_ids >= 0) & (sensor_ids < self.SENSOR_ID_STRIDE)
+        if not valid.all():
+            rejected = int(len(valid) - np.count_nonzero(valid))
+            if entry.rejected_ids == 0:
+                self._on_error(entry, f"传感器ID超出范围 [0, {self.SENSOR_ID_STRIDE})，已丢弃: "
+                                      f"{sorted(set(sensor_ids[~valid].tolist()))[:5]}")
+            entry.rejected_ids += rejected
+            sensor_ids, values, capture_ns = sensor_ids[valid], values[valid], capture_ns[valid]
+            if len(sensor_ids) == 0:
+                return
+        entry.samples += len(sensor_ids)
+        global_ids = sensor_ids + entry.slot * self.SENSOR_ID_STRIDE
+
+        # 串行化各读取线程的输出，保证合并流中每批按到达顺序排列
+        with self._lock:
+            self.samples_signal.emit((global_ids, values, capture_ns))
+            if self.pipeline is not None:
+                self.pipeline.submit_frames((global_ids, values, capture_ns))
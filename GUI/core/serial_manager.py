@@ -3,9 +3,24 @@
 
 from serial import Serial
 import serial.tools.list_ports
+import os
+import select
 import threading
 import time
+from collections import deque
+import numpy as np
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+from core.line_framer import LineFramer
+from core.sensor_protocol import (
+    BinaryFrameDecoder, detect_wire_format,
+    WIRE_FORMAT_TEXT, WIRE_FORMAT_BINARY, WIRE_FORMAT_AUTO, WIRE_FORMATS
+)
+
+
+# 读取模式
+READ_MODE_POLL = 'poll'    # 轮询 in_waiting，空闲时休眠
+READ_MODE_EVENT = 'event'  # 阻塞等待串口可读（select 或带超时的阻塞读取）
+READ_MODES = (READ_MODE_POLL, READ_MODE_EVENT)
 
 
 class SerialManager(QObject):
@@ -15,22 +30,71 @@ class SerialManager(QObject):
     connected_signal = pyqtSignal(bool)  # 连接状态变化信号
     error_signal = pyqtSignal(str)  # 错误信号
     received_data_signal = pyqtSignal(bytes)  # 接收到数据信号
+    received_batch_signal = pyqtSignal(list, object)  # 合并窗口内接收到的所有行 [bytes, ...] 及其捕获时间戳（纳秒数组）
+    received_frames_signal = pyqtSignal(object)  # 二进制帧解码结果 (sensor_ids, values, capture_ns)
+
+    # 行到达延迟统计保留的样本数
+    LATENCY_HISTORY = 4096
+    # 自动识别线路格式时最多缓存的字节数，超过后按文本处理
+    DETECT_LIMIT = 4096
 
-    def __init__(self):
+    def __init__(self, read_mode=READ_MODE_POLL, wire_format=WIRE_FORMAT_TEXT):
         super().__init__()
         self.serial_port = None
         self.is_reading = False
         self.read_thread = None
         self.port_info = None
 
+        # 读取模式及其参数
+        self.read_mode = read_mode
+        self.poll_interval = 0.01  # 轮询模式的休眠间隔（秒）
+        self.event_wait_timeout = 0.1  # 事件模式单次等待的超时（秒），用于及时响应断开
+
+        # 线路格式：文本行 / 二进制帧 / 自动识别
+        self.wire_format = wire_format
+        self.active_wire_format = None  # 当前连接实际使用的格式，识别完成前为None
+        self._detect_buffer = b''
+
+        # 按行分帧器和二进制帧解码器，每次连接时重建
+        self.max_line_length = 4096
+        self.framer = None
+        self.frame_decoder = None
+
+        # 批量投递：在合并窗口内累积的行通过 received_batch_signal 一次发出
+        self.batch_enabled = False
+        self.batch_window = 0.005  # 合并窗口（秒）
+        self.batch_max_lines = 64  # 达到该行数立即发出
+        self._batch = []
+        self._batch_times = []  # 与 _batch 对应的捕获时间戳（time.monotonic_ns）
+        self._batch_start = 0.0
+
+        # 每行到达延迟（秒）
+        self._latencies = deque(maxlen=self.LATENCY_HISTORY)
+        self._latency_lock = threading.Lock()
+
     def get_available_ports(self):
         """获取可用的串口列表"""
         ports = serial.tools.list_ports.comports()
         return list(ports)
 
-    def connect(self, port, baud_rate=9600, data_bits=8, parity='N', stop_bits=1, timeout=1, flow_control=None):
-        """连接到指定串口"""
+    def connect(self, port, baud_rate=9600, data_bits=8, parity='N', stop_bits=1, timeout=1, flow_control=None,
+                read_mode=None, wire_format=None):
+        """连接到指定串口
+
+        Args:
+            read_mode: 读取模式 'poll' 或 'event'，为None时沿用当前的 self.read_mode
+            wire_format: 线路格式 'text' / 'binary' / 'auto'，为None时沿用当前的 self.wire_format
+        """
         try:
+            if read_mode is not None:
+                if read_mode not in READ_MODES:
+                    raise ValueError(f"不支持的读取模式: {read_mode}")
+                self.read_mode = read_mode
+            if wire_format is not None:
+                if wire_format not in WIRE_FORMATS:
+                    raise ValueError(f"不支持的线路格式: {wire_format}")
+                self.wire_format = wire_format
+
             # 如果已连接，先断开
             if self.is_connected():
                 self.disconnect()
@@ -63,9 +127,18 @@ class SerialManager(QObject):
                 'data_bits': data_bits,
                 'parity': parity,
                 'stop_bits': stop_bits,
-                'flow_control': flow_control
+                'flow_control': flow_control,
+                'read_mode': self.read_mode,
+                'wire_format': self.wire_format
             }
 
+            # 重置分帧器、解码器和延迟统计
+            self.framer = LineFramer(max_line_length=self.max_line_length)
+            self.frame_decoder = BinaryFrameDecoder()
+            self._detect_buffer = b''
+            self.active_wire_format = None if self.wire_format == WIRE_FORMAT_AUTO else self.wire_format
+            self.reset_latency_stats()
+
             # 启动读取线程
             self.is_reading = True
             self.read_thread = threading.Thread(target=self._read_data)
@@ -85,7 +158,8 @@ class SerialManager(QObject):
         if self.serial_port and self.serial_port.is_open:
             # 停止读取线程
             self.is_reading = False
-            if self.read_thread and self.read_thread.is_alive():
+            if (self.read_thread and self.read_thread.is_alive()
+                    and self.read_thread is not threading.current_thread()):
                 self.read_thread.join(timeout=1.0)
 
             # 关闭串口
@@ -131,34 +205,221 @@ class SerialManager(QObject):
             self.error_signal.emit(f"发送数据错误: {str(e)}")
             return False
 
+    def set_batching(self, enabled, window_ms=None, max_lines=None):
+        """配置批量投递
+
+        Args:
+            enabled: 是否通过 received_batch_signal 批量发出行
+            window_ms: 合并窗口（毫秒），为None时保持不变
+            max_lines: 单批最大行数，为None时保持不变
+        """
+        if window_ms is not None:
+            if window_ms < 0:
+                raise ValueError("合并窗口不能为负数")
+            self.batch_window = window_ms / 1000.0
+        if max_lines is not None:
+            if max_lines < 1:
+                raise ValueError("单批最大行数必须大于0")
+            self.batch_max_lines = int(max_lines)
+        self.batch_enabled = bool(enabled)
+
+    def get_latency_stats(self):
+        """获取每行到达延迟统计（毫秒）
+
+        延迟定义为行被发射的时刻减去数据最早可能到达的时刻：
+        轮询模式下取上一次检查 in_waiting 的时刻（上界），
+        事件模式下取等待被唤醒的时刻。
+
+        Returns:
+            dict: {'mode', 'count', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms'}，无数据时数值为0
+        """
+        with self._latency_lock:
+            samples = sorted(self._latencies)
+
+        stats = {'mode': self.read_mode, 'count': len(samples),
+                 'mean_ms': 0.0, 'p50_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        if samples:
+            n = len(samples)
+            stats['mean_ms'] = sum(samples) / n * 1000.0
+            stats['p50_ms'] = samples[int(0.50 * (n - 1))] * 1000.0
+            stats['p99_ms'] = samples[int(0.99 * (n - 1))] * 1000.0
+            stats['max_ms'] = samples[-1] * 1000.0
+        return stats
+
+    def reset_latency_stats(self):
+        """清空到达延迟统计"""
+        with self._latency_lock:
+            self._latencies.clear()
+
+    def _get_fileno(self):
+        """获取串口的文件描述符，不支持 select 的平台返回None"""
+        if os.name != 'posix':
+            return None
+        try:
+            return self.serial_port.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def get_framer_stats(self):
+        """获取分帧统计（行数、超长行数、丢弃字节数）"""
+        if self.framer is None:
+            return None
+        return self.framer.get_stats()
+
+    def get_frame_stats(self):
+        """获取二进制帧解码统计（帧数、CRC错误数、重新同步丢弃的字节数）"""
+        if self.frame_decoder is None:
+            return None
+        return self.frame_decoder.get_stats()
+
+    def _detect_chunk(self, data):
+        """自动识别线路格式：识别完成后返回已缓存的全部数据，否则返回None"""
+        self._detect_buffer += data
+        wire_format = detect_wire_format(self._detect_buffer)
+        if wire_format is None and len(self._detect_buffer) < self.DETECT_LIMIT:
+            return None
+
+        self.active_wire_format = wire_format or WIRE_FORMAT_TEXT
+        data = self._detect_buffer
+        self._detect_buffer = b''
+        return data
+
+    def _handle_frames(self, data, window_start, capture_ns):
+        """将读取到的数据送入二进制帧解码器，并发射解码结果"""
+        sensor_ids, values = self.frame_decoder.feed(data)
+        if len(sensor_ids) == 0:
+            return
+        latency = time.perf_counter() - window_start
+        with self._latency_lock:
+            self._latencies.extend([latency] * len(sensor_ids))
+        capture = np.full(len(sensor_ids), capture_ns, dtype=np.int64)
+        self.received_frames_signal.emit((sensor_ids, values, capture))
+
+    def _handle_chunk(self, data, window_start, capture_ns):
+        """将读取到的数据送入分帧器，并发射其中完整的行
+
+        Args:
+            data: 读取到的字节
+            window_start: 数据最早可能到达的时刻（perf_counter），用于延迟统计
+            capture_ns: 读取到这块数据时的捕获时间戳（time.monotonic_ns），
+                在这块数据中结束的行都以它为捕获时间
+        """
+        if self.active_wire_format is None:
+            data = self._detect_chunk(data)
+            if data is None:
+                return
+        if self.active_wire_format == WIRE_FORMAT_BINARY:
+            self._handle_frames(data, window_start, capture_ns)
+            return
+
+        # 没有逐行订阅者时不再发射逐行信号，避免无用的跨线程投递
+        per_line = self.receivers(self.received_data_signal) > 0
+        batching = self.batch_enabled
+
+        for line in self.framer.feed(data):
+            latency = time.perf_counter() - window_start
+            with self._latency_lock:
+                self._latencies.append(latency)
+
+            line = bytes(line)
+            if per_line:
+                self.received_data_signal.emit(line)
+            if batching:
+                if not self._batch:
+                    self._batch_start = time.perf_counter()
+                self._batch.append(line)
+                self._batch_times.append(capture_ns)
+                if len(self._batch) >= self.batch_max_lines:
+                    self._flush_batch()
+
+        if batching:
+            self._flush_batch_if_due()
+
+    def _flush_batch(self):
+        """发出当前累积的批次"""
+        if self._batch:
+            batch = self._batch
+            capture = np.array(self._batch_times, dtype=np.int64)
+            self._batch = []
+            self._batch_times = []
+            self.received_batch_signal.emit(batch, capture)
+
+    def _flush_batch_if_due(self):
+        """合并窗口到期时发出批次"""
+        if self._batch and time.perf_counter() - self._batch_start >= self.batch_window:
+            self._flush_batch()
+
+    def _wait_timeout(self):
+        """事件模式下的等待超时：有待发批次时不超过合并窗口的剩余时间"""
+        if not self._batch:
+            return self.event_wait_timeout
+        remaining = self.batch_window - (time.perf_counter() - self._batch_start)
+        return min(self.event_wait_timeout, max(remaining, 0.0))
+
     def _read_data(self):
         """读取数据线程函数"""
-        buffer = b""  # 用于累积数据的缓冲区
+        self._batch = []
+        self._batch_times = []
+        try:
+            if self.read_mode == READ_MODE_EVENT:
+                self._read_loop_event()
+            else:
+                self._read_loop_poll()
+            # 发出剩余的批次
+            self._flush_batch()
+        except Exception as e:
+            self.error_signal.emit(f"读取数据错误: {str(e)}")
+            # 如果发生错误，可能需要重新连接
+            self.disconnect()
+
+    def _read_loop_poll(self):
+        """轮询模式：检查 in_waiting，随后休眠 poll_interval"""
+        last_check = time.perf_counter()
 
         while self.is_reading and self.serial_port and self.serial_port.is_open:
-            try:
-                # 检查是否有数据可读
-                if self.serial_port.in_waiting > 0:
-                    # 读取数据并添加到缓冲区
-                    data = self.serial_port.read(self.serial_port.in_waiting)
-                    buffer += data
-
-                    # 尝试从缓冲区中提取完整的行
-                    if b'\n' in buffer:
-                        lines = buffer.split(b'\n')
-                        # 最后一个元素可能是不完整的行，保留在缓冲区
-                        buffer = lines.pop()
-
-                        # 发送每个完整的行
-                        for line in lines:
-                            if line.strip():  # 跳过空行
-                                self.received_data_signal.emit(line + b'\n')
-
-                # 短暂睡眠，减少CPU占用
-                time.sleep(0.01)
-
-            except Exception as e:
-                self.error_signal.emit(f"读取数据错误: {str(e)}")
-                # 如果发生错误，可能需要重新连接
-                self.disconnect()
-                break
\ No newline at end of file
+            check_time = time.perf_counter()
+            # 检查是否有数据可读
+            waiting = self.serial_port.in_waiting
+            if waiting > 0:
+                # 数据到达于上一次检查之后
+                data = self.serial_port.read(waiting)
+                self._handle_chunk(data, last_check, time.monotonic_ns())
+            else:
+                self._flush_batch_if_due()
+            last_check = check_time
+
+            # 短暂睡眠，减少CPU占用
+            time.sleep(self.poll_interval)
+
+    def _read_loop_event(self):
+        """事件模式：阻塞等待串口可读，数据到达即被唤醒"""
+        fd = self._get_fileno()
+        if fd is None:
+            # 无法 select 时退化为带超时的阻塞读取，read(1) 在首字节到达时立即返回
+            timeout = self.event_wait_timeout
+            if self.batch_enabled:
+                timeout = min(timeout, self.batch_window)
+            self.serial_port.timeout = timeout
+
+        while self.is_reading and self.serial_port and self.serial_port.is_open:
+            if fd is not None:
+                ready, _, _ = select.select([fd], [], [], self._wait_timeout())
+                if not ready:
+                    self._flush_batch_if_due()
+                    continue
+                wake_time = time.perf_counter()
+                capture_ns = time.monotonic_ns()
+                data = self.serial_port.read(self.serial_port.in_waiting or 1)
+            else:
+                data = self.serial_port.read(1)
+                if not data:
+                    self._flush_batch_if_due()
+                    continue
+                wake_time = time.perf_counter()
+                capture_ns = time.monotonic_ns()
+                waiting = self.serial_port.in_waiting
+                if waiting > 0:
+                    data += self.serial_port.read(waiting)
+
+            if data:
+                self._handle_chunk(data, wake_time, capture_ns)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""录制会话回放
+
+把 core.sensor_recording 录制的传感器数据按原始时间间隔重新送入接入链路
+（SensorIngestPipeline，未启用时直接调用 SensorDataManager.add_samples），
+捕获时间戳换算为回放时的单调时钟，下游组件看到的与实时数据没有区别。
+可用于在没有硬件的情况下调整抓取阈值等参数。
+"""
+
+import time
+import threading
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.sensor_recording import SensorRecording
+
+SPEED_MAX = 0  # 以下游能承受的最快速度回放
+
+
+class SessionReplay(QObject):
+    """录制会话回放器
+
+    后台线程按 batch_interval 的节拍投递样本，每拍投递回放位置已经越过的全部
+    样本，与串口按时间窗口批量读取的节奏一致。speed 为 1 时按原速回放，为 N 时
+    按 N 倍速回放（捕获时间戳同样压缩），为 SPEED_MAX 时不等待，只在接入队列
+    接近满时暂停，保证不丢数据；此时每批的捕获时间戳取实际投递时刻，批内保持
+    原始的相对间隔并压缩到上一批之后经过的时间内。
+
+    捕获时间戳不会早于所回放传感器已存储的最新样本，也不会晚于投递时刻，
+    与实时数据交替或多次回放时存储中的时间戳仍然单调。
+    """
+
+    # 定义信号
+    stats_signal = pyqtSignal(dict)  # 定期发出回放统计，见 get_stats
+    finished_signal = pyqtSignal()  # 回放结束（非循环模式播放到末尾）
+
+    def __init__(self, sensor_data_manager, recording, pipeline=None, speed=1.0, loop=False,
+                 sensor_ids=None, batch_interval=0.005, read_seconds=0.5, stats_interval=0.5):
+        """
+        Args:
+            sensor_data_manager: 传感器数据管理器
+            recording: SensorRecording 或录制目录
+            pipeline: 接入流水线，提供且正在运行时样本经由其队列送入
+            speed: 回放倍速，SPEED_MAX 表示尽可能快
+            loop: 播放到末尾后是否从头循环
+            sensor_ids: 只回放这些传感器，默认全部
+            batch_interval: 投递节拍（秒）
+            read_seconds: 每次从录制中读取的时长（录制时间，秒）
+            stats_interval: 统计信号的发射间隔（秒）
+        """
+        super().__init__()
+
+        if speed < 0:
+            raise ValueError("回放倍速不能为负数")
+        if not isinstance(recording, SensorRecording):
+            recording = SensorRecording(recording)
+
+        self.sensor_data_manager = sensor_data_manager
+        self.recording = recording
+        self.pipeline = pipeline
+        self.speed = float(speed)
+        self.loop = loop
+        self.sensor_ids = sensor_ids if sensor_ids is not None else recording.get_sensor_ids()
+        self.batch_interval = batch_interval
+        self.read_seconds = read_seconds
+        self.stats_interval = stats_interval
+
+        time_range = recording.get_time_range()
+        self.start_time, self.end_time = time_range if time_range else (0.0, 0.0)
+
+        self._thread = None
+        self._running = False
+        self._seek_to = None  # 待处理的跳转位置（相对录制开始的秒数）
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    @property
+    def duration(self):
+        """录制时长（秒）"""
+        return self.end_time - self.start_time
+
+    def _reset_stats(self):
+        self.position = 0.0  # 当前回放位置（相对录制开始的秒数）
+        self.delivered_samples = 0
+        self.delivered_batches = 0
+        self.loops = 0
+        self.lag = 0.0  # 最近一批的投递延迟（秒）：实际投递时刻晚于计划时刻的量
+        self.max_lag = 0.0
+        self.throttled_time = 0.0  # 最快速度回放时等待下游队列的累计时间
+        self._dropped_base = self._pipeline_dropped()
+        self._wall_start = time.monotonic()
+        self._replayed_seconds = 0.0
+
+    def start(self, position=0.0):
+        """开始回放
+
+        Args:
+            position: 起始位置（相对录制开始的秒数）
+        """
+        if self._running:
+            return
+        self._reset_stats()
+        self._seek_to = min(max(position, 0.0), self.duration)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止回放"""
+        self._running = False
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def is_running(self):
+        return self._running
+
+    def seek(self, position):
+        """跳转到指定位置（相对录制开始的秒数），回放中调用时从下一拍生效"""
+        with self._lock:
+            self._seek_to = min(max(position, 0.0), self.duration)
+
+    def get_stats(self):
+        """获取回放统计
+
+        Returns:
+            dict: position / duration 为回放位置与时长（秒），achieved_speed 为实际达到的倍速，
+            lag_ms / max_lag_ms 为投递延迟，dropped_samples 为下游队列丢弃的样本数
+        """
+        wall = time.monotonic() - self._wall_start
+        return {
+            'position': self.position,
+            'duration': self.duration,
+            'speed': self.speed,
+            'achieved_speed': self._replayed_seconds / wall if wall > 0 else 0.0,
+            'delivered_samples': self.delivered_samples,
+            'delivered_batches': self.delivered_batches,
+            'loops': self.loops,
+            'lag_ms': self.lag * 1000,
+            'max_lag_ms': self.max_lag * 1000,
+            'throttled_ms': self.throttled_time * 1000,
+            'dropped_samples': self._pipeline_dropped() - self._dropped_base
+        }
+
+    def _pipeline_active(self):
+        return self.pipeline is not None and self.pipeline.is_running()
+
+    def _pipeline_dropped(self):
+        if self.pipeline is None:
+            return 0
+        return self.pipeline.get_stats()['dropped_lines']
+
+    def _read_block(self, start, end, inclusive_end):
+        """读取录制时间 [start, end) 内所选传感器的样本，按时间合并排序
+
+        Returns:
+            tuple: (sensor_ids, values, timestamps)
+        """
+        ids, values, timestamps = [], [], []
+        for sensor_id in self.sensor_ids:
+            sensor_timestamps, sensor_values = self.recording.load(sensor_id, start, end)
+            if not inclusive_end:
+                keep = sensor_timestamps < end
+                sensor_timestamps, sensor_values = sensor_timestamps[keep], sensor_values[keep]
+            ids.append(np.full(len(sensor_timestamps), sensor_id, dtype=np.int64))
+            values.append(sensor_values)
+            timestamps.append(sensor_timestamps)
+
+        timestamps = np.concatenate(timestamps) if timestamps else np.empty(0)
+        order = np.argsort(timestamps, kind='stable')
+        return (np.concatenate(ids)[order] if ids else np.empty(0, dtype=np.int64),
+                np.concatenate(values)[order] if values else np.empty((0, 3)),
+                timestamps[order])
+
+    def _newest_stored_ns(self):
+        """所回放传感器已存储的最新样本时间戳（纳秒），没有数据时为 0"""
+        newest = 0
+        for sensor_id in self.sensor_ids:
+            sensor_data = self.sensor_data_manager.get_sensor_data(sensor_id)
+            latest = sensor_data.get_latest_timestamp() if sensor_data else None
+            if latest is not None:
+                newest = max(newest, int(np.ceil(latest * 1e9)))
+        return newest
+
+    def _deliver(self, sensor_ids, values, capture_ns):
+        """经由与实时数据相同的接入路径投递一批样本"""
+        if self._pipeline_active():
+            if self.speed == SPEED_MAX:
+                # 最快速度回放：下游队列接近满时等待，而不是让队列丢弃
+                stats = self.pipeline.get_stats()
+                while self._running and stats['queue_depth'] >= stats['queue_capacity'] * 0.9:
+                    time.sleep(0.001)
+                    self.throttled_time += 0.001
+                    stats = self.pipeline.get_stats()
+            self.pipeline.submit_frames((sensor_ids, values, capture_ns))
+        else:
+            self.sensor_data_manager.add_samples(sensor_ids, values, capture_ns)
+        self.delivered_samples += len(sensor_ids)
+        self.delivered_batches += 1
+
+    def _run(self):
+        """回放线程函数"""
+        last_stats = 0.0
+        block = None  # 当前读入的样本块 (sensor_ids, values, timestamps)
+        block_end = self.start_time
+        index = 0
+        last_capture_ns = 0
+
+        try:
+            while self._running:
+                with self._lock:
+                    seek_to, self._seek_to = self._seek_to, None
+                if seek_to is not None:
+                    # 重新确定时间原点：录制时间 origin_time 对应单调时钟 origin_ns，
+                    # 原点不早于已投递和已存储的最新时间戳，保证存储中的时间戳单调
+                    origin_time = self.start_time + seek_to
+                    origin_ns = max(time.monotonic_ns(), last_capture_ns + 1, self._newest_stored_ns() + 1)
+                    origin_wall = origin_ns / 1e9
+                    last_capture_ns = origin_ns
+                    last_scheduled = origin_time
+                    block, block_end, index = None, origin_time, 0
+
+                # 需要时读入下一段录制
+                if block is None or index >= len(block[0]):
+                    if block_end >= self.end_time and block is not None:
+                        if not self.loop:
+                            break
+                        self.loops += 1
+                        with self._lock:
+                            self._seek_to = 0.0
+                        continue
+                    block_start = block_end
+                    block_end = min(block_start + self.read_seconds, self.end_time)
+                    block = self._read_block(block_start, block_end, inclusive_end=block_end >= self.end_time)
+                    index = 0
+                    if len(block[0]) == 0:
+                        continue
+
+                sensor_ids, values, timestamps = block
+                if self.speed == SPEED_MAX:
+                    # 不等待：每拍投递一个节拍所对应的录制时长（至少一个样本）
+                    target = timestamps[index] + self.batch_interval
+                else:
+                    target = origin_time + (time.monotonic() - origin_wall) * self.speed
+
+                stop = int(np.searchsorted(timestamps, target, side='right'))
+                if stop > index:
+                    scheduled = float(timestamps[stop - 1])
+                    if self.speed == SPEED_MAX:
+                        # 以实际投递时刻为本批最后一个样本的时间戳，批内按原始相对间隔
+                        # 压缩到上一批之后经过的时间内
+                        now_ns = max(time.monotonic_ns(), last_capture_ns)
+                        span = scheduled - last_scheduled
+                        offsets = timestamps[index:stop] - last_scheduled
+                        fraction = offsets / span if span > 0 else np.ones(stop - index)
+                        capture_ns = last_capture_ns + (fraction * (now_ns - last_capture_ns)).astype(np.int64)
+                    else:
+                        # 捕获时间戳换算为回放时的单调时钟（倍速回放时按倍速压缩）
+                        capture_ns = origin_ns + ((timestamps[index:stop] - origin_time) / self.speed * 1e9).astype(np.int64)
+                    self._deliver(sensor_ids[index:stop], values[index:stop], capture_ns)
+                    index = stop
+                    last_capture_ns = int(capture_ns[-1])
+
+                    self.position = scheduled - self.start_time
+                    self._replayed_seconds += max(scheduled - last_scheduled, 0.0)
+                    last_scheduled = scheduled
+                    if self.speed != SPEED_MAX:
+                        self.lag = max(time.monotonic() - (origin_wall + (scheduled - origin_time) / self.speed), 0.0)
+                        self.max_lag = max(self.max_lag, self.lag)
+
+                now = time.monotonic()
+                if now - last_stats >= self.stats_interval:
+                    last_stats = now
+                    self.stats_signal.emit(self.get_stats())
+
+                if self.speed != SPEED_MAX:
+                    time.sleep(self.batch_interval)
+        except Exception as e:
+            print(f"回放错误: {e}")
+        finally:
+            finished = self._running
+            self._running = False
+            self.stats_signal.emit(self.get_stats())
+            if finished:
+                self.finished_signal.emit()
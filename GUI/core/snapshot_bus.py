@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+
+class SnapshotSubscription(QObject):
+    """快照总线上的一个订阅
+
+    rate 为 None 时每批样本都投递，快照中带有这批的全部样本（控制回路使用）；
+    否则以不超过 rate 的频率投递合并后的快照，只包含上次投递以来有更新的传感器。
+
+    快照字典:
+        'latest':     {传感器ID: [x, y, z]}，有更新的传感器的最新值
+        'timestamps': {传感器ID: 最新样本的捕获时间}
+        'samples':    (sensor_ids, values, timestamps)，仅逐批投递的订阅提供
+        'windows':    {传感器ID: (timestamps, values)}，订阅了窗口时提供（拷贝）
+    """
+
+    snapshot_signal = pyqtSignal(dict)
+
+    def __init__(self, rate=None, sensor_ids=None, window=None, window_seconds=None):
+        super().__init__()
+        self.rate = rate if rate and rate > 0 else None
+        self.period = 1.0 / self.rate if self.rate else 0.0
+        self.sensor_ids = set(sensor_ids) if sensor_ids is not None else None
+        self.window = window  # 附带每个传感器最近 window 个样本
+        self.window_seconds = window_seconds  # 附带每个传感器最近 window_seconds 秒的样本
+        self.delivered = 0  # 已投递的快照数
+
+        self._dirty = set()  # 上次投递以来有更新的传感器
+        self._last_delivery = 0.0
+
+    def set_sensor_ids(self, sensor_ids):
+        """修改关注的传感器，None 表示全部"""
+        self.sensor_ids = set(sensor_ids) if sensor_ids is not None else None
+
+
+class SensorSnapshotBus(QObject):
+    """传感器数据的限频发布/订阅总线
+
+    以直连方式接收 SensorDataManager.samples_added_signal（在写入线程中执行），
+    每批样本只标记各订阅中有更新的传感器；GUI 线程中的定时器按各订阅声明的频率
+    读取最新值（以及窗口）并投递一次合并快照。界面按 20 Hz 刷新时，开销与采样率
+    无关，而不是采样率 × 订阅者数量。
+
+    必须在 GUI 线程中创建。
+    """
+
+    MIN_TIMER_INTERVAL_MS = 5
+
+    def __init__(self, sensor_data_manager, parent=None):
+        super().__init__(parent)
+
+        self.sensor_data_manager = sensor_data_manager
+        self._subscriptions = []
+        self._lock = threading.Lock()
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._deliver_due)
+
+        sensor_data_manager.samples_added_signal.connect(self._on_samples, Qt.ConnectionType.DirectConnection)
+
+    def subscribe(self, slot, rate=None, sensor_ids=None, window=None, window_seconds=None):
+        """订阅快照
+
+        Args:
+            slot: 接收快照字典的槽函数（在订阅者所在线程中调用）
+            rate: 最高投递频率（Hz），None 表示每批样本都投递
+            sensor_ids: 关注的传感器ID，None 表示全部
+            window: 快照中附带每个传感器最近 window 个样本
+            window_seconds: 快照中附带每个传感器最近 window_seconds 秒的样本
+
+        Returns:
+            SnapshotSubscription: 订阅对象，可用于修改关注的传感器或取消订阅
+        """
+        subscription = SnapshotSubscription(rate, sensor_ids, window, window_seconds)
+        subscription.snapshot_signal.connect(slot)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        self._update_timer()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """取消订阅"""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        self._update_timer()
+
+    def get_stats(self):
+        """获取各订阅的投递统计"""
+        with self._lock:
+            return [
+                {'rate': sub.rate, 'sensor_ids': sub.sensor_ids, 'delivered': sub.delivered}
+                for sub in self._subscriptions
+            ]
+
+    def _update_timer(self):
+        """按最高的订阅频率设置定时器间隔"""
+        with self._lock:
+            periods = [sub.period for sub in self._subscriptions if sub.rate]
+        if not periods:
+            self._timer.stop()
+            return
+        interval = max(int(min(periods) * 1000), self.MIN_TIMER_INTERVAL_MS)
+        self._timer.start(interval)
+
+    def _on_samples(self, samples):
+        """写入线程中：标记有更新的传感器，逐批订阅直接投递"""
+        sensor_ids, values, timestamps = (np.asarray(item) for item in samples)
+        updated = set(np.unique(sensor_ids).tolist())
+
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            for sub in subscriptions:
+                if sub.rate:
+                    sub._dirty |= updated if sub.sensor_ids is None else updated & sub.sensor_ids
+
+        for sub in subscriptions:
+            if sub.rate:
+                continue
+            if sub.sensor_ids is None:
+                batch = (sensor_ids, values, timestamps)
+                sub_updated = updated
+            else:
+                mask = np.isin(sensor_ids, list(sub.sensor_ids))
+                if not mask.any():
+                    continue
+                batch = (sensor_ids[mask], values[mask], timestamps[mask])
+                sub_updated = updated & sub.sensor_ids
+            snapshot = self._build_snapshot(sub, sub_updated)
+            snapshot['samples'] = batch
+            sub.delivered += 1
+            sub.snapshot_signal.emit(snapshot)
+
+    def _deliver_due(self):
+        """GUI 线程中：向到期且有更新的订阅投递合并快照"""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for sub in self._subscriptions:
+                if not sub.rate or not sub._dirty:
+                    continue
+                # 留出半个最小定时器间隔的余量，避免定时器抖动导致隔一拍才投递
+                if now - sub._last_delivery < sub.period - self.MIN_TIMER_INTERVAL_MS / 2000:
+                    continue
+                due.append((sub, sub._dirty))
+                sub._dirty = set()
+                sub._last_delivery = now
+
+        for sub, updated in due:
+            sub.delivered += 1
+            sub.snapshot_signal.emit(self._build_snapshot(sub, updated))
+
+    def _build_snapshot(self, sub, updated):
+        """读取有更新的传感器的最新值和窗口"""
+        manager = self.sensor_data_manager
+        snapshot = {'latest': {}, 'timestamps': {}}
+        if sub.window is not None or sub.window_seconds is not None:
+            snapshot['windows'] = {}
+
+        with manager.lock:
+            for sensor_id in sorted(updated):
+                sensor_data = manager.sensors.get(sensor_id)
+                if sensor_data is None:
+                    continue
+                snapshot['latest'][sensor_id] = list(sensor_data.get_latest_values())
+                snapshot['timestamps'][sensor_id] = sensor_data.get_latest_timestamp()
+                if sub.window_seconds is not None:
+                    timestamps, values = sensor_data.get_last(sub.window_seconds)
+                    if sub.window is not None:
+                        timestamps, values = timestamps[-sub.window:], values[-sub.window:]
+                    snapshot['windows'][sensor_id] = (timestamps.copy(), values.copy())
+                elif sub.window is not None:
+                    timestamps, values = sensor_data.get_recent(sub.window)
+                    snapshot['windows'][sensor_id] = (timestamps.copy(), values.copy())
+        return snapshot
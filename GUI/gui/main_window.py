@@ -12,9 +12,13 @@ from PyQt6.QtWidgets import (
 )
 
 # 导入自定义模块
-from core.serial_manager import SerialManager
+from core.serial_manager import SerialManager, READ_MODE_POLL
+from core.sensor_protocol import WIRE_FORMAT_TEXT
+from core.ingest_pipeline import SensorIngestPipeline
 from core.sensor_data_manager import SensorDataManager
-from core.app_settings import Settings
+from core.sensor_recorder import SensorRecorder
+from core.snapshot_bus import SensorSnapshotBus
+from core.app_settings import Settings, SENSOR_DATA_DEFAULTS
 from core.action_manager import ActionManager
 
 from gui.ui_functions import UIFunctions
@@ -129,16 +133,53 @@ class MainWindow(QMainWindow):
     def initialize_data_manager(self):
         """初始化数据管理相关组件"""
         # 初始化传感器数据管理器
-        self.sensor_data_manager = SensorDataManager()
+        # 设置文件中缺少的项使用默认设置
+        sensor_data_settings = {**SENSOR_DATA_DEFAULTS, **(self.settings.get_setting("sensor_data") or {})}
+        self.sensor_data_manager = SensorDataManager(
+            buffer_capacity=sensor_data_settings["buffer_capacity"],
+            spill_to_disk=sensor_data_settings["spill_to_disk"],
+            spill_block=sensor_data_settings["spill_block"]
+        )
+
+        # 初始化传感器数据记录器（后台线程流式写盘）
+        self.sensor_recorder = SensorRecorder(
+            self.sensor_data_manager,
+            max_file_bytes=int(sensor_data_settings["record_max_file_mb"] * 1024 * 1024),
+            max_file_seconds=int(sensor_data_settings["record_max_file_minutes"] * 60),
+            record_format=sensor_data_settings["record_format"]
+        )
+        if sensor_data_settings["auto_record"]:
+            self.sensor_recorder.start()
+
+        # 初始化传感器快照总线（界面按 ui_update_rate 接收合并快照，控制逻辑逐批接收）
+        self.snapshot_bus = SensorSnapshotBus(self.sensor_data_manager, self)
+        self.ui_update_rate = sensor_data_settings["ui_update_rate"]
 
     def initialize_hardware_components(self):
         """初始化硬件控制相关组件"""
         # 初始化串口管理器
-        self.serial_manager = SerialManager()
+        serial_settings = self.settings.get_setting("serial") or {}
+        self.serial_manager = SerialManager(
+            read_mode=serial_settings.get("read_mode", READ_MODE_POLL),
+            wire_format=serial_settings.get("wire_format", WIRE_FORMAT_TEXT)
+        )
+        self.serial_manager.set_batching(
+            serial_settings.get("batch_delivery", False),
+            window_ms=serial_settings.get("batch_window_ms", 5),
+            max_lines=serial_settings.get("batch_max_lines", 64)
+        )
+
+        # 在工作线程中解析传感器数据，GUI线程只接收快照
+        self.ingest_pipeline = None
+        if serial_settings.get("parse_in_worker", True):
+            self.ingest_pipeline = SensorIngestPipeline(self.sensor_data_manager)
+            self.ingest_pipeline.attach(self.serial_manager)
+            self.ingest_pipeline.start()
 
         # 创建机械臂控制器 (使用ArmController支持瑞尔曼机械臂和机械手)
         from core.arm_controller import ArmController
-        self.arm_controller = ArmController()
+        hand_settings = self.settings.get_setting("hand") or {}
+        self.arm_controller = ArmController(hand_poll_rate=hand_settings.get("poll_rate", 0))
 
         # 初始化动作管理器
         self.action_manager = ActionManager()
@@ -303,6 +344,22 @@ class MainWindow(QMainWindow):
         if self.serial_manager.is_connected():
             self.serial_manager.disconnect()
 
+        # 停止录制回放
+        if hasattr(self, 'sensor_data_page'):
+            self.sensor_data_page.stop_replay()
+
+        # 停止传感器数据解析线程
+        if getattr(self, 'ingest_pipeline', None):
+            self.ingest_pipeline.stop()
+
+        # 停止传感器数据记录（写完已缓冲的数据）
+        if getattr(self, 'sensor_recorder', None):
+            self.sensor_recorder.stop()
+
+        # 删除本会话转存到磁盘的传感器数据
+        if hasattr(self, 'sensor_data_manager'):
+            self.sensor_data_manager.close()
+
         # 在保存全局设置前，让页面保存自己的参数（例如自适应抓取页面）
         try:
             if hasattr(self, 'adaptive_grasp_page') and hasattr(self.adaptive_grasp_page, 'save_parameters'):
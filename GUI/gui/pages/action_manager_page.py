@@ -22,6 +22,7 @@ import math
 
 from core.action_manager import Action, ActionSequence
 from core.arm_controller import ArmController
+from core.app_settings import SENSOR_DATA_DEFAULTS
 
 
 class ActionDialog(QDialog):
@@ -1418,9 +1419,14 @@ class ActionManagerPage(QWidget):
                 if i == 3 or i == 4:
                     spinbox.valueChanged.connect(self.update_finger_display)
 
-        # 传感器数据更新信号
+        # 传感器数据更新信号：有快照总线时按界面刷新率接收合并快照
         if self.sensor_data_manager:
-            self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
+            snapshot_bus = getattr(self.parent, 'snapshot_bus', None)
+            if snapshot_bus is not None:
+                self.snapshot_subscription = snapshot_bus.subscribe(
+                    self.on_sensor_snapshot, rate=getattr(self.parent, 'ui_update_rate', SENSOR_DATA_DEFAULTS['ui_update_rate']))
+            else:
+                self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
 
     def on_arm_control_mode_changed(self, mode: str):
         """处理机械臂控制模式变化"""
@@ -3749,6 +3755,13 @@ class ActionManagerPage(QWidget):
             self.selected_sensor_id = None
             self.sensor_status_value.setText("选择错误")
 
+    @pyqtSlot(dict)
+    def on_sensor_snapshot(self, snapshot):
+        """接收快照总线的合并更新"""
+        sensor_id = getattr(self, 'selected_sensor_id', None)
+        if sensor_id in snapshot['latest']:
+            self.on_sensor_data_updated(sensor_id, snapshot['latest'][sensor_id])
+
     def on_sensor_data_updated(self, sensor_id, values):
         """传感器数据更新时的回调"""
         try:
@@ -16,6 +16,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont
 
+from core.app_settings import SENSOR_DATA_DEFAULTS
+
 
 class AdaptiveGraspPage(QWidget):
     """自适应抓取页面"""
@@ -392,9 +394,14 @@ class AdaptiveGraspPage(QWidget):
             self.controller.completed_signal.connect(self.on_completed)
             self.controller.force_update_signal.connect(self.on_force_update)
 
-        # 传感器数据更新
+        # 传感器数据更新：有快照总线时按界面刷新率接收合并快照
         if self.sensor_data_manager:
-            self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
+            snapshot_bus = getattr(self.main_window, 'snapshot_bus', None)
+            if snapshot_bus is not None:
+                self.snapshot_subscription = snapshot_bus.subscribe(
+                    self.on_sensor_snapshot, rate=getattr(self.main_window, 'ui_update_rate', SENSOR_DATA_DEFAULTS['ui_update_rate']))
+            else:
+                self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
 
     def refresh_sensor_list(self):
         """刷新传感器列表"""
@@ -495,6 +502,13 @@ class AdaptiveGraspPage(QWidget):
         sensor_ids = [item.data(Qt.ItemDataRole.UserRole) for item in selected_items]
         self.add_log(f"已选择 {len(sensor_ids)} 个传感器: {sensor_ids}")
 
+    @pyqtSlot(dict)
+    def on_sensor_snapshot(self, snapshot):
+        """接收快照总线的合并更新，每个快照最多刷新一次显示"""
+        selected_ids = [item.data(Qt.ItemDataRole.UserRole) for item in self.sensor_list.selectedItems()]
+        if any(sensor_id in selected_ids for sensor_id in snapshot['latest']):
+            self.update_sensor_display(selected_ids)
+
     @pyqtSlot(int, list)
     def on_sensor_data_updated(self, sensor_id, values):
         """传感器数据更新"""
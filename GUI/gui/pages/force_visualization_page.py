@@ -20,6 +20,8 @@ import numpy as np
 import os
 import sys
 
+from core.app_settings import SENSOR_DATA_DEFAULTS
+
 # 配置matplotlib字体，避免中文显示问题和负号问题
 matplotlib.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
 # 优化matplotlib性能设置
@@ -282,8 +284,13 @@ class ForceVisualizationPage(QWidget):
         # 传感器选择事件
         self.sensor_list.itemClicked.connect(self.on_sensor_selected)
 
-        # 传感器数据更新事件
-        self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
+        # 传感器数据更新事件：有快照总线时按界面刷新率接收合并快照
+        snapshot_bus = getattr(self.main_window, 'snapshot_bus', None)
+        if snapshot_bus is not None:
+            self.snapshot_subscription = snapshot_bus.subscribe(
+                self.on_sensor_snapshot, rate=getattr(self.main_window, 'ui_update_rate', SENSOR_DATA_DEFAULTS['ui_update_rate']))
+        else:
+            self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
 
     def initialize_visualization(self):
         """初始化可视化"""
@@ -393,6 +400,12 @@ class ForceVisualizationPage(QWidget):
             display_text += f"[X:{latest_values[0]:.2f}, Y:{latest_values[1]:.2f}, Z:{latest_values[2]:.2f}]"
             self.current_values_label.setText(display_text)
 
+    @pyqtSlot(dict)
+    def on_sensor_snapshot(self, snapshot):
+        """接收快照总线的合并更新"""
+        for sensor_id, values in snapshot['latest'].items():
+            self.on_sensor_data_updated(sensor_id, values)
+
     @pyqtSlot(int, list)
     def on_sensor_data_updated(self, sensor_id, values):
         """接收到传感器数据更新时调用"""
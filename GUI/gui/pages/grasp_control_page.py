@@ -21,7 +21,7 @@ class GraspControlPage(QWidget):
         self.sensor_data_manager = sensor_data_manager
 
         # 创建抓取控制器
-        self.grasp_controller = GraspController(sensor_data_manager)
+        self.grasp_controller = GraspController(sensor_data_manager, getattr(main_window, 'snapshot_bus', None))
 
         # 创建UI
         self.setup_ui()
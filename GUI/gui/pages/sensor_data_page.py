@@ -15,6 +15,11 @@ import numpy as np
 from datetime import datetime
 import os
 
+from core.app_settings import SENSOR_DATA_DEFAULTS
+from core.sensor_recorder import RECORD_FORMAT_NPY
+from core.sensor_recording import SensorRecording
+from core.session_replay import SessionReplay, SPEED_MAX
+
 
 class SensorDataPage(QWidget):
     """传感器数据页面，用于展示传感器数据曲线"""
@@ -31,6 +36,16 @@ class SensorDataPage(QWidget):
         else:
             self.serial_manager = None
 
+        # 获取传感器数据记录器引用（后台流式写盘）
+        if hasattr(main_window, 'sensor_recorder'):
+            self.sensor_recorder = main_window.sensor_recorder
+            self.sensor_recorder.export_finished_signal.connect(self.on_export_finished)
+        else:
+            self.sensor_recorder = None
+
+        # 录制回放器
+        self.session_replay = None
+
         # 选中的传感器ID列表
         self.selected_sensors = []
 
@@ -45,6 +60,9 @@ class SensorDataPage(QWidget):
         # 最大数据点数量，用于限制绘图数据量
         self.max_data_points = 500
 
+        # 显示时长（秒）：大于0时按时间显示最近的数据并降采样到绘图区宽度，0 时显示最近 max_data_points 个样本
+        self.time_window = 10.0
+
         # 创建UI
         self.setup_ui()
 
@@ -144,6 +162,24 @@ class SensorDataPage(QWidget):
         self.save_btn.setObjectName("primaryButton")
         self.button_layout.addWidget(self.save_btn)
 
+        # 记录数据按钮（后台持续写入CSV文件）
+        self.record_btn = QPushButton("开始记录")
+        self.record_btn.setObjectName("secondaryButton")
+        self.record_btn.setEnabled(self.sensor_recorder is not None)
+        if self.sensor_recorder is not None and self.sensor_recorder.is_recording():
+            self.record_btn.setText("停止记录")
+        self.button_layout.addWidget(self.record_btn)
+
+        # 回放录制（把录制的数据按原始时间间隔重新送入接入链路）
+        self.replay_speed_combo = QComboBox()
+        for text, speed in (("1×", 1.0), ("2×", 2.0), ("5×", 5.0), ("10×", 10.0), ("最快", SPEED_MAX)):
+            self.replay_speed_combo.addItem(text, speed)
+        self.button_layout.addWidget(self.replay_speed_combo)
+
+        self.replay_btn = QPushButton("回放录制")
+        self.replay_btn.setObjectName("secondaryButton")
+        self.button_layout.addWidget(self.replay_btn)
+
         self.sensor_select_layout.addLayout(self.button_layout)
 
         # 添加控制选项
@@ -219,6 +255,17 @@ class SensorDataPage(QWidget):
         self.offset_spin.setEnabled(False)  # 默认禁用
         self.plot_options_layout.addWidget(self.offset_spin)
 
+        # 显示时长设置
+        self.time_window_label = QLabel("显示时长(秒):")
+        self.time_window_label.setStyleSheet("background-color: transparent;")
+        self.plot_options_layout.addWidget(self.time_window_label)
+        self.time_window_spin = QDoubleSpinBox()
+        self.time_window_spin.setRange(0, 600)
+        self.time_window_spin.setValue(self.time_window)
+        self.time_window_spin.setSingleStep(1)
+        self.time_window_spin.setToolTip(f"0 表示按样本序号显示最近 {self.max_data_points} 个样本")
+        self.plot_options_layout.addWidget(self.time_window_spin)
+
         self.plot_options_layout.addStretch()
 
         self.sensor_select_layout.addLayout(self.plot_options_layout)
@@ -240,7 +287,7 @@ class SensorDataPage(QWidget):
         self.plot_widget = pg.PlotWidget()
         self.plot_widget.setBackground('#2D2D2D')
         self.plot_widget.setLabel('left', 'Value')
-        self.plot_widget.setLabel('bottom', 'Time (samples)')
+        self.plot_widget.setLabel('bottom', 'Time (s)' if self.time_window > 0 else 'Time (samples)')
         self.plot_widget.showGrid(x=True, y=True)
         self.plot_widget.setTitle("传感器数据")
         self.plot_widget.addLegend()
@@ -262,6 +309,8 @@ class SensorDataPage(QWidget):
         self.refresh_btn.clicked.connect(self.refresh_sensor_list)
         self.clear_btn.clicked.connect(self.clear_data)
         self.save_btn.clicked.connect(self.save_data)
+        self.record_btn.clicked.connect(self.toggle_recording)
+        self.replay_btn.clicked.connect(self.toggle_replay)
         self.calibrate_btn.clicked.connect(self.send_calibration_command)
 
         # 复选框事件
@@ -271,6 +320,7 @@ class SensorDataPage(QWidget):
         self.auto_scale_check.stateChanged.connect(self.toggle_auto_scale)
         self.offset_check.stateChanged.connect(self.on_offset_changed)
         self.offset_spin.valueChanged.connect(self.on_offset_value_changed)
+        self.time_window_spin.valueChanged.connect(self.on_time_window_changed)
         
         # 添加Y轴范围控件的信号连接
         self.apply_y_range_btn.clicked.connect(self.apply_custom_y_range)
@@ -279,8 +329,16 @@ class SensorDataPage(QWidget):
         # 传感器列表选择变化信号
         self.sensor_list_widget.itemSelectionChanged.connect(self.on_sensor_selection_changed)
 
-        # 传感器数据更新事件
-        self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
+        # 传感器数据更新事件：有快照总线时按界面刷新率接收合并快照（含最近的曲线窗口）
+        snapshot_bus = getattr(self.main_window, 'snapshot_bus', None)
+        if snapshot_bus is not None:
+            self.snapshot_subscription = snapshot_bus.subscribe(
+                self.on_sensor_snapshot,
+                rate=getattr(self.main_window, 'ui_update_rate', SENSOR_DATA_DEFAULTS['ui_update_rate']),
+                window=self.max_data_points
+            )
+        else:
+            self.sensor_data_manager.data_updated_signal.connect(self.on_sensor_data_updated)
 
     def refresh_sensor_list(self):
         """刷新传感器列表"""
@@ -386,19 +444,9 @@ class SensorDataPage(QWidget):
                     'data3': []
                 }
 
-            # 获取数据
-            data1 = np.array(self.plot_data[sensor_id]['data1'])
-            data2 = np.array(self.plot_data[sensor_id]['data2'])
-            data3 = np.array(self.plot_data[sensor_id]['data3'])
-
-            # 应用偏移
-            if self.offset_enabled and len(data1) > 0:
-                data1 = data1 + offset
-                data2 = data2 + offset
-                data3 = data3 + offset
-
-            # 创建X轴数据
-            x_data = list(range(len(data1)))
+            # 获取数据并应用偏移
+            x_data, values = self.get_curve_data(sensor_id)
+            data1, data2, data3 = (values + offset).T
 
             # 创建曲线
             self.plot_curves[sensor_id] = {
@@ -496,6 +544,12 @@ class SensorDataPage(QWidget):
         self.offset_spin.setEnabled(self.offset_enabled)
         self.update_plot_curves()
 
+    def on_time_window_changed(self, value):
+        """显示时长变化时调用"""
+        self.time_window = value
+        self.plot_widget.setLabel('bottom', 'Time (s)' if self.time_window > 0 else 'Time (samples)')
+        self.update_plot_curves()
+
     def on_offset_value_changed(self, value):
         """偏移量变化时调用"""
         self.offset_value = value
@@ -533,28 +587,40 @@ class SensorDataPage(QWidget):
                              for item in [self.sensor_list_widget.item(index)]]:
             self.refresh_sensor_list()
 
+    @pyqtSlot(dict)
+    def on_sensor_snapshot(self, snapshot):
+        """接收快照总线的合并更新，曲线数据直接取自存储中最近的样本"""
+        for sensor_id, (_, values) in snapshot['windows'].items():
+            self.plot_data[sensor_id] = {
+                'data1': values[:, 0].tolist(),
+                'data2': values[:, 1].tolist(),
+                'data3': values[:, 2].tolist()
+            }
+
+        # 更新传感器当前值显示（只有当更新的传感器被选中时才更新显示）
+        if any(sensor_id in self.selected_sensors for sensor_id in snapshot['latest']):
+            self.update_current_values_display()
+
+        # 如果有新传感器，刷新传感器列表
+        known = {self.sensor_list_widget.item(index).data(Qt.ItemDataRole.UserRole)
+                 for index in range(self.sensor_list_widget.count())}
+        if not known.issuperset(snapshot['latest']):
+            self.refresh_sensor_list()
+
     def update_plots(self):
         """更新图表"""
         # 只更新选中的传感器图表
         for sensor_id in self.selected_sensors:
             if sensor_id in self.plot_curves and sensor_id in self.plot_data:
                 # 获取数据
-                data1 = np.array(self.plot_data[sensor_id]['data1'])
-                data2 = np.array(self.plot_data[sensor_id]['data2'])
-                data3 = np.array(self.plot_data[sensor_id]['data3'])
+                x_data, values = self.get_curve_data(sensor_id)
 
                 # 应用偏移
-                if self.offset_enabled and len(data1) > 0:
+                if self.offset_enabled and len(values) > 0:
                     # 计算当前传感器的偏移量
                     sensor_index = self.selected_sensors.index(sensor_id)
-                    offset = sensor_index * self.offset_value
-                    
-                    data1 = data1 + offset
-                    data2 = data2 + offset
-                    data3 = data3 + offset
-
-                # 创建X轴数据（样本索引）
-                x_data = list(range(len(data1)))
+                    values = values + sensor_index * self.offset_value
+                data1, data2, data3 = values.T
 
                 # 更新曲线
                 if len(data1) > 0:
@@ -565,6 +631,30 @@ class SensorDataPage(QWidget):
         # 每次更新图表时也更新当前值显示
         self.update_current_values_display()
 
+    def get_curve_data(self, sensor_id):
+        """获取一个传感器的曲线数据
+
+        显示时长大于0时，从数据管理器读取最近 time_window 秒的数据，按绘图区宽度（像素）
+        降采样（见 SensorDataManager.get_decimated_recent），横轴为相对最新样本的秒数；
+        否则使用最近的 max_data_points 个样本，横轴为样本序号。
+
+        Returns:
+            tuple: (横轴数组, shape (n, 3) 的数值数组)
+        """
+        if self.time_window > 0 and self.sensor_data_manager:
+            sensor_data = self.sensor_data_manager.get_sensor_data(sensor_id)
+            latest = sensor_data.get_latest_timestamp() if sensor_data else None
+            if latest is not None:
+                points = max(self.plot_widget.width(), 100)
+                timestamps, values = self.sensor_data_manager.get_decimated_recent(
+                    sensor_id, self.time_window, points)
+                return timestamps - latest, values
+            return np.empty(0), np.empty((0, 3))
+
+        data = self.plot_data.get(sensor_id) or {'data1': [], 'data2': [], 'data3': []}
+        values = np.column_stack([data['data1'], data['data2'], data['data3']]).reshape(-1, 3)
+        return np.arange(len(values)), values
+
     def clear_data(self):
         """清空数据"""
         # 清空所有传感器数据
@@ -580,8 +670,89 @@ class SensorDataPage(QWidget):
         # 更新状态标签
         self.status_label.setText("数据已清空")
 
+    def toggle_recording(self):
+        """开始/停止后台记录"""
+        if self.sensor_recorder is None:
+            return
+
+        if self.sensor_recorder.is_recording():
+            self.sensor_recorder.stop()
+            self.record_btn.setText("开始记录")
+            files = self.sensor_recorder.files
+            self.status_label.setText(f"记录已停止，共写入 {len(files)} 个文件: {self.sensor_recorder.directory}")
+        elif self.sensor_recorder.start():
+            self.record_btn.setText("停止记录")
+            self.status_label.setText(f"正在记录到: {self.sensor_recorder.directory}")
+        else:
+            self.status_label.setText("无法开始记录")
+
+    def toggle_replay(self):
+        """开始/停止回放录制"""
+        if self.session_replay is not None and self.session_replay.is_running():
+            self.stop_replay()
+            self.status_label.setText("回放已停止")
+            return
+
+        directory = QFileDialog.getExistingDirectory(
+            self,
+            "选择要回放的录制",
+            os.path.join(self.sensor_data_manager.data_dir, "recordings")
+        )
+        if not directory:
+            return
+        if not SensorRecording.is_recording(directory):
+            self.status_label.setText("所选目录不是传感器录制")
+            return
+
+        try:
+            self.session_replay = SessionReplay(
+                self.sensor_data_manager,
+                directory,
+                pipeline=getattr(self.main_window, 'ingest_pipeline', None),
+                speed=self.replay_speed_combo.currentData()
+            )
+        except Exception as e:
+            self.status_label.setText(f"无法打开录制: {str(e)}")
+            return
+        self.session_replay.stats_signal.connect(self.on_replay_stats)
+        self.session_replay.finished_signal.connect(self.on_replay_finished)
+        self.session_replay.start()
+        self.replay_btn.setText("停止回放")
+
+    def stop_replay(self):
+        """停止回放"""
+        if self.session_replay is not None:
+            self.session_replay.stop()
+        self.replay_btn.setText("回放录制")
+
+    @pyqtSlot(dict)
+    def on_replay_stats(self, stats):
+        """显示回放进度和下游的跟随情况"""
+        self.status_label.setText(
+            f"回放 {stats['position']:.1f}/{stats['duration']:.1f} s，"
+            f"实际 {stats['achieved_speed']:.2f}×，延迟 {stats['lag_ms']:.1f} ms"
+            f"（最大 {stats['max_lag_ms']:.1f} ms），丢弃 {stats['dropped_samples']}"
+        )
+
+    @pyqtSlot()
+    def on_replay_finished(self):
+        self.replay_btn.setText("回放录制")
+
     def save_data(self):
         """保存数据"""
+        # 后台记录进行中时，数据已持续写入磁盘：npy 录制导出为 CSV 视图，
+        # CSV 记录只需把缓冲的数据刷新到文件
+        if self.sensor_recorder is not None and self.sensor_recorder.is_recording():
+            if self.sensor_recorder.record_format == RECORD_FORMAT_NPY:
+                self.export_recording()
+                return
+            files = self.sensor_recorder.flush()
+            if files:
+                self.status_label.setText(f"数据已写入: {files[-1]}（共 {len(files)} 个文件）")
+            else:
+                self.status_label.setText("尚未记录到数据")
+            return
+
         if not self.selected_sensors:
             self.status_label.setText("请先选择传感器")
             return
@@ -629,6 +800,36 @@ class SensorDataPage(QWidget):
         except Exception as e:
             self.status_label.setText(f"数据保存错误: {str(e)}")
 
+    def export_recording(self):
+        """在后台把当前录制中选中传感器的数据导出为CSV，完成后见 on_export_finished"""
+        if self.sensor_recorder.is_exporting():
+            self.status_label.setText("上一次导出尚未完成")
+            return
+
+        default_filename = f"sensor_record_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        filepath, _ = QFileDialog.getSaveFileName(
+            self,
+            "导出传感器录制",
+            os.path.join(self.sensor_data_manager.data_dir, default_filename),
+            "CSV文件 (*.csv);;所有文件 (*.*)"
+        )
+        if not filepath:
+            return
+
+        # 单个传感器导出为长表，多个传感器按时间戳对齐到公共时间轴后导出
+        if self.sensor_recorder.export_csv(filepath, sensor_ids=list(self.selected_sensors) or None):
+            self.status_label.setText(f"正在导出: {filepath}")
+        else:
+            self.status_label.setText("无法开始导出")
+
+    @pyqtSlot(bool, str, str)
+    def on_export_finished(self, success, filepath, message):
+        """后台导出完成"""
+        if success:
+            self.status_label.setText(f"{message}: {filepath}")
+        else:
+            self.status_label.setText(f"数据导出错误: {message}")
+
     def reset_y_range(self):
         """重置Y轴范围到默认值"""
         # 确保自动缩放被关闭
@@ -12,6 +12,8 @@ from PyQt6.QtWidgets import (
     QGroupBox, QCheckBox, QFrame, QFileDialog, QMessageBox
 )
 
+from core import sample_clock
+
 
 class SerialPage(QWidget):
     """串口通信页面"""
@@ -28,6 +30,12 @@ class SerialPage(QWidget):
         else:
             self.sensor_data_manager = None
 
+        # 传感器数据接入流水线（存在时由其在工作线程中解析）
+        if hasattr(main_window, 'ingest_pipeline'):
+            self.ingest_pipeline = main_window.ingest_pipeline
+        else:
+            self.ingest_pipeline = None
+
         # 数据记录器
         if hasattr(main_window, 'data_logger'):
             self.data_logger = main_window.data_logger
@@ -37,6 +45,9 @@ class SerialPage(QWidget):
         # 数据显示格式
         self.display_hex = False
 
+        # 已显示到的流水线尾部序号
+        self._tail_seq = 0
+
         # 创建UI
         self.setup_ui()
 
@@ -199,6 +210,12 @@ class SerialPage(QWidget):
         self.status_label = QLabel("未连接")
         self.status_label.setObjectName("statusLabel")
         self.main_layout.addWidget(self.status_label)
+
+        # 解析流水线背压状态
+        if self.ingest_pipeline:
+            self.pipeline_label = QLabel("解析队列: 0  丢弃: 0 行")
+            self.pipeline_label.setObjectName("statusLabel")
+            self.main_layout.addWidget(self.pipeline_label)
         
         # 数据记录状态指示器
         if self.data_logger:
@@ -239,10 +256,22 @@ class SerialPage(QWidget):
         # 复选框事件
         self.hex_display_check.stateChanged.connect(self.toggle_hex_display)
 
+        # 解析流水线：解析开关与快照
+        if self.ingest_pipeline:
+            self.parse_sensor_check.stateChanged.connect(
+                lambda state: self.ingest_pipeline.set_parsing_enabled(state == Qt.CheckState.Checked.value))
+            self.ingest_pipeline.snapshot_signal.connect(self.on_pipeline_snapshot)
+
         # 串口管理器信号
         self.serial_manager.connected_signal.connect(self.on_connection_changed)
         self.serial_manager.error_signal.connect(self.on_error)
-        self.serial_manager.received_data_signal.connect(self.on_data_received)
+        # 有流水线时接收区由其快照中的尾部数据按快照频率刷新，不再逐批接收原始数据
+        if not self.ingest_pipeline:
+            if self.serial_manager.batch_enabled:
+                self.serial_manager.received_batch_signal.connect(self.on_data_batch_received)
+            else:
+                self.serial_manager.received_data_signal.connect(self.on_data_received)
+            self.serial_manager.received_frames_signal.connect(self.on_frames_received)
         
         # 如果有数据记录器，将接收数据信号连接到记录器
         if self.data_logger:
@@ -383,13 +412,124 @@ class SerialPage(QWidget):
     @pyqtSlot(bytes)
     def on_data_received(self, data):
         """接收到数据时调用"""
+        self.append_display_lines([self.format_received_data(data)])
+
+    @pyqtSlot(list, object)
+    def on_data_batch_received(self, lines, capture_ns):
+        """批量接收到数据时调用，整批只解析一次、只刷新一次接收区
+
+        Args:
+            lines: 行列表
+            capture_ns: 各行的捕获时间戳（time.monotonic_ns）
+        """
+        if self.parse_sensor_check.isChecked() and self.sensor_data_manager:
+            parsed = self.sensor_data_manager.parse_batch(lines, capture_ns) > 0
+        else:
+            parsed = False
+
+        display_lines = []
+        for data in lines:
+            display_data = self.format_received_data(data, parse=False)
+            if parsed and not self.display_hex and data.startswith(b"sensor"):
+                display_data = self._insert_sensor_tag(display_data)
+            display_lines.append(display_data)
+        self.append_display_lines(display_lines)
+
+    def _insert_sensor_tag(self, display_data):
+        """在显示文本（可能带时间戳）的正文前加上传感器数据标记"""
+        if self.timestamp_check.isChecked():
+            timestamp, _, body = display_data.partition("] ")
+            return f"{timestamp}] [传感器数据] {body}"
+        return f"[传感器数据] {display_data}"
+
+    @pyqtSlot(object)
+    def on_frames_received(self, frames):
+        """接收到二进制传感器帧时调用"""
+        sensor_ids, values, capture_ns = frames
+
+        # 存入传感器数据管理器
+        if self.parse_sensor_check.isChecked() and self.sensor_data_manager:
+            self.sensor_data_manager.add_samples(sensor_ids, values, capture_ns)
+
+        self.append_display_lines([
+            self.format_frame(sensor_id, x, y, z)
+            for sensor_id, (x, y, z) in zip(sensor_ids.tolist(), values.tolist())
+        ])
+
+    @pyqtSlot(dict)
+    def on_pipeline_snapshot(self, snapshot):
+        """解析流水线快照：更新队列深度和丢弃计数，并把尾部的新数据显示到接收区"""
+        stats = snapshot['stats']
+        self.pipeline_label.setText(
+            f"解析队列: {stats['queue_depth']}/{stats['queue_capacity']}  "
+            f"已解析: {stats['parsed_samples']}  丢弃: {stats['dropped_lines']} 行"
+        )
+        self.show_pipeline_tail(snapshot['tail'], snapshot['tail_seq'])
+
+    def show_pipeline_tail(self, tail, tail_seq):
+        """显示流水线尾部中上次刷新之后新到的数据
+
+        两次快照之间到达的数据超过尾部容量时，只显示最近的部分并注明省略的条数。
+
+        Args:
+            tail: [(捕获时间戳ns, 行bytes 或 (传感器ID, x, y, z)), ...]
+            tail_seq: 累计接收条数
+        """
+        new_count = tail_seq - self._tail_seq
+        self._tail_seq = tail_seq
+        if new_count <= 0:
+            return
+
+        display_lines = []
+        if new_count > len(tail):
+            display_lines.append(f"[已省略 {new_count - len(tail)} 条数据]")
+        else:
+            tail = tail[len(tail) - new_count:]
+
+        parsed = self.parse_sensor_check.isChecked()
+        for capture_ns, entry in tail:
+            if isinstance(entry, bytes):
+                display_data = self.format_received_data(entry, parse=False, capture_ns=capture_ns)
+                if parsed and not self.display_hex and entry.startswith(b"sensor"):
+                    display_data = self._insert_sensor_tag(display_data)
+            else:
+                display_data = self.format_frame(*entry, capture_ns=capture_ns)
+            display_lines.append(display_data)
+        self.append_display_lines(display_lines)
+
+    def format_frame(self, sensor_id, x, y, z, capture_ns=None):
+        """生成一个二进制传感器帧的显示文本"""
+        return self._timestamp_prefix(capture_ns) + f"[二进制帧] sensor{sensor_id}: {x:.3f}, {y:.3f}, {z:.3f}"
+
+    def _timestamp_prefix(self, capture_ns=None):
+        """显示用的时间戳前缀，未勾选时间戳时为空
+
+        Args:
+            capture_ns: 捕获时间戳（time.monotonic_ns），默认取当前时间
+        """
+        if not self.timestamp_check.isChecked():
+            return ""
+        if capture_ns is None:
+            moment = datetime.datetime.now()
+        else:
+            moment = datetime.datetime.fromtimestamp(sample_clock.to_wall_time(capture_ns / 1e9))
+        return moment.strftime("[%H:%M:%S.%f")[:-3] + "] "
+
+    def format_received_data(self, data, parse=True, capture_ns=None):
+        """解析一行接收数据并生成显示文本
+
+        Args:
+            data: 接收到的一行数据
+            parse: 是否同时把该行交给传感器数据管理器解析
+            capture_ns: 该行的捕获时间戳（time.monotonic_ns），用于显示时间戳，默认取当前时间
+        """
         # 尝试解码为字符串
         try:
             # 去除可能的结尾换行符
             data_str = data.decode('utf-8').strip()
 
             # 解析传感器数据
-            if self.parse_sensor_check.isChecked() and self.sensor_data_manager:
+            if parse and self.parse_sensor_check.isChecked() and self.sensor_data_manager:
                 # 尝试解析为传感器数据
                 if self.sensor_data_manager.parse_data(data_str):
                     # 解析成功，添加标记
@@ -417,12 +557,15 @@ class SerialPage(QWidget):
                 display_data = f"[无法解码为文本] HEX: {formatted_hex.upper()}"
 
         # 添加时间戳
-        if self.timestamp_check.isChecked():
-            timestamp = datetime.datetime.now().strftime("[%H:%M:%S.%f")[:-3] + "] "
-            display_data = timestamp + display_data
+        return self._timestamp_prefix(capture_ns) + display_data
+
+    def append_display_lines(self, display_lines):
+        """将若干行显示文本追加到接收区"""
+        if not display_lines:
+            return
 
         # 更新接收区
-        self.receive_text.append(display_data)
+        self.receive_text.append('\n'.join(display_lines))
 
         # 自动滚动
         if self.auto_scroll_check.isChecked():
@@ -0,0 +1,18 @@
+import os
+import sys
+import builtins
+
+import pytest
+
+GUI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if GUI_DIR not in sys.path:
+    sys.path.insert(0, GUI_DIR)
+builtins.APP_ROOT_PATH = GUI_DIR
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
@@ -0,0 +1,35 @@
+"""机械臂控制器：机械手通信错误的处理"""
+
+import pytest
+
+from core import arm_controller
+from core.arm_controller import ArmController, InspireError
+
+
+class FailingHand:
+    def __init__(self, error):
+        self.error = error
+
+    def set_angle(self, angles, wait=True):
+        raise self.error
+
+
+@pytest.fixture
+def controller(qapp):
+    controller = ArmController()
+    controller.hand_connected = True
+    errors = []
+    controller.error_signal.connect(errors.append)
+    controller.errors = errors
+    return controller
+
+
+def test_inspire_errors_are_reported_as_failures(controller):
+    controller.hand = FailingHand(InspireError("串口通信错误: 读取超时"))
+    assert controller.set_hand_angles([0] * 6) is False
+    assert controller.errors and "串口通信错误" in controller.errors[-1]
+
+
+def test_non_critical_errors_are_still_tolerated(controller):
+    controller.hand = FailingHand(IndexError("list index out of range"))
+    assert controller.set_hand_angles([0] * 6) is True
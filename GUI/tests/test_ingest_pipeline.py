@@ -0,0 +1,66 @@
+"""传感器数据接入流水线：停止与接收尾部"""
+
+import threading
+import time
+
+import numpy as np
+from PyQt6.QtCore import Qt
+
+from core.ingest_pipeline import SensorIngestPipeline
+from core.sensor_data_manager import SensorDataManager
+
+
+class BlockingManager(SensorDataManager):
+    """解析第一批数据时阻塞，直到测试放行"""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def parse_batch(self, lines, capture_ns=None):
+        self.entered.set()
+        self.release.wait(5.0)
+        return super().parse_batch(lines, capture_ns)
+
+
+def test_stop_does_not_block_on_full_queue(qapp):
+    manager = BlockingManager()
+    pipeline = SensorIngestPipeline(manager, max_queue_size=2)
+    pipeline.start()
+    pipeline.submit_lines([b"sensor1: 1, 2, 3"])
+    assert manager.entered.wait(2.0)
+    for _ in range(4):
+        pipeline.submit_lines([b"sensor1: 1, 2, 3"])
+    assert pipeline.get_stats()['dropped_batches'] == 2
+
+    # 解析线程仍阻塞时，stop() 最多等待 join 超时，而不会卡在向满队列放入结束标记
+    worker = pipeline._thread
+    started = time.monotonic()
+    pipeline.stop()
+    assert time.monotonic() - started < 2.0
+    assert not pipeline.is_running()
+
+    manager.release.set()
+    worker.join(2.0)
+    assert not worker.is_alive()
+    stats = pipeline.get_stats()
+    assert stats['processed_lines'] + stats['dropped_lines'] == 5
+
+
+def test_snapshot_carries_tail(qapp):
+    pipeline = SensorIngestPipeline(SensorDataManager(), snapshot_interval=0.01, tail_lines=4)
+    snapshots = []
+    pipeline.snapshot_signal.connect(snapshots.append, Qt.ConnectionType.DirectConnection)
+    pipeline.start()
+
+    lines = [f"sensor{i}: {i}, 0, 0".encode() for i in range(1, 7)]
+    pipeline._on_serial_lines(lines, np.arange(6, dtype=np.int64))
+    pipeline._on_serial_frames((np.array([9]), np.array([[1.0, 2.0, 3.0]]), np.array([100], dtype=np.int64)))
+    pipeline.stop()
+
+    tail, tail_seq = pipeline.get_tail()
+    assert tail_seq == 7
+    assert tail == [(3, lines[3]), (4, lines[4]), (5, lines[5]), (100, (9, 1.0, 2.0, 3.0))]
+    assert snapshots[-1]['tail'] == tail
+    assert snapshots[-1]['tail_seq'] == 7
@@ -0,0 +1,360 @@
+"""Inspire 机械手协议：遥测快照、分帧校验、异步写入与命令编码"""
+
+import time
+
+import numpy as np
+import pytest
+import serial
+
+from core.inspire.controller.control import (
+    InspireController, InspireError, InspireNotConnectedError, InspireTimeoutError, InspireChecksumError,
+    InspireResponseError, REG_ANGLE_SET, REG_FORCE_LIMIT, REG_SPEED_SET, REG_ANGLE_ACT, REG_FORCE_ACT, REG_CURRENT, REG_ERROR, REG_STATUS, REG_TEMP
+)
+
+DOF = InspireController.HAND_DOF
+
+
+def make_frame(cmd, addr, data, hand_id=1):
+    """构造一个响应帧"""
+    body = [hand_id, len(data) + 3, cmd, addr & 0xff, addr >> 8] + list(data)
+    return bytes([0x90, 0xEB] + body + [sum(body) & 0xff])
+
+
+class FakeSerial:
+    """内存中的串口：按请求应答读写寄存器，也可以只输出预先注入的字节"""
+
+    is_open = True
+    timeout = 0.01
+
+    def __init__(self, respond=True, max_read=None):
+        self.respond = respond
+        self.max_read = max_read  # 单次读取的最大字节数，用于模拟分多次到达的帧
+        self.error = None  # 设置后读取时抛出该异常
+        self.registers = bytearray(0x0800)
+        self.buffer = bytearray()
+        self.packets = []  # 写出的数据包（拆分为单个命令）
+        self.acks = []  # 写寄存器的应答数据，为空时应答 0x01
+
+    @property
+    def in_waiting(self):
+        return len(self.buffer)
+
+    def inject(self, data):
+        self.buffer += data
+
+    def write(self, data):
+        data = bytes(data)
+        written = len(data)
+        while data:
+            packet, data = data[:data[3] + 5], data[data[3] + 5:]
+            self.packets.append(packet)
+            if self.respond:
+                self.buffer += self.reply(packet)
+        return written
+
+    def reply(self, packet):
+        cmd, addr = packet[4], packet[5] | (packet[6] << 8)
+        if cmd == 0x11:
+            return make_frame(cmd, addr, self.registers[addr:addr + packet[7]])
+        self.registers[addr:addr + len(packet) - 8] = packet[7:-1]
+        return make_frame(cmd, addr, [self.acks.pop(0) if self.acks else 0x01])
+
+    def read(self, size):
+        if self.error:
+            raise self.error
+        if self.max_read:
+            size = min(size, self.max_read)
+        if not self.buffer:
+            time.sleep(self.timeout)  # 模拟串口读取超时
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+
+@pytest.fixture
+def serial_port():
+    return FakeSerial()
+
+
+@pytest.fixture
+def hand(serial_port):
+    controller = InspireController('fake', 115200)
+    controller.ser = serial_port
+    controller.RESPONSE_TIMEOUT = 0.2
+    yield controller
+    controller.stop_command_writer(flush=False)
+
+
+def put_words(serial_port, addr, values):
+    for i, value in enumerate(values):
+        serial_port.registers[addr + 2 * i:addr + 2 * i + 2] = (value & 0xFFFF).to_bytes(2, 'little')
+
+
+def test_snapshot_decodes_full_span(hand, serial_port):
+    put_words(serial_port, REG_ANGLE_ACT, [1000, 800, 0, 0xFFFF, 5, 6])
+    put_words(serial_port, REG_FORCE_ACT, [-5, 10, -300, 0, 1, 2])
+    put_words(serial_port, REG_CURRENT, [100, 200, 300, 400, 500, 600])
+    serial_port.registers[REG_ERROR:REG_ERROR + DOF] = bytes([0, 1, 0, 4, 0, 0])
+    serial_port.registers[REG_STATUS:REG_STATUS + DOF] = bytes([2] * DOF)
+    serial_port.registers[REG_TEMP:REG_TEMP + DOF] = bytes([30, 31, 32, 33, 34, 35])
+
+    snapshot = hand.read_snapshot()
+
+    # 一次往返读取整段寄存器
+    assert len(serial_port.packets) == 1
+    assert serial_port.packets[0][7] == InspireController.SNAPSHOT_END - InspireController.SNAPSHOT_START
+    assert snapshot.angle == (1000, 800, 0, -1, 5, 6)
+    assert snapshot.force == (-5, 10, -300, 0, 1, 2)
+    assert snapshot.current == (100, 200, 300, 400, 500, 600)
+    assert snapshot.error == (0, 1, 0, 4, 0, 0)
+    assert snapshot.status == (2,) * DOF
+    assert snapshot.temperature == (30, 31, 32, 33, 34, 35)
+
+    # 与逐项读取的结果一致
+    assert hand.get_angle(actual=True) == list(snapshot.angle)
+    assert hand.get_force() == list(snapshot.force)
+    assert hand.get_error() == list(snapshot.error)
+    assert hand.get_status() == list(snapshot.status)
+
+
+def test_snapshot_partial_span_leaves_other_fields_empty(hand, serial_port):
+    put_words(serial_port, REG_FORCE_ACT, [-1, -2, -3, -4, -5, -6])
+    snapshot = hand.read_snapshot(REG_FORCE_ACT, REG_CURRENT + 2 * DOF)
+    assert snapshot.force == (-1, -2, -3, -4, -5, -6)
+    assert snapshot.current == (0,) * DOF
+    assert snapshot.angle is None and snapshot.error is None and snapshot.temperature is None
+
+    # 只覆盖一个字段的一部分时该字段为 None
+    snapshot = hand.read_snapshot(REG_ANGLE_ACT, REG_ANGLE_ACT + 4)
+    assert snapshot.angle is None
+
+    with pytest.raises(ValueError):
+        hand.read_snapshot(REG_ANGLE_ACT, REG_ANGLE_ACT)
+
+
+def test_snapshot_rejects_response_of_wrong_length(hand, serial_port):
+    serial_port.respond = False
+    serial_port.inject(make_frame(0x11, REG_ANGLE_ACT, [0] * 4))
+    with pytest.raises(InspireResponseError):
+        hand.read_snapshot()
+
+
+ANGLES = [1000, 900, 800, 700, 600, 500]
+ANGLE_DATA = b''.join(v.to_bytes(2, 'little') for v in ANGLES)
+
+
+def test_resync_skips_leading_garbage(hand, serial_port):
+    serial_port.respond = False
+    serial_port.max_read = 3
+    # 噪声、数据中偶然出现的帧头（长度字节无意义）、其后才是有效帧
+    serial_port.inject(b'\x00\x13\x90' + b'\x90\xeb\x01\x40\x11' + make_frame(0x11, REG_ANGLE_ACT, ANGLE_DATA))
+    start = time.monotonic()
+    assert hand.get_angle(actual=True) == ANGLES
+    # 不需要等到超时才跳过假帧头
+    assert time.monotonic() - start < hand.RESPONSE_TIMEOUT
+    assert not hand._rx
+
+
+def test_frames_not_matching_the_request_are_dropped(hand, serial_port):
+    serial_port.respond = False
+    serial_port.inject(make_frame(0x11, REG_FORCE_ACT, bytes(12)))  # 上一次请求迟到的响应
+    serial_port.inject(make_frame(0x12, REG_ANGLE_ACT, [1]))  # 命令不符
+    serial_port.inject(make_frame(0x11, REG_ANGLE_ACT, ANGLE_DATA, hand_id=2))  # ID 不符
+    serial_port.inject(make_frame(0x11, REG_ANGLE_ACT, ANGLE_DATA))
+    assert hand.get_angle(actual=True) == ANGLES
+    assert hand._stale_frames == 3
+
+
+def test_bad_checksum_raises_checksum_error(hand, serial_port):
+    serial_port.respond = False
+    frame = bytearray(make_frame(0x11, REG_ANGLE_ACT, ANGLE_DATA))
+    frame[-1] ^= 0xFF
+    serial_port.inject(frame)
+    with pytest.raises(InspireChecksumError):
+        hand.get_angle(actual=True)
+    # 超时后丢弃残留字节，不影响下一次请求
+    assert not hand._rx
+    serial_port.inject(make_frame(0x11, REG_ANGLE_ACT, ANGLE_DATA))
+    assert hand.get_angle(actual=True) == ANGLES
+
+
+def test_missing_response_raises_timeout_error(hand, serial_port):
+    serial_port.respond = False
+    serial_port.inject(make_frame(0x11, REG_ANGLE_ACT, ANGLE_DATA)[:-3])  # 半帧
+    start = time.monotonic()
+    with pytest.raises(InspireTimeoutError):
+        hand.get_angle(actual=True)
+    assert hand.RESPONSE_TIMEOUT <= time.monotonic() - start < hand.RESPONSE_TIMEOUT + 0.5
+    assert not hand._rx
+
+
+def test_connection_errors_are_typed(hand, serial_port):
+    serial_port.error = serial.SerialException("device disconnected")
+    with pytest.raises(InspireError, match="串口通信错误"):
+        hand.get_angle(actual=True)
+
+    hand.ser = None
+    with pytest.raises(InspireNotConnectedError):
+        hand.get_angle(actual=True)
+    assert issubclass(InspireNotConnectedError, InspireError)
+
+
+def test_parse_rejects_short_response(hand):
+    with pytest.raises(InspireResponseError):
+        hand._parse_multi_dof_response(make_frame(0x11, REG_ANGLE_SET, bytes(4)))
+
+
+def read_words(serial_port, addr):
+    return [int.from_bytes(serial_port.registers[addr + 2 * i:addr + 2 * i + 2], 'little') for i in range(DOF)]
+
+
+def test_superseded_setpoints_are_coalesced(hand, serial_port):
+    # 写入线程视为忙碌：提交的设定值只登记，不立即写出
+    hand._writer_running = True
+    for value in (100, 200, 300):
+        hand.set_angle(value, wait=False)
+    hand.set_speed(500, wait=False)
+    hand.set_angle(400, wait=False)
+    assert list(hand._pending_writes) == [REG_ANGLE_SET, REG_SPEED_SET]
+
+    # 写入线程取出全部待写值：每个寄存器只写出最新值，连续写出后再确认应答
+    hand._writer_running = False
+    hand._command_writer_loop()
+    assert [packet[5] | (packet[6] << 8) for packet in serial_port.packets] == [REG_ANGLE_SET, REG_SPEED_SET]
+    assert read_words(serial_port, REG_ANGLE_SET) == [400] * DOF
+    assert read_words(serial_port, REG_SPEED_SET) == [500] * DOF
+
+    stats = hand.get_command_stats()
+    assert stats['submitted'] == 5 and stats['superseded'] == 3
+    assert stats['written'] == 2 and stats['acked'] == 2 and stats['batches'] == 1
+    assert stats['pending'] == 0
+
+
+def test_synchronous_write_cancels_pending_value(hand, serial_port):
+    hand._writer_running = True
+    hand.set_angle(100, wait=False)
+    hand.set_angle(700)
+    assert not hand._pending_writes
+    assert len(serial_port.packets) == 1
+    assert read_words(serial_port, REG_ANGLE_SET) == [700] * DOF
+    hand._writer_running = False
+
+
+def test_write_batch_counts_acks(hand, serial_port):
+    # 第一条应答成功、第二条被设备拒绝，第三条没有应答
+    serial_port.acks = [0x01, 0x00]
+    original_reply = serial_port.reply
+    serial_port.reply = lambda packet: b'' if len(serial_port.packets) == 3 else original_reply(packet)
+    batch = [(REG_ANGLE_SET, [1] * DOF), (REG_SPEED_SET, [2] * DOF), (REG_FORCE_LIMIT, [3] * DOF)]
+    hand._write_batch(batch)
+
+    stats = hand.get_command_stats()
+    assert stats['written'] == 3
+    assert (stats['acked'], stats['rejected'], stats['failed']) == (1, 1, 1)
+    # 没有确认的力阈值不进入缓存
+    assert hand._force_limit is None
+
+    serial_port.reply = original_reply
+    hand._write_batch([(REG_FORCE_LIMIT, [3] * DOF)])
+    assert hand._force_limit[1] == (3,) * DOF
+
+
+def test_write_batch_without_port_drops_batch(hand):
+    hand.ser = None
+    hand._write_batch([(REG_ANGLE_SET, [1] * DOF)])
+    stats = hand.get_command_stats()
+    assert stats['dropped'] == 1 and stats['written'] == 0
+
+
+def test_background_writer_flushes_on_stop(hand, serial_port):
+    for value in range(0, 1000, 50):
+        hand.set_angle(value, wait=False)
+    hand.stop_command_writer()
+    assert read_words(serial_port, REG_ANGLE_SET) == [950] * DOF
+    stats = hand.get_command_stats()
+    assert stats['submitted'] == 20
+    assert stats['written'] + stats['superseded'] == 20 and stats['pending'] == 0
+
+
+def legacy_build_packet(hand_id, data_len, cmd, addr, data=None):
+    """模板编码之前的逐字节实现（-1 编码为 0xFFFF）"""
+    def split(value):
+        return (0xff, 0xff) if value == -1 else (value & 0xff, (value >> 8) & 0xff)
+    packet = [0xEB, 0x90, hand_id, data_len, cmd, *split(addr)]
+    for value in data or []:
+        packet.extend(split(value))
+    packet.append(sum(packet[2:]) & 0xff)
+    return bytearray(packet)
+
+
+@pytest.mark.parametrize("hand_id", [1, 2])
+def test_template_packets_match_legacy_encoding(hand, hand_id):
+    hand.hand_id = hand_id
+    rng = np.random.default_rng(0)
+    cases = [
+        (0x0F, 0x12, REG_ANGLE_SET, [1000, 800, 600, 400, -1, 0]),
+        (0x0F, 0x12, REG_FORCE_LIMIT, [0, 1, 255, 256, 1000, 32767]),
+        (0x05, 0x12, 0x03F1, [0x01]),
+        (0x05, 0x12, 0x03EC, [0x01]),
+        (0x03, 0x11, REG_ANGLE_ACT, None),
+    ]
+    cases += [(0x0F, 0x12, REG_SPEED_SET, rng.integers(-1, 1001, DOF).tolist()) for _ in range(50)]
+    for _ in range(2):  # 第二遍使用已缓存的模板
+        for data_len, cmd, addr, data in cases:
+            packet = hand._build_packet(data_len, cmd, addr, data)
+            assert packet == legacy_build_packet(hand_id, data_len, cmd, addr, data)
+            assert isinstance(packet, bytearray)
+
+    for addr, count in [(REG_ANGLE_ACT, 0x0C), (REG_ERROR, 0x06), (REG_ANGLE_ACT, 0x4E), (0x0700, 0xFF)]:
+        expected = legacy_build_packet(hand_id, 0x05, 0x11, addr, [count])
+        assert hand._read_request(addr, count) == expected
+        assert hand._read_request(addr, count) == expected
+
+
+def test_built_packets_are_independent(hand):
+    first = hand._build_packet(0x0F, 0x12, REG_ANGLE_SET, [1] * DOF)
+    second = hand._build_packet(0x0F, 0x12, REG_ANGLE_SET, [2] * DOF)
+    assert first == legacy_build_packet(1, 0x0F, 0x12, REG_ANGLE_SET, [1] * DOF)
+    assert second == legacy_build_packet(1, 0x0F, 0x12, REG_ANGLE_SET, [2] * DOF)
+
+
+def test_struct_decoding_matches_legacy(hand):
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        data = rng.integers(0, 256, 2 * DOF, dtype=np.uint8).tobytes()
+        if rng.random() < 0.3:
+            data = b'\xff\xff' + data[2:]
+        frame = make_frame(0x11, REG_ANGLE_ACT, data)
+        words = [data[2 * i] | (data[2 * i + 1] << 8) for i in range(DOF)]
+        assert hand._parse_multi_dof_response(frame) == [-1 if w == 0xFFFF else w for w in words]
+        assert hand._parse_multi_dof_response(frame, signed=True) == [w - 65536 if w > 32767 else w for w in words]
+
+
+def test_force_limit_cache_expires(hand, serial_port, monkeypatch):
+    put_words(serial_port, REG_FORCE_LIMIT, [500] * DOF)
+    assert hand.get_force_limit() == [500] * DOF
+    hand._polling = True  # 只模拟轮询状态，不启动轮询线程
+    try:
+        # 设备上的值被外部改写：缓存时长内返回缓存值
+        put_words(serial_port, REG_FORCE_LIMIT, [300] * DOF)
+        assert hand.get_force_limit() == [500] * DOF
+        assert hand.get_force_limit(max_age=0) == [300] * DOF
+
+        # 超过默认缓存时长后重新读取
+        put_words(serial_port, REG_FORCE_LIMIT, [200] * DOF)
+        monkeypatch.setattr(hand, 'FORCE_LIMIT_MAX_AGE', 0.0)
+        assert hand.get_force_limit() == [200] * DOF
+        monkeypatch.undo()
+
+        # 力阈值校准后不再使用缓存
+        put_words(serial_port, REG_FORCE_LIMIT, [100] * DOF)
+        hand.gesture_force_clb()
+        assert hand.get_force_limit() == [100] * DOF
+    finally:
+        hand._polling = False
+
+    # 重新连接后不再使用缓存
+    put_words(serial_port, REG_FORCE_LIMIT, [50] * DOF)
+    assert hand.connect()
+    assert hand._force_limit is None
+    assert hand.get_force_limit(max_age=60) == [50] * DOF
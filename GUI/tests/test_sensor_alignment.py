@@ -0,0 +1,88 @@
+"""流式对齐与全量对齐结果一致，且不读取完整历史"""
+
+import csv
+
+import numpy as np
+import pytest
+
+from core import sensor_alignment
+from core.sensor_alignment import METHODS, align_sensors, collect_aligned, iter_aligned
+from core.sensor_data_manager import SensorData, SensorDataManager
+
+
+def make_series(seed=0):
+    rng = np.random.default_rng(seed)
+    series = {}
+    for sensor_id, (rate, offset) in {1: (1000.0, 0.0), 2: (333.0, 0.0021), 3: (50.0, 0.3)}.items():
+        timestamps = offset + np.arange(int(2.0 * rate)) / rate + rng.uniform(0, 1e-4, int(2.0 * rate))
+        timestamps.sort()
+        series[sensor_id] = (timestamps, rng.normal(size=(len(timestamps), 3)))
+    return series
+
+
+def split_blocks(timestamps, values, size):
+    for offset in range(0, len(timestamps), size):
+        yield timestamps[offset:offset + size], values[offset:offset + size]
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("max_gap", [None, 0.01])
+def test_iter_aligned_matches_align_sensors(method, max_gap):
+    series = make_series()
+    end = max(timestamps[-1] for timestamps, _ in series.values())
+    expected_base, expected = align_sensors(series, 800.0, method, max_gap=max_gap)
+
+    blocks = {sensor_id: split_blocks(timestamps, values, 97) for sensor_id, (timestamps, values) in series.items()}
+    time_base, aligned = collect_aligned(series, iter_aligned(blocks, end, 800.0, method, max_gap=max_gap,
+                                                              block_size=101))
+
+    np.testing.assert_allclose(time_base, expected_base)
+    for sensor_id in series:
+        np.testing.assert_allclose(aligned[sensor_id], expected[sensor_id], equal_nan=True)
+
+
+def test_iter_aligned_keeps_buffers_small(monkeypatch):
+    series = make_series()
+    end = max(timestamps[-1] for timestamps, _ in series.values())
+    sizes = []
+    fill = sensor_alignment._SampleBuffer.fill
+
+    def tracked_fill(self, segment_start, segment_end):
+        fill(self, segment_start, segment_end)
+        sizes.append(len(self.timestamps))
+    monkeypatch.setattr(sensor_alignment._SampleBuffer, "fill", tracked_fill)
+
+    blocks = {sensor_id: split_blocks(timestamps, values, 64) for sensor_id, (timestamps, values) in series.items()}
+    rows = sum(len(segment) for segment, _ in iter_aligned(blocks, end, 800.0, block_size=128))
+    assert rows > 1000
+    # 输出段 128 行（0.16 秒）内最多约 160 个样本，加上一个读入块和边界样本
+    assert max(sizes) <= 160 + 64 + 2
+
+
+def test_manager_streams_spilled_history(tmp_path, monkeypatch):
+    manager = SensorDataManager(buffer_capacity=256, spill_to_disk=True, spill_block=64)
+    manager.spill_dir = str(tmp_path / "spill")
+    series = make_series(1)
+    for sensor_id, (timestamps, values) in series.items():
+        ids = np.full(len(timestamps), sensor_id)
+        manager.add_samples(ids, values, (timestamps * 1e9).astype(np.int64))
+    assert manager.get_sensor_data(1).spill.sample_count > 0
+
+    def no_get_all(self):
+        raise AssertionError("get_all 会载入完整历史")
+    monkeypatch.setattr(SensorData, "get_all", no_get_all)
+
+    stored = {sensor_id: (manager.get_sensor_data(sensor_id).get_range()) for sensor_id in series}
+    expected_base, expected = align_sensors(stored, 500.0)
+    time_base, aligned = manager.get_aligned_data(rate=500.0)
+    np.testing.assert_allclose(time_base, expected_base)
+    for sensor_id in series:
+        np.testing.assert_allclose(aligned[sensor_id], expected[sensor_id], equal_nan=True)
+
+    ok, path = manager.save_to_csv(filepath=str(tmp_path / "all.csv"), rate=500.0)
+    assert ok
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:4] == ['Timestamp', 'Sensor1_Data1', 'Sensor1_Data2', 'Sensor1_Data3']
+    assert len(rows) == len(expected_base) + 1
+    manager.close()
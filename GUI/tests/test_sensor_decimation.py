@@ -0,0 +1,86 @@
+"""绘图降采样"""
+
+import numpy as np
+
+from core import sensor_data_manager
+from core.sensor_data_manager import SensorDataManager
+from core.sensor_decimation import decimate, decimate_minmax
+
+
+def test_minmax_keeps_extrema_at_true_times():
+    rng = np.random.default_rng(0)
+    n = 100003
+    timestamps = np.arange(n) / 1000.0
+    values = rng.normal(size=(n, 3))
+    values[12345, 1] = 50.0
+    values[77777, 2] = -40.0
+
+    out_timestamps, out_values = decimate_minmax(timestamps, values, 1000)
+
+    assert len(out_timestamps) <= 1000
+    assert np.all(np.diff(out_timestamps) > 0)
+    # 输出是原始样本的子集，每个点的时刻与数值来自同一个样本
+    index = np.searchsorted(timestamps, out_timestamps)
+    np.testing.assert_array_equal(values[index], out_values)
+    assert out_timestamps[out_values[:, 1].argmax()] == timestamps[12345]
+    assert out_timestamps[out_values[:, 2].argmin()] == timestamps[77777]
+    np.testing.assert_array_equal(out_values.max(axis=0), values.max(axis=0))
+    np.testing.assert_array_equal(out_values.min(axis=0), values.min(axis=0))
+
+
+def test_minmax_returns_short_input_unchanged():
+    timestamps = np.arange(10.0)
+    values = np.ones((10, 3))
+    out_timestamps, out_values = decimate_minmax(timestamps, values, 1000)
+    assert out_timestamps is timestamps or np.array_equal(out_timestamps, timestamps)
+    assert len(out_values) == 10
+
+
+def test_minmax_never_exceeds_small_targets():
+    timestamps = np.arange(1000) / 1000.0
+    values = np.random.default_rng(1).normal(size=(1000, 3))
+    for points in range(1, 13):
+        out_timestamps, out_values = decimate_minmax(timestamps, values, points)
+        assert 1 <= len(out_timestamps) <= points
+        index = np.searchsorted(timestamps, out_timestamps)
+        np.testing.assert_array_equal(values[index], out_values)
+    out_timestamps, _ = decimate_minmax(timestamps, values, 2)
+    assert out_timestamps.tolist() == [timestamps[0], timestamps[-1]]
+
+
+def test_recent_window_reuses_closed_blocks(monkeypatch):
+    manager = SensorDataManager(buffer_capacity=100000)
+    rng = np.random.default_rng(2)
+    rate = 1000.0
+
+    def add(first, count):
+        timestamps = 1000.0 + (first + np.arange(count)) / rate
+        values = rng.normal(size=(count, 3))
+        manager.add_samples(np.full(count, 1), values, (timestamps * 1e9).astype(np.int64))
+        return timestamps, values
+
+    timestamps, values = add(0, 30000)
+    decimated = []
+
+    def tracked_decimate(t, v, points, mode):
+        decimated.append(len(t))
+        return decimate(t, v, points, mode)
+    monkeypatch.setattr(sensor_data_manager, "decimate", tracked_decimate)
+
+    for frame in range(5):
+        out_timestamps, out_values = manager.get_decimated_recent(1, 10.0, 800)
+        latest = manager.get_sensor_data(1).get_latest_timestamp()
+        assert latest - 10.0 <= out_timestamps[0] and out_timestamps[-1] <= latest
+        assert np.all(np.diff(out_timestamps) > 0) and len(out_timestamps) <= 800
+        window = timestamps >= latest - 10.0
+        np.testing.assert_array_equal(out_values.max(axis=0), values[window].max(axis=0))
+        np.testing.assert_array_equal(out_values.min(axis=0), values[window].min(axis=0))
+        if frame:
+            # 窗口滑动后只重新降采样起点所在的部分块和末块（各不超过一块 1.25 秒）
+            assert sum(decimated) <= 2 * 1250 + 20
+        decimated.clear()
+
+        # 下一帧到达 20 毫秒的新样本
+        new_timestamps, new_values = add(len(timestamps), 20)
+        timestamps = np.concatenate([timestamps, new_timestamps])
+        values = np.vstack([values, new_values])
@@ -0,0 +1,24 @@
+"""传感器模拟器：二进制帧的传感器ID范围"""
+
+import pytest
+
+from core.sensor_protocol import BinaryFrameDecoder, WIRE_FORMAT_BINARY, WIRE_FORMAT_TEXT
+from core.sensor_simulator import SensorSimulator
+
+
+def test_binary_ids_beyond_field_width_are_rejected():
+    with pytest.raises(ValueError):
+        SensorSimulator(sensor_count=8, wire_format=WIRE_FORMAT_BINARY, first_sensor_id=250)
+    with pytest.raises(ValueError):
+        SensorSimulator(sensor_count=1, wire_format=WIRE_FORMAT_TEXT, first_sensor_id=-1)
+
+    # 文本格式的ID不受帧字段宽度限制
+    simulator = SensorSimulator(sensor_count=8, wire_format=WIRE_FORMAT_TEXT, first_sensor_id=250)
+    assert b"sensor257:" in simulator.generate(1)
+
+
+def test_binary_ids_up_to_limit_round_trip():
+    simulator = SensorSimulator(sensor_count=4, wire_format=WIRE_FORMAT_BINARY, first_sensor_id=252)
+    sensor_ids, values = BinaryFrameDecoder().feed(simulator.generate(2))
+    assert sensor_ids.tolist() == [252, 253, 254, 255] * 2
+    assert values.shape == (8, 3)
@@ -0,0 +1,28 @@
+"""磁盘层：块文件命名"""
+
+import numpy as np
+import pytest
+
+from core.sensor_store import SpillStore
+
+
+def block(first, n=4):
+    timestamps = first + np.arange(n, dtype=np.float64)
+    return np.vstack([timestamps, timestamps, timestamps, timestamps])
+
+
+def test_cleared_store_never_reuses_chunk_files(tmp_path):
+    store = SpillStore(str(tmp_path), 1)
+    store.append(block(0.0))
+    store.append(block(10.0))
+    snapshot = list(store.chunks)  # 例如后台导出时固定的块列表
+
+    store.clear()
+    store.append(block(100.0))
+    store.append(block(110.0))
+
+    assert not {path for path, _, _, _ in snapshot} & {path for path, _, _, _ in store.chunks}
+    # 旧快照读不到清空后写入的数据
+    with pytest.raises(FileNotFoundError):
+        list(store.iter_chunks(snapshot))
+    assert store.read_all()[0].tolist() == block(100.0)[0].tolist() + block(110.0)[0].tolist()
@@ -0,0 +1,68 @@
+"""多串口汇聚器：槽位分配与传感器ID命名空间"""
+
+import time
+
+import numpy as np
+import pytest
+from PyQt6.QtCore import Qt
+
+from core.serial_hub import SerialHub
+from core.serial_manager import SerialManager
+
+
+@pytest.fixture
+def hub(qapp, monkeypatch):
+    monkeypatch.setattr(SerialManager, "connect", lambda self, port, baud_rate=115200, **kwargs: True)
+    monkeypatch.setattr(SerialManager, "disconnect", lambda self: None)
+    hub = SerialHub()
+    received = []
+    hub.samples_signal.connect(received.append, Qt.ConnectionType.DirectConnection)
+    hub.received = received
+    return hub
+
+
+def send(hub, port, lines):
+    """模拟端口的读取线程投递一批文本行"""
+    capture = np.full(len(lines), time.monotonic_ns(), dtype=np.int64)
+    hub.ports[port].manager.received_batch_signal.emit(lines, capture)
+
+
+def test_two_ports_and_re_add(hub):
+    assert hub.add_port("COM1")
+    assert hub.add_port("COM2")
+    assert hub.add_port("COM1")  # 重复加入不分配新槽位
+    assert hub.get_ports() == {"COM1": 0, "COM2": 1}
+
+    send(hub, "COM1", [b"sensor1: 1, 2, 3"])
+    send(hub, "COM2", [b"sensor1: 4, 5, 6"])
+    assert [ids.tolist() for ids, _, _ in hub.received] == [[1], [1001]]
+
+    # 移除后重新加入：槽位单调分配，旧槽位不会被其他端口复用
+    assert hub.remove_port("COM1")
+    assert hub.add_port("COM3")
+    assert hub.add_port("COM1")
+    assert hub.get_ports() == {"COM2": 1, "COM3": 2, "COM1": 3}
+
+    hub.received.clear()
+    send(hub, "COM3", [b"sensor2: 1, 1, 1"])
+    send(hub, "COM1", [b"sensor2: 1, 1, 1"])
+    assert [ids.tolist() for ids, _, _ in hub.received] == [[2002], [3002]]
+    hub.close_all()
+    assert hub.get_ports() == {}
+
+
+def test_out_of_range_ids_are_rejected(hub):
+    errors = []
+    hub.port_error_signal.connect(lambda port, message: errors.append(port), Qt.ConnectionType.DirectConnection)
+    hub.add_port("COM1")
+    hub.add_port("COM2")
+
+    send(hub, "COM1", [b"sensor5: 1, 2, 3", b"sensor1000: 1, 2, 3", b"sensor1234: 1, 2, 3"])
+    ids, values, capture = hub.received[-1]
+    assert ids.tolist() == [5]
+    assert values.shape == (1, 3) and len(capture) == 1
+
+    stats = hub.get_port_stats()["COM1"]
+    assert stats['rejected_ids'] == 2
+    assert stats['samples'] == 1
+    assert errors == ["COM1"]
@@ -0,0 +1,121 @@
+"""录制会话回放：捕获时间戳与存储顺序"""
+
+import time
+
+import numpy as np
+import pytest
+
+from core.sensor_data_manager import SensorDataManager
+from core.sensor_recording import RecordingWriter
+from core.session_replay import SessionReplay, SPEED_MAX
+
+SENSOR_IDS = (1, 2)
+RATE = 1000.0
+DURATION = 0.4
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """两个传感器、DURATION 秒、RATE Hz 的录制（录制时间与当前时钟无关）"""
+    path = str(tmp_path / "recording")
+    writer = RecordingWriter(path, chunk_size=128)
+    timestamps = 100.0 + np.arange(int(DURATION * RATE)) / RATE
+    for sensor_id in SENSOR_IDS:
+        values = np.column_stack([timestamps, -timestamps, np.zeros_like(timestamps)])
+        writer.append(np.full(len(timestamps), sensor_id), values, timestamps)
+    writer.close()
+    return path
+
+
+def run(replay, position=0.0, timeout=10.0):
+    replay.start(position)
+    replay._thread.join(timeout)
+    assert not replay.is_running()
+
+
+def stored_timestamps(manager, sensor_id=1):
+    timestamps, _ = manager.get_sensor_data(sensor_id).get_range()
+    return timestamps
+
+
+def assert_monotonic(manager):
+    for sensor_id in SENSOR_IDS:
+        timestamps = stored_timestamps(manager, sensor_id)
+        assert np.all(np.diff(timestamps) >= 0)
+        assert timestamps[-1] <= time.monotonic()
+
+
+@pytest.mark.parametrize("speed, expected_span", [(1.0, DURATION), (4.0, DURATION / 4)])
+def test_replay_compresses_timestamps_by_speed(qapp, recording, speed, expected_span):
+    manager = SensorDataManager()
+    run(SessionReplay(manager, recording, speed=speed))
+
+    timestamps = stored_timestamps(manager)
+    assert len(timestamps) == int(DURATION * RATE)
+    span = timestamps[-1] - timestamps[0]
+    assert span == pytest.approx(expected_span - 1 / RATE / speed, rel=0.01)
+    assert_monotonic(manager)
+
+
+def test_max_speed_stamps_with_delivery_time(qapp, recording):
+    manager = SensorDataManager()
+    started = time.monotonic()
+    run(SessionReplay(manager, recording, speed=SPEED_MAX))
+    finished = time.monotonic()
+
+    timestamps = stored_timestamps(manager)
+    assert len(timestamps) == int(DURATION * RATE)
+    assert started <= timestamps[0] and timestamps[-1] <= finished
+    assert_monotonic(manager)
+
+    # 再次回放和之后的实时样本都排在已存储的样本之后
+    run(SessionReplay(manager, recording, speed=SPEED_MAX))
+    manager.add_samples(np.array([1]), np.array([[0.0, 0.0, 0.0]]), np.array([time.monotonic_ns()]))
+    assert len(stored_timestamps(manager)) == 2 * int(DURATION * RATE) + 1
+    assert_monotonic(manager)
+
+
+def test_replay_after_future_stored_sample_stays_monotonic(qapp, recording):
+    manager = SensorDataManager()
+    # 已存储的样本比当前时刻稍晚（例如另一路数据源的时钟略有超前）
+    ahead_ns = time.monotonic_ns() + 50_000_000
+    manager.add_samples(np.array([1]), np.array([[0.0, 0.0, 0.0]]), np.array([ahead_ns]))
+    run(SessionReplay(manager, recording, speed=4.0))
+
+    timestamps = stored_timestamps(manager)
+    assert np.all(np.diff(timestamps) >= 0)
+    assert timestamps[1] > ahead_ns / 1e9
+
+
+def test_start_position_and_seek(qapp, recording):
+    manager = SensorDataManager()
+    run(SessionReplay(manager, recording, speed=SPEED_MAX, sensor_ids=[1]), position=0.3)
+    values = manager.get_sensor_data(1).get_range()[1]
+    assert len(values) == int(round((DURATION - 0.3) * RATE))
+    assert values[0, 0] == pytest.approx(100.3)
+
+    # 回放中跳回开头：跳转之后投递的样本时间戳仍然单调
+    replay = SessionReplay(manager, recording, speed=1.0, sensor_ids=[1])
+    replay.start()
+    time.sleep(0.15)
+    replay.seek(0.0)
+    replay._thread.join(10.0)
+    values = manager.get_sensor_data(1).get_range()[1]
+    assert np.count_nonzero(values[:, 0] == 100.0) == 2
+    timestamps = stored_timestamps(manager)
+    assert np.all(np.diff(timestamps) >= 0)
+
+
+@pytest.mark.parametrize("speed", [4.0, SPEED_MAX])
+def test_loop(qapp, recording, speed):
+    manager = SensorDataManager()
+    replay = SessionReplay(manager, recording, speed=speed, loop=True)
+    replay.start()
+    deadline = time.monotonic() + 10.0
+    while replay.loops < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    replay.stop()
+
+    assert replay.loops >= 2
+    assert len(stored_timestamps(manager)) >= 2 * int(DURATION * RATE)
+    assert_monotonic(manager)
@@ -0,0 +1,49 @@
+"""页面通过快照总线订阅传感器数据"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core.sensor_data_manager import SensorDataManager
+from core.snapshot_bus import SensorSnapshotBus
+
+
+@pytest.fixture
+def main_window(qapp):
+    manager = SensorDataManager()
+    bus = SensorSnapshotBus(manager)
+    return SimpleNamespace(sensor_data_manager=manager, snapshot_bus=bus, ui_update_rate=20)
+
+
+def deliver(qapp, main_window, sensor_id=1):
+    """写入一批样本并让总线投递一次快照"""
+    main_window.sensor_data_manager.add_samples(
+        np.array([sensor_id]), np.array([[1.0, 2.0, 3.0]]), np.array([time.monotonic_ns()]))
+    qapp.processEvents()
+    main_window.snapshot_bus._deliver_due()
+    qapp.processEvents()
+
+
+def test_adaptive_grasp_page_subscribes(qapp, main_window):
+    from core.adaptive_grasp_controller import AdaptiveGraspController
+    from gui.pages.adaptive_grasp_page import AdaptiveGraspPage
+
+    controller = AdaptiveGraspController(sensor_data_manager=main_window.sensor_data_manager)
+    page = AdaptiveGraspPage(main_window, controller)
+
+    assert page.snapshot_subscription.rate == 20
+    deliver(qapp, main_window)
+    assert page.snapshot_subscription.delivered == 1
+
+
+def test_force_visualization_page_subscribes(qapp, main_window):
+    pytest.importorskip("matplotlib")
+    from gui.pages.force_visualization_page import ForceVisualizationPage
+
+    page = ForceVisualizationPage(main_window, main_window.sensor_data_manager)
+
+    assert page.snapshot_subscription.rate == 20
+    deliver(qapp, main_window)
+    assert page.snapshot_subscription.delivered == 1